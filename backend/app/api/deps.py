@@ -0,0 +1,89 @@
+from functools import lru_cache
+from app.core import metrics
+from app.core.config import settings
+from app.services.game_service import GameService
+from app.repositories.event_repository import EventLogGameRepository
+from app.services.user_service import UserService
+from app.services.async_game_service import AsyncGameService
+from app.services.async_user_service import AsyncUserService
+from app.services.analytics_service import AnalyticsService
+from app.services.async_analytics_service import AsyncAnalyticsService
+from app.services.archive_service import ArchiveService
+from app.services.async_archive_service import AsyncArchiveService
+from app.services.bid_advisor import BidAdvisor
+from app.services.live_updates import UpdateHub
+
+# Services are built on first request and shared by every router, so a cold
+# start doesn't construct repositories (or touch boto3) at import time, and
+# game completion updates the same user stats the users endpoints read.
+
+GAME_SERVICE_CALLS = ('create_game', 'get_game', 'get_game_version', 'list_games', 'get_standings', 'start_round',
+                      'submit_bids', 'submit_results', 'apply_batch')
+USER_SERVICE_CALLS = ('get_user_stats', 'update_stats_after_game', 'record_game_results', 'get_leaderboard')
+GAME_REPOSITORY_CALLS = ('create_game', 'get_game', 'get_version', 'list_games', 'get_standings', 'update_game',
+                         'append_round', 'update_game_fields', 'put_games')
+USER_REPOSITORY_CALLS = ('get_user_stats', 'update_user_stats', 'record_game_results', 'get_leaderboard')
+ANALYTICS_SERVICE_CALLS = ('get_analytics', 'record_results', 'record_game')
+ANALYTICS_REPOSITORY_CALLS = ('get_counters', 'add_counters', 'put_counters')
+
+def _instrumented(service, service_calls, repository_calls, repository_name):
+    if settings.METRICS_ENABLED:
+        metrics.instrument(service, service_calls, 'service')
+        metrics.instrument(service.repo, repository_calls, 'repository', repository_name)
+    return service
+
+@lru_cache()
+def get_user_service() -> UserService:
+    return _instrumented(UserService(), USER_SERVICE_CALLS, USER_REPOSITORY_CALLS, 'user')
+
+@lru_cache()
+def get_analytics_service() -> AnalyticsService:
+    return _instrumented(AnalyticsService(), ANALYTICS_SERVICE_CALLS, ANALYTICS_REPOSITORY_CALLS, 'analytics')
+
+def _analytics():
+    return get_analytics_service() if settings.PLAYER_ANALYTICS else None
+
+@lru_cache()
+def get_update_hub() -> UpdateHub:
+    return UpdateHub()
+
+def _update_hub():
+    return get_update_hub() if settings.LIVE_UPDATES else None
+
+@lru_cache()
+def get_game_service() -> GameService:
+    repo = EventLogGameRepository() if settings.GAME_EVENT_LOG else None
+    service = GameService(repo=repo, user_service=get_user_service(), updates=_update_hub(), analytics=_analytics())
+    return _instrumented(service, GAME_SERVICE_CALLS, GAME_REPOSITORY_CALLS, 'game')
+
+@lru_cache()
+def get_archive_service() -> ArchiveService:
+    # Same repository as the games endpoints, so the in-memory store is shared too
+    return ArchiveService(repo=get_game_service().repo)
+
+@lru_cache()
+def get_async_user_service() -> AsyncUserService:
+    return _instrumented(AsyncUserService(), USER_SERVICE_CALLS, USER_REPOSITORY_CALLS, 'user')
+
+@lru_cache()
+def get_async_analytics_service() -> AsyncAnalyticsService:
+    return _instrumented(AsyncAnalyticsService(), ANALYTICS_SERVICE_CALLS, ANALYTICS_REPOSITORY_CALLS, 'analytics')
+
+@lru_cache()
+def get_async_game_service() -> AsyncGameService:
+    analytics = get_async_analytics_service() if settings.PLAYER_ANALYTICS else None
+    return _instrumented(
+        AsyncGameService(user_service=get_async_user_service(), updates=_update_hub(), analytics=analytics),
+        GAME_SERVICE_CALLS, GAME_REPOSITORY_CALLS, 'game'
+    )
+
+@lru_cache()
+def get_async_archive_service() -> AsyncArchiveService:
+    return AsyncArchiveService(repo=get_async_game_service().repo)
+
+@lru_cache()
+def get_bid_advisor() -> BidAdvisor:
+    advisor = BidAdvisor()
+    if settings.METRICS_ENABLED:
+        metrics.instrument(advisor, ('advise',), 'service')
+    return advisor
@@ -0,0 +1,16 @@
+from fastapi import APIRouter, HTTPException, Depends
+from app.services.bid_advisor import BidAdvisor
+from app.models.advisor import BidAdviceRequest, BidAdvice
+from app.api.deps import get_bid_advisor
+from app.core import metrics
+
+router = APIRouter(route_class=metrics.route_class())
+
+# A plain def on purpose: the simulation is CPU bound, so FastAPI runs it in
+# its threadpool instead of blocking the event loop (in async mode too)
+@router.post("/bid", response_model=BidAdvice)
+def advise_bid(request: BidAdviceRequest, advisor: BidAdvisor = Depends(get_bid_advisor)):
+    try:
+        return advisor.advise(request.hand, request.round_num, request.num_players)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from app.services.async_user_service import AsyncUserService
+from app.models.user import UserStats, LeaderboardMetric, LeaderboardPage
+from app.services.async_analytics_service import AsyncAnalyticsService
+from app.models.analytics import PlayerAnalytics
+from app.api.deps import get_async_user_service, get_async_analytics_service
+from app.core.config import settings
+from app.core import metrics
+
+router = APIRouter(route_class=metrics.route_class())
+
+@router.get("/leaderboard", response_model=LeaderboardPage)
+async def get_leaderboard(
+    metric: LeaderboardMetric = LeaderboardMetric.WINS,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str = None,
+    user_service: AsyncUserService = Depends(get_async_user_service)
+):
+    try:
+        return await user_service.get_leaderboard(metric, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/{username}/stats", response_model=UserStats)
+async def get_user_stats(username: str, user_service: AsyncUserService = Depends(get_async_user_service)):
+    return await user_service.get_user_stats(username)
+
+@router.get("/{username}/analytics", response_model=PlayerAnalytics)
+async def get_user_analytics(username: str, analytics_service: AsyncAnalyticsService = Depends(get_async_analytics_service)):
+    if not settings.PLAYER_ANALYTICS:
+        raise HTTPException(status_code=404, detail="Analytics are disabled")
+    return await analytics_service.get_analytics(username)
@@ -1,39 +1,118 @@
-from fastapi import APIRouter, HTTPException, Depends
+from functools import partial
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from app.services.game_service import GameService
-from app.models.game import Game, GameCreate
-from typing import List, Dict
+from app.repositories.game_repository import VersionConflictError
+from app.models.game import Game, GameCreate, GamePage, Standings, GameBatch, GameDiff
+from app.api.deps import get_game_service, get_archive_service, get_update_hub
+from app.core.config import settings
+from app.core import metrics
+from app.core.http import version_etag, etag_matches, set_etag, not_modified, event_stream_response
+from app.services.archive_service import ArchiveService
+from app.services.live_updates import UpdateHub, stream_game
+from typing import Dict, Union
 
-router = APIRouter()
-game_service = GameService()
+router = APIRouter(route_class=metrics.route_class())
 
 @router.post("/", response_model=Game)
-def create_game(game_create: GameCreate):
+def create_game(game_create: GameCreate, game_service: GameService = Depends(get_game_service)):
     return game_service.create_game(game_create.players)
 
-@router.get("/{game_id}", response_model=Game)
-def get_game(game_id: str):
+@router.get("/", response_model=GamePage)
+def list_games(
+    player: str = None,
+    before: str = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str = None,
+    game_service: GameService = Depends(get_game_service)
+):
+    try:
+        return game_service.list_games(player, before, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/export")
+def export_games(archive_service: ArchiveService = Depends(get_archive_service)):
+    # Declared before /{game_id} so "export" isn't read as a game id
+    return StreamingResponse(archive_service.export_games(), media_type="application/x-ndjson")
+
+@router.get("/{game_id}", response_model=Game, responses={304: {"description": "Not modified"}})
+def get_game(
+    game_id: str,
+    response: Response,
+    if_none_match: str = Header(None),
+    game_service: GameService = Depends(get_game_service)
+):
+    if if_none_match:
+        # Pollers usually already have this version: answer from the version alone
+        version = game_service.get_game_version(game_id)
+        if version is not None and etag_matches(if_none_match, version_etag(version)):
+            return not_modified(version)
     game = game_service.get_game(game_id)
     if not game:
         raise HTTPException(status_code=404, detail="Game not found")
+    set_etag(response, game.version)
     return game
 
+@router.get("/{game_id}/updates", response_class=StreamingResponse)
+async def watch_game(
+    game_id: str,
+    last_event_id: str = Header(None),
+    game_service: GameService = Depends(get_game_service),
+    hub: UpdateHub = Depends(get_update_hub)
+):
+    # Async so the stream waits on the event loop, not on a threadpool thread
+    if not settings.LIVE_UPDATES or await run_in_threadpool(game_service.get_game_version, game_id) is None:
+        raise HTTPException(status_code=404, detail="Game not found")
+    stream = stream_game(
+        hub, game_id,
+        partial(run_in_threadpool, game_service.get_game),
+        partial(run_in_threadpool, game_service.get_game_version),
+        last_event_id
+    )
+    return event_stream_response(stream)
+
+@router.get("/{game_id}/standings", response_model=Standings)
+def get_standings(game_id: str, game_service: GameService = Depends(get_game_service)):
+    standings = game_service.get_standings(game_id)
+    if not standings:
+        raise HTTPException(status_code=404, detail="Game not found")
+    return standings
+
 @router.post("/{game_id}/rounds/{round_num}/start", response_model=Game)
-def start_round(game_id: str, round_num: int):
+def start_round(game_id: str, round_num: int, game_service: GameService = Depends(get_game_service)):
     try:
         return game_service.start_round(game_id, round_num)
+    except VersionConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/{game_id}/rounds/{round_num}/bids", response_model=Game)
-def submit_bids(game_id: str, round_num: int, bids: Dict[str, int]):
+def submit_bids(game_id: str, round_num: int, bids: Dict[str, int], game_service: GameService = Depends(get_game_service)):
     try:
         return game_service.submit_bids(game_id, round_num, bids)
+    except VersionConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/{game_id}/rounds/{round_num}/results", response_model=Game)
-def submit_results(game_id: str, round_num: int, results: Dict[str, Dict[str, int]]):
+def submit_results(game_id: str, round_num: int, results: Dict[str, Dict[str, int]], game_service: GameService = Depends(get_game_service)):
     try:
         return game_service.submit_results(game_id, round_num, results)
+    except VersionConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# Game is listed first: a GameDiff can't pass as a Game, but a Game would pass as a GameDiff
+@router.post("/{game_id}/batch", response_model=Union[Game, GameDiff])
+def apply_batch(game_id: str, batch: GameBatch, game_service: GameService = Depends(get_game_service)):
+    try:
+        return game_service.apply_batch(game_id, batch)
+    except VersionConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -1,10 +1,32 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends, Query
 from app.services.user_service import UserService
-from app.models.user import UserStats
+from app.models.user import UserStats, LeaderboardMetric, LeaderboardPage
+from app.services.analytics_service import AnalyticsService
+from app.models.analytics import PlayerAnalytics
+from app.api.deps import get_user_service, get_analytics_service
+from app.core.config import settings
+from app.core import metrics
 
-router = APIRouter()
-user_service = UserService()
+router = APIRouter(route_class=metrics.route_class())
+
+@router.get("/leaderboard", response_model=LeaderboardPage)
+def get_leaderboard(
+    metric: LeaderboardMetric = LeaderboardMetric.WINS,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str = None,
+    user_service: UserService = Depends(get_user_service)
+):
+    try:
+        return user_service.get_leaderboard(metric, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{username}/stats", response_model=UserStats)
-def get_user_stats(username: str):
+def get_user_stats(username: str, user_service: UserService = Depends(get_user_service)):
     return user_service.get_user_stats(username)
+
+@router.get("/{username}/analytics", response_model=PlayerAnalytics)
+def get_user_analytics(username: str, analytics_service: AnalyticsService = Depends(get_analytics_service)):
+    if not settings.PLAYER_ANALYTICS:
+        raise HTTPException(status_code=404, detail="Analytics are disabled")
+    return analytics_service.get_analytics(username)
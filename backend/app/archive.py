@@ -0,0 +1,55 @@
+"""
+Export or import the game archive as NDJSON, using the storage configured in
+settings (set USE_DYNAMODB, DYNAMODB_TABLE, DYNAMODB_ENDPOINT_URL as usual).
+
+Run from backend/:
+    python -m app.archive export [-o games.ndjson] [--page-size N]
+    python -m app.archive import games.ndjson [--checkpoint games.ckpt] [--batch-size N]
+
+An import interrupted part way can be re-run with the same --checkpoint and
+picks up after the last batch that was written.
+"""
+import argparse
+import sys
+from app.services.archive_service import ArchiveService, IMPORT_BATCH_SIZE
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.archive", description="Bulk game export/import")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_cmd = commands.add_parser("export", help="write every game as NDJSON")
+    export_cmd.add_argument("-o", "--output", help="output file (default: stdout)")
+    export_cmd.add_argument("--page-size", type=int, help="items per DynamoDB Scan page")
+
+    import_cmd = commands.add_parser("import", help="load games from NDJSON")
+    import_cmd.add_argument("input", help="NDJSON file, or - for stdin")
+    import_cmd.add_argument("--checkpoint", help="progress file used to resume an interrupted import")
+    import_cmd.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+
+    args = parser.parse_args(argv)
+    service = ArchiveService()
+
+    if args.command == "export":
+        out = open(args.output, "w") if args.output else sys.stdout
+        try:
+            count = 0
+            for line in service.export_games(args.page_size):
+                out.write(line)
+                count += 1
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        print(f"Exported {count} games", file=sys.stderr)
+    else:
+        src = sys.stdin if args.input == "-" else open(args.input)
+        try:
+            count = service.import_games(src, args.batch_size, args.checkpoint)
+        finally:
+            if src is not sys.stdin:
+                src.close()
+        print(f"Imported {count} games", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Rebuild every player's analytics counters from the stored games (or an
+NDJSON archive written by `python -m app.archive export`), replacing the
+ones kept up to date as rounds are scored. Run it while games aren't being
+scored: counts written during the backfill can be overwritten.
+
+Run from backend/:
+    python -m app.backfill [--workers 4]
+    python -m app.backfill --input games.ndjson
+"""
+import argparse
+import json
+import sys
+from app.rescore import read_games
+from app.services.analytics_service import AnalyticsService, BACKFILL_CHUNK_SIZE
+from app.services.archive_service import ArchiveService
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.backfill", description="Rebuild player analytics")
+    parser.add_argument("--input", help="NDJSON archive to read instead of the game store, or - for stdin")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (default: count in-process)")
+    parser.add_argument("--chunk-size", type=int, default=BACKFILL_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    src = None
+    try:
+        if args.input:
+            src = sys.stdin if args.input == "-" else open(args.input)
+            games = read_games(src)
+        else:
+            games = ArchiveService().repo.scan_games(compact=True)
+        summary = AnalyticsService().backfill(games, args.workers, args.chunk_size)
+    finally:
+        if src is not None and src is not sys.stdin:
+            src.close()
+    json.dump(summary, sys.stdout)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Small thread-safe LRU cache whose entries also expire after `ttl` seconds.
+    Keeps hit/miss/eviction counters so callers can report how well it works.
+    """
+
+    def __init__(self, max_size: int, ttl: float, clock=time.monotonic):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+
+    def get(self, key, validate=None):
+        """
+        Return the cached value or None. `validate(value)` may reject an entry
+        that is still within its TTL (e.g. after a version check); rejected
+        entries are dropped and counted as stale misses.
+        """
+        entry = self._lookup(key)
+        if entry is None:
+            return None
+        # Validation may do I/O, so it runs outside the lock
+        if validate is not None and not validate(entry[1]):
+            self._reject(key, entry)
+            return None
+        return self._hit(entry)
+
+    async def aget(self, key, validate=None):
+        """Same as get(), for an async `validate` coroutine function."""
+        entry = self._lookup(key)
+        if entry is None:
+            return None
+        if validate is not None and not await validate(entry[1]):
+            self._reject(key, entry)
+            return None
+        return self._hit(entry)
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self.clock():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def _reject(self, key, entry):
+        with self._lock:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+            self.stale += 1
+            self.misses += 1
+
+    def _hit(self, entry):
+        with self._lock:
+            self.hits += 1
+        return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'stale': self.stale,
+                'evictions': self.evictions,
+            }
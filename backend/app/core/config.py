@@ -1,10 +1,83 @@
 from pydantic import BaseSettings
+from typing import Optional
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Skull King Companion"
     DYNAMODB_TABLE: str = "skull_king_data"
+    DYNAMODB_USERS_TABLE: str = "skull_king_users"
     AWS_REGION: str = "us-east-1"
     USE_DYNAMODB: bool = False
+    # Where games, user stats and analytics live when USE_DYNAMODB is off: "memory"
+    # (lost on restart) or "sqlite" (SQLITE_PATH, for one server process)
+    LOCAL_STORE: str = "memory"
+    SQLITE_PATH: str = "skull_king.db"
+    # Connections kept open to it; in WAL mode readers don't wait for the writer
+    SQLITE_POOL_SIZE: int = 4
+    # Locks shared by the games of either local store; each write to a game holds its stripe
+    GAME_LOCK_STRIPES: int = 64
+    # Point at DynamoDB Local / moto server instead of AWS
+    DYNAMODB_ENDPOINT_URL: Optional[str] = None
+    # Serve the API from async endpoints backed by aioboto3 instead of the
+    # sync endpoints, which FastAPI runs in its threadpool
+    ASYNC_ENDPOINTS: bool = False
+    # Create the DynamoDB client during Lambda init instead of on the first
+    # request (useful with provisioned concurrency, where init is prewarmed)
+    PRELOAD_DYNAMODB: bool = False
+    # How games are encoded as DynamoDB items: "json" (original), "dict" or "packed"
+    GAME_CODEC: str = "dict"
+    # Read-through cache of games per container (DynamoDB only, 0 disables).
+    # With validation on, a hit still checks the stored version so a game
+    # written by another container is never served stale.
+    GAME_CACHE_SIZE: int = 0
+    GAME_CACHE_TTL: float = 300.0
+    GAME_CACHE_VALIDATE: bool = True
+    # Request/repository timing, Server-Timing headers and /metrics. When off,
+    # none of the wrappers, middleware or DynamoDB hooks are installed.
+    METRICS_ENABLED: bool = True
+    # gzip responses at least this many bytes to clients that accept it (0 disables)
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    # Store game writes as events appended to a log (DYNAMODB_EVENTS_TABLE),
+    # with the game document kept as a snapshot rewritten every
+    # GAME_SNAPSHOT_INTERVAL events. Sync endpoints only.
+    GAME_EVENT_LOG: bool = False
+    DYNAMODB_EVENTS_TABLE: str = "skull_king_events"
+    GAME_SNAPSHOT_INTERVAL: int = 10
+    # Bid advisor: deals simulated per request, stopping early once the time
+    # budget (seconds) is spent so latency stays bounded for big hands
+    ADVISOR_SIMULATIONS: int = 2000
+    ADVISOR_TIME_BUDGET: float = 0.25
+    # Worker processes for the simulations; 0 runs them in the request
+    # thread (Lambda has no /dev/shm, which multiprocessing needs)
+    ADVISOR_WORKERS: int = 0
+    # Advice cached per hand, suit-relabelled so equivalent hands share it
+    ADVISOR_CACHE_SIZE: int = 1024
+    # Push each game write to its watchers as server-sent events
+    # (/api/games/{game_id}/updates). Streams need a long-running server;
+    # behind Lambda the response is buffered until the function returns.
+    LIVE_UPDATES: bool = True
+    # Where published updates go: "local" (this process only) or a
+    # "module:Class" Broker that reaches every instance
+    LIVE_UPDATE_BROKER: str = "local"
+    # Updates kept per watched game for watchers that fall behind; a watcher
+    # further behind than this is sent the whole game again
+    LIVE_UPDATE_BUFFER: int = 64
+    # Seconds between keep-alive comments on an idle stream
+    LIVE_UPDATE_HEARTBEAT: float = 15.0
+    # Per-player analytics (/api/users/{username}/analytics), kept as
+    # counters updated on every scored round; `python -m app.backfill`
+    # rebuilds them from the stored games
+    PLAYER_ANALYTICS: bool = True
+    DYNAMODB_ANALYTICS_TABLE: str = "skull_king_analytics"
+    # Idempotency-Key on POST /api/games/...: a retry with a key already
+    # seen gets the stored response instead of running again. Keys are
+    # kept IDEMPOTENCY_TTL seconds (0 disables) in "memory" (this process)
+    # or "dynamodb" (DYNAMODB_IDEMPOTENCY_TABLE, shared by all instances).
+    IDEMPOTENCY_TTL: float = 3600.0
+    IDEMPOTENCY_STORE: str = "memory"
+    IDEMPOTENCY_CACHE_SIZE: int = 10000
+    # How long a key stays claimed by a request that hasn't finished
+    IDEMPOTENCY_LOCK_TIMEOUT: float = 30.0
+    DYNAMODB_IDEMPOTENCY_TABLE: str = "skull_king_idempotency"
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,72 @@
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response, StreamingResponse
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+
+# Conditional GETs and response compression. A game's version changes on
+# every write, so it makes a strong ETag without hashing the document.
+
+
+def version_etag(version: int) -> str:
+    return f'"v{version}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match check; uses weak comparison as RFC 9110 requires for it."""
+    if if_none_match.strip() == '*':
+        return True
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def set_etag(response: Response, version: int):
+    response.headers["ETag"] = version_etag(version)
+    # Let browsers keep the game but revalidate it on every use
+    response.headers["Cache-Control"] = "no-cache"
+
+
+def not_modified(version: int) -> Response:
+    response = Response(status_code=304)
+    set_etag(response, version)
+    return response
+
+
+def event_stream_response(stream) -> StreamingResponse:
+    # no-transform (and X-Accel-Buffering for nginx) keeps proxies from
+    # buffering or compressing the stream
+    return StreamingResponse(stream, media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache, no-transform", "X-Accel-Buffering": "no"})
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware that also marks a compressed response's ETag as weak:
+    a strong ETag promises byte-identical bodies, which the gzip and plain
+    encodings are not. The version behind it is unchanged, so
+    etag_matches() still answers 304 for either. Event streams are left
+    alone, since gzip would hold events back until its buffer fills.
+    """
+
+    async def __call__(self, scope, receive, send):
+        headers = Headers(scope=scope) if scope["type"] == "http" else {}
+        if "gzip" in headers.get("Accept-Encoding", "") and "text/event-stream" not in headers.get("Accept", ""):
+            responder = GZipResponder(self.app, self.minimum_size, compresslevel=self.compresslevel)
+            await responder(scope, receive, _weaken_etag(send))
+            return
+        await self.app(scope, receive, send)
+
+
+def _weaken_etag(send):
+    async def send_with_weak_etag(message):
+        if message["type"] == "http.response.start":
+            headers = MutableHeaders(raw=message["headers"])
+            etag = headers.get("etag")
+            if headers.get("content-encoding") == "gzip" and etag and not etag.startswith("W/"):
+                headers["ETag"] = "W/" + etag
+        await send(message)
+    return send_with_weak_etag
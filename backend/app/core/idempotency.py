@@ -0,0 +1,235 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse, Response
+from app.core.config import settings
+
+# Idempotency-Key support for the mutating game endpoints. The first request
+# with a key claims it, runs, and its response is stored for
+# IDEMPOTENCY_TTL seconds; a retry with the same key gets that response back
+# without touching the game. A key is claimed for at most
+# IDEMPOTENCY_LOCK_TIMEOUT seconds while its request runs, so a request that
+# died mid-way doesn't block its retries for the whole TTL.
+
+MUTATING_METHODS = ('POST', 'PUT', 'PATCH', 'DELETE')
+MAX_KEY_LENGTH = 255
+REPLAYED_HEADER = 'Idempotent-Replayed'
+
+
+class IdempotencyStore:
+    """
+    Where claimed keys and their responses are kept. A record is a dict with
+    the request's fingerprint and, once it finished, its status, headers and
+    body (status None while it is still running).
+    """
+    # Whether the methods do I/O and should run off the event loop
+    blocking = False
+
+    def claim(self, key: str, fingerprint: str):
+        """Claim `key` for a new request: None if claimed now, else the record already there."""
+        raise NotImplementedError
+
+    def save(self, key: str, record: dict):
+        raise NotImplementedError
+
+    def release(self, key: str):
+        """Forget a claimed key whose request failed, so a retry runs it again."""
+        raise NotImplementedError
+
+
+class MemoryIdempotencyStore(IdempotencyStore):
+    """Keys of this process only: enough for one server, not for many Lambda containers."""
+
+    def __init__(self, max_size: int = None, clock=time.monotonic):
+        self.max_size = max_size or settings.IDEMPOTENCY_CACHE_SIZE
+        self.clock = clock
+        self._records = OrderedDict()  # key -> (expires_at, record)
+        self._lock = threading.Lock()
+
+    def claim(self, key: str, fingerprint: str):
+        with self._lock:
+            entry = self._records.get(key)
+            if entry is not None and entry[0] > self.clock():
+                return entry[1]
+            self._put(key, {'fingerprint': fingerprint, 'status': None}, settings.IDEMPOTENCY_LOCK_TIMEOUT)
+            return None
+
+    def save(self, key: str, record: dict):
+        with self._lock:
+            self._put(key, record, settings.IDEMPOTENCY_TTL)
+
+    def release(self, key: str):
+        with self._lock:
+            self._records.pop(key, None)
+
+    def _put(self, key: str, record: dict, ttl: float):
+        self._records[key] = (self.clock() + ttl, record)
+        self._records.move_to_end(key)
+        while len(self._records) > self.max_size:
+            self._records.popitem(last=False)
+
+
+class DynamoDBIdempotencyStore(IdempotencyStore):
+    """
+    Keys in DYNAMODB_IDEMPOTENCY_TABLE, shared by every container. The claim
+    is a conditional put, so of two concurrent requests with one key only
+    one runs. `expires_at` is the table's TTL attribute; DynamoDB deletes
+    expired items lazily, so the claim checks it too.
+    """
+    blocking = True
+
+    @property
+    def table(self):
+        from app.db.dynamodb import get_dynamodb_table
+        return get_dynamodb_table(settings.DYNAMODB_IDEMPOTENCY_TABLE)
+
+    def claim(self, key: str, fingerprint: str):
+        from botocore.exceptions import ClientError
+        now = int(time.time())
+        try:
+            self.table.put_item(
+                Item={'key': key, 'fingerprint': fingerprint,
+                      'expires_at': now + int(settings.IDEMPOTENCY_LOCK_TIMEOUT)},
+                ConditionExpression='attribute_not_exists(#key) OR expires_at < :now',
+                ExpressionAttributeNames={'#key': 'key'},
+                ExpressionAttributeValues={':now': now}
+            )
+            return None
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+        item = self.table.get_item(Key={'key': key}, ConsistentRead=True).get('Item')
+        if item is None:
+            # Released between our put and get; report it as still running
+            return {'fingerprint': fingerprint, 'status': None}
+        return {
+            'fingerprint': item['fingerprint'],
+            'status': int(item['status']) if 'status' in item else None,
+            'headers': item.get('headers', []),
+            'body': item['body'].value if 'body' in item else b''
+        }
+
+    def save(self, key: str, record: dict):
+        self.table.put_item(Item=dict(record, key=key, expires_at=int(time.time() + settings.IDEMPOTENCY_TTL)))
+
+    def release(self, key: str):
+        self.table.delete_item(Key={'key': key})
+
+
+STORES = {
+    'memory': MemoryIdempotencyStore,
+    'dynamodb': DynamoDBIdempotencyStore,
+}
+
+
+def get_idempotency_store(name: str) -> IdempotencyStore:
+    if name not in STORES:
+        raise ValueError(f"Unknown idempotency store '{name}', expected one of {sorted(STORES)}")
+    return STORES[name]()
+
+
+class IdempotencyMiddleware:
+    """
+    Pure ASGI, so it can read the request body for the fingerprint and hand
+    it on unchanged, and record the response exactly as it was sent.
+    Responses below 500 are stored; a server error or an exception releases
+    the key so the retry runs again.
+    """
+
+    def __init__(self, app, store: IdempotencyStore, prefix: str = '/api/games'):
+        self.app = app
+        self.store = store
+        self.prefix = prefix
+
+    async def __call__(self, scope, receive, send):
+        if (scope['type'] != 'http' or scope['method'] not in MUTATING_METHODS
+                or not scope['path'].startswith(self.prefix)):
+            await self.app(scope, receive, send)
+            return
+        key = Headers(scope=scope).get('idempotency-key')
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await JSONResponse({'detail': 'Invalid Idempotency-Key'}, status_code=400)(scope, receive, send)
+            return
+
+        body = await _read_body(receive)
+        fingerprint = _fingerprint(scope, body)
+        record = await self._store(self.store.claim, key, fingerprint)
+        if record is not None:
+            await _stored_response(record, fingerprint)(scope, receive, send)
+            return
+
+        response = {}
+
+        async def capture(message):
+            if message['type'] == 'http.response.start':
+                response['status'] = message['status']
+                response['headers'] = [[k.decode('latin-1'), v.decode('latin-1')] for k, v in message['headers']]
+                response['body'] = b''
+            elif message['type'] == 'http.response.body':
+                response['body'] += message.get('body', b'')
+            await send(message)
+
+        try:
+            await self.app(scope, _replay(body), capture)
+        except BaseException:
+            await self._store(self.store.release, key)
+            raise
+        if response.get('status', 500) < 500:
+            await self._store(self.store.save, key, dict(response, fingerprint=fingerprint))
+        else:
+            await self._store(self.store.release, key)
+
+    async def _store(self, method, *args):
+        if self.store.blocking:
+            return await run_in_threadpool(method, *args)
+        return method(*args)
+
+
+def _fingerprint(scope, body: bytes) -> str:
+    # The same key on another endpoint or with another body is a client bug, not a retry
+    digest = hashlib.sha256()
+    for part in (scope['method'], scope['path'], scope.get('query_string', b'').decode('latin-1')):
+        digest.update(part.encode() + b'\0')
+    digest.update(body)
+    return digest.hexdigest()
+
+
+def _stored_response(record: dict, fingerprint: str) -> Response:
+    if record['fingerprint'] != fingerprint:
+        return JSONResponse({'detail': 'Idempotency-Key was already used for a different request'},
+                            status_code=422)
+    if record['status'] is None:
+        return JSONResponse({'detail': 'A request with this Idempotency-Key is still in progress'},
+                            status_code=409, headers={'Retry-After': '1'})
+    response = Response(record['body'], status_code=record['status'])
+    response.raw_headers = [(k.encode('latin-1'), v.encode('latin-1')) for k, v in record['headers']]
+    response.headers[REPLAYED_HEADER] = 'true'
+    return response
+
+
+async def _read_body(receive) -> bytes:
+    body = b''
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if not message.get('more_body', False):
+            return body
+
+
+def _replay(body: bytes):
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+        # The body was already read, so all that's left to report is the end
+        return {'type': 'http.disconnect'}
+    return receive
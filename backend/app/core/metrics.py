@@ -0,0 +1,288 @@
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from fastapi.routing import APIRoute
+from app.core.config import settings
+
+# In-process metrics in the Prometheus text format, plus the per-request
+# time breakdown sent back as a Server-Timing header. Nothing here is wired
+# in when settings.METRICS_ENABLED is off (see app.main and app.api.deps).
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# DynamoDB operations that accept ReturnConsumedCapacity
+CAPACITY_OPERATIONS = (
+    'GetItem', 'PutItem', 'UpdateItem', 'DeleteItem', 'Query', 'Scan',
+    'BatchGetItem', 'BatchWriteItem', 'TransactGetItems', 'TransactWriteItems',
+)
+
+
+def _label_text(names, values) -> str:
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{escaped}"')
+    return ','.join(pairs)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values) -> float:
+        return self._values.get(label_values, 0)
+
+    def render(self) -> list[str]:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{{{_label_text(self.labels, label_values)}}} {value}')
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, *label_values) -> int:
+        series = self._series.get(label_values)
+        return series[-1] if series else 0
+
+    def render(self) -> list[str]:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for label_values, series in sorted(self._series.items()):
+                labels = _label_text(self.labels, label_values)
+                sep = ',' if labels else ''
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, series):
+                    cumulative += bucket_count
+                    lines.append(f'{self.name}_bucket{{{labels}{sep}le="{bound}"}} {cumulative}')
+                lines.append(f'{self.name}_bucket{{{labels}{sep}le="+Inf"}} {series[-1]}')
+                lines.append(f'{self.name}_sum{{{labels}}} {series[-2]}')
+                lines.append(f'{self.name}_count{{{labels}}} {series[-1]}')
+        return lines
+
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Request latency by route', ('method', 'route', 'status')
+)
+REPOSITORY_LATENCY = Histogram(
+    'repository_call_duration_seconds', 'Repository call latency', ('repository', 'method')
+)
+REPOSITORY_CALLS = Counter(
+    'repository_calls_total', 'Repository calls by outcome', ('repository', 'method', 'outcome')
+)
+DYNAMODB_REQUESTS = Counter(
+    'dynamodb_requests_total', 'DynamoDB API requests', ('operation',)
+)
+DYNAMODB_CAPACITY = Counter(
+    'dynamodb_consumed_capacity_units_total', 'Capacity units consumed, as reported by DynamoDB',
+    ('table', 'operation')
+)
+METRICS = (REQUEST_LATENCY, REPOSITORY_LATENCY, REPOSITORY_CALLS, DYNAMODB_REQUESTS, DYNAMODB_CAPACITY)
+
+
+# Per-request time breakdown
+
+class RequestTimings:
+    """Seconds spent per phase during one request; nested calls of the same phase count once."""
+
+    def __init__(self):
+        self.durations = {}
+        self.active = set()
+
+
+_timings = contextvars.ContextVar('request_timings', default=None)
+
+
+def start_request() -> RequestTimings:
+    timings = RequestTimings()
+    _timings.set(timings)
+    return timings
+
+
+@contextmanager
+def timed(phase: str):
+    timings = _timings.get()
+    if timings is None or phase in timings.active:
+        yield
+        return
+    timings.active.add(phase)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.durations[phase] = timings.durations.get(phase, 0) + time.perf_counter() - start
+        timings.active.discard(phase)
+
+
+def server_timing(timings: RequestTimings, total: float) -> str:
+    """
+    Server-Timing value with exclusive times: repository calls, service
+    logic around them, the endpoint function itself, and serialization,
+    which is everything FastAPI does around the endpoint (request parsing
+    and validation, dependencies, threadpool hand-off for sync endpoints,
+    response validation and encoding).
+    """
+    d = timings.durations
+    repository = d.get('repository', 0)
+    service = max(d.get('service', 0) - repository, 0)
+    handler = max(d.get('endpoint', 0) - d.get('service', 0), 0)
+    serialization = max(d.get('route', 0) - d.get('endpoint', 0), 0)
+    parts = [('handler', handler), ('service', service), ('repository', repository),
+             ('serialization', serialization), ('total', total)]
+    return ', '.join(f'{name};dur={seconds * 1000:.3f}' for name, seconds in parts)
+
+
+def observe_request(method: str, route, status: int, seconds: float):
+    # Unmatched paths share one label so scanners can't blow up cardinality
+    REQUEST_LATENCY.observe(seconds, method, route or '<unmatched>', str(status))
+
+
+# Wrapping services and repositories
+
+def instrument(obj, methods, phase: str, component: str = None):
+    """
+    Replace the listed methods on this instance with timed versions. Time
+    goes to `phase` of the current request; with a `component`, every call
+    is also counted and its latency observed under that repository name.
+    """
+    for name in methods:
+        method = getattr(obj, name, None)
+        if method is not None:
+            setattr(obj, name, _timed_method(method, phase, component, name))
+    return obj
+
+
+def _timed_method(method, phase: str, component: str, name: str):
+    def record(start, outcome):
+        if component is not None:
+            REPOSITORY_LATENCY.observe(time.perf_counter() - start, component, name)
+            REPOSITORY_CALLS.inc(component, name, outcome)
+
+    if asyncio.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            outcome = 'error'
+            with timed(phase):
+                try:
+                    result = await method(*args, **kwargs)
+                    outcome = 'ok'
+                    return result
+                finally:
+                    record(start, outcome)
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        outcome = 'error'
+        with timed(phase):
+            try:
+                result = method(*args, **kwargs)
+                outcome = 'ok'
+                return result
+            finally:
+                record(start, outcome)
+    return wrapper
+
+
+class TimedRoute(APIRoute):
+    """APIRoute that times the endpoint function and the whole FastAPI handler around it."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, self._timed_endpoint(endpoint), **kwargs)
+
+    @staticmethod
+    def _timed_endpoint(endpoint):
+        # functools.wraps keeps the signature FastAPI reads dependencies from
+        if asyncio.iscoroutinefunction(endpoint):
+            @functools.wraps(endpoint)
+            async def async_endpoint(*args, **kwargs):
+                with timed('endpoint'):
+                    return await endpoint(*args, **kwargs)
+            return async_endpoint
+
+        @functools.wraps(endpoint)
+        def sync_endpoint(*args, **kwargs):
+            with timed('endpoint'):
+                return endpoint(*args, **kwargs)
+        return sync_endpoint
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            # Lets the middleware label latency with the route template, not the raw path
+            request.scope['route'] = self
+            with timed('route'):
+                return await handler(request)
+        return timed_handler
+
+
+def route_class():
+    return TimedRoute if settings.METRICS_ENABLED else APIRoute
+
+
+# DynamoDB capacity
+
+def register_dynamodb_hooks(client):
+    """Ask DynamoDB for consumed capacity on every data call and count it."""
+    for operation in CAPACITY_OPERATIONS:
+        client.meta.events.register(f'provide-client-params.dynamodb.{operation}', _request_capacity)
+    client.meta.events.register('after-call.dynamodb', _record_dynamodb_call)
+
+
+def _request_capacity(params, **kwargs):
+    params.setdefault('ReturnConsumedCapacity', 'TOTAL')
+
+
+def _record_dynamodb_call(parsed, model, **kwargs):
+    DYNAMODB_REQUESTS.inc(model.name)
+    consumed = parsed.get('ConsumedCapacity')
+    if isinstance(consumed, dict):
+        consumed = [consumed]
+    for entry in consumed or []:
+        DYNAMODB_CAPACITY.inc(entry.get('TableName', ''), model.name, amount=float(entry.get('CapacityUnits', 0)))
+
+
+def render(gauges: dict = None) -> str:
+    """All metrics in the Prometheus text format; `gauges` adds {name: value} snapshots."""
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    for name, value in sorted((gauges or {}).items()):
+        lines.append(f'# TYPE {name} gauge')
+        lines.append(f'{name} {value}')
+    return '\n'.join(lines) + '\n'
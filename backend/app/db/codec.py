@@ -0,0 +1,228 @@
+import json
+import struct
+from app.models.game import Game, Round, RoundResult, GameStatus
+
+# Codecs turn a Game into a DynamoDB item and back. All of them can read
+# items written by any other codec, so switching GAME_CODEC never strands
+# existing games.
+
+RESULT_FIELDS = list(RoundResult.__fields__)
+
+# Packed round layout (little-endian): format version, round_num, cards_dealt,
+# then bids, results and totals sections. Each section is a count followed by
+# entries of (player ref, values); a player ref is an index into game.players,
+# or 0xFF + length + UTF-8 name for names that aren't in the player list.
+PACKED_VERSION = 1
+_HEADER = struct.Struct('<BHH')
+_COUNT = struct.Struct('<H')
+_REF = struct.Struct('<B')
+_INT = struct.Struct('<i')
+_RESULT = struct.Struct('<' + 'i' * len(RESULT_FIELDS))
+_INLINE_NAME = 0xFF
+
+
+def _to_int(value):
+    # DynamoDB hands numbers back as Decimal
+    return int(value)
+
+
+def _int_map(raw) -> dict:
+    return {k: int(v) for k, v in raw.items()}
+
+
+def _pack_ref(name: str, player_index: dict) -> bytes:
+    idx = player_index.get(name)
+    if idx is not None and idx < _INLINE_NAME:
+        return _REF.pack(idx)
+    encoded = name.encode('utf-8')
+    return _REF.pack(_INLINE_NAME) + _REF.pack(len(encoded)) + encoded
+
+
+def _unpack_ref(data: bytes, offset: int, players: list) -> tuple:
+    idx = data[offset]
+    offset += 1
+    if idx != _INLINE_NAME:
+        return players[idx], offset
+    length = data[offset]
+    offset += 1
+    return data[offset:offset + length].decode('utf-8'), offset + length
+
+
+def pack_round(r: Round, players: list) -> bytes:
+    player_index = {p: i for i, p in enumerate(players)}
+    parts = [_HEADER.pack(PACKED_VERSION, r.round_num, r.cards_dealt)]
+
+    parts.append(_COUNT.pack(len(r.bids)))
+    for name, bid in r.bids.items():
+        parts.append(_pack_ref(name, player_index) + _INT.pack(bid))
+
+    parts.append(_COUNT.pack(len(r.results)))
+    for name, res in r.results.items():
+        parts.append(_pack_ref(name, player_index) + _RESULT.pack(*(getattr(res, f) for f in RESULT_FIELDS)))
+
+    parts.append(_COUNT.pack(len(r.totals)))
+    for name, total in r.totals.items():
+        parts.append(_pack_ref(name, player_index) + _INT.pack(total))
+
+    return b''.join(parts)
+
+
+def unpack_round(data: bytes, players: list) -> Round:
+    version, round_num, cards_dealt = _HEADER.unpack_from(data, 0)
+    if version != PACKED_VERSION:
+        raise ValueError(f"Unsupported packed round version {version}")
+    offset = _HEADER.size
+
+    def read_section(value_struct):
+        nonlocal offset
+        (count,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        entries = {}
+        for _ in range(count):
+            name, offset = _unpack_ref(data, offset, players)
+            entries[name] = value_struct.unpack_from(data, offset)
+            offset += value_struct.size
+        return entries
+
+    bids = {name: values[0] for name, values in read_section(_INT).items()}
+    results = {
+        name: RoundResult.construct(**dict(zip(RESULT_FIELDS, values)))
+        for name, values in read_section(_RESULT).items()
+    }
+    totals = {name: values[0] for name, values in read_section(_INT).items()}
+    return Round.construct(round_num=round_num, cards_dealt=cards_dealt, bids=bids, results=results, totals=totals)
+
+
+def _is_packed(raw) -> bool:
+    return not isinstance(raw, dict)
+
+
+def _packed_bytes(raw) -> bytes:
+    # boto3 returns Binary attributes wrapped in boto3.dynamodb.types.Binary
+    return raw.value if hasattr(raw, 'value') else bytes(raw)
+
+
+def decode_round(raw, players: list) -> Round:
+    if _is_packed(raw):
+        return unpack_round(_packed_bytes(raw), players)
+    kwargs = {'round_num': _to_int(raw['round_num']), 'cards_dealt': _to_int(raw['cards_dealt'])}
+    if 'bids' in raw:
+        kwargs['bids'] = _int_map(raw['bids'])
+    if 'results' in raw:
+        kwargs['results'] = {
+            name: RoundResult.construct(**_int_map(res)) for name, res in raw['results'].items()
+        }
+    if 'totals' in raw:
+        kwargs['totals'] = _int_map(raw['totals'])
+    return Round.construct(**kwargs)
+
+
+class JsonCodec:
+    """
+    The original path: serialize to a JSON string, parse it back, and run
+    full pydantic validation on read. Kept as the reference implementation.
+    """
+    supports_round_fields = True
+
+    def encode_game(self, game: Game) -> dict:
+        return json.loads(game.json())
+
+    def encode_round(self, r: Round, players: list):
+        return json.loads(r.json())
+
+    def encode_game_fields(self, game: Game, fields) -> dict:
+        return json.loads(game.json(include=set(fields)))
+
+    def encode_round_fields(self, r: Round, fields) -> dict:
+        return json.loads(r.json(include=set(fields)))
+
+    def decode_game(self, item: dict) -> Game:
+        if any(_is_packed(r) for r in item.get('rounds', [])):
+            item = dict(item, rounds=[decode_round(r, item['players']).dict() for r in item['rounds']])
+        return Game(**item)
+
+
+class DictCodec(JsonCodec):
+    """
+    Builds items straight from the models without a JSON round trip, and
+    reads them back by converting Decimals to ints and constructing the
+    models directly, skipping re-validation of data we wrote ourselves.
+    """
+
+    def _round_item(self, r: Round) -> dict:
+        return {
+            'round_num': r.round_num,
+            'cards_dealt': r.cards_dealt,
+            'bids': dict(r.bids),
+            'results': {name: res.dict() for name, res in r.results.items()},
+            'totals': dict(r.totals)
+        }
+
+    def _game_value(self, game: Game, field: str):
+        if field == 'status':
+            return GameStatus(game.status).value
+        if field == 'rounds':
+            return [self.encode_round(r, game.players) for r in game.rounds]
+        value = getattr(game, field)
+        if isinstance(value, dict):
+            return dict(value)
+        if isinstance(value, list):
+            return list(value)
+        return value
+
+    def encode_game(self, game: Game) -> dict:
+        return {field: self._game_value(game, field) for field in Game.__fields__}
+
+    def encode_round(self, r: Round, players: list):
+        return self._round_item(r)
+
+    def encode_game_fields(self, game: Game, fields) -> dict:
+        return {field: self._game_value(game, field) for field in fields}
+
+    def encode_round_fields(self, r: Round, fields) -> dict:
+        item = self._round_item(r)
+        return {field: item[field] for field in fields}
+
+    def decode_game(self, item: dict) -> Game:
+        players = list(item['players'])
+        kwargs = {
+            'players': players,
+            'game_id': item['game_id'],
+            'date': item['date'],
+            'status': GameStatus(item['status']),
+            'rounds': [decode_round(r, players) for r in item.get('rounds', [])]
+        }
+        for field in ('totals', 'ranks'):
+            if field in item:
+                kwargs[field] = _int_map(item[field])
+        if 'version' in item:
+            kwargs['version'] = _to_int(item['version'])
+        game = Game.construct(**kwargs)
+        # construct() skips validators; building the round index rejects duplicates
+        game.round_positions()
+        return game
+
+
+class PackedCodec(DictCodec):
+    """
+    Like DictCodec, but stores each round as one compact binary value keyed
+    by player index instead of nested maps repeating every player name.
+    Rounds can only be rewritten whole, not field by field.
+    """
+    supports_round_fields = False
+
+    def encode_round(self, r: Round, players: list):
+        return pack_round(r, players)
+
+
+CODECS = {
+    'json': JsonCodec,
+    'dict': DictCodec,
+    'packed': PackedCodec,
+}
+
+
+def get_codec(name: str):
+    if name not in CODECS:
+        raise ValueError(f"Unknown game codec '{name}', expected one of {sorted(CODECS)}")
+    return CODECS[name]()
@@ -1,6 +1,75 @@
-import boto3
+import asyncio
 from app.core.config import settings
 
-def get_dynamodb_table():
-    dynamodb = boto3.resource('dynamodb', region_name=settings.AWS_REGION)
-    return dynamodb.Table(settings.DYNAMODB_TABLE)
+# One boto3 resource per process, created on first use. boto3 is imported
+# lazily so the in-memory mode and a cold start never pay for it up front.
+_dynamodb = None
+_tables = {}
+
+# The async (aioboto3) resource is tied to the event loop it was opened on
+_async_dynamodb = None
+_async_context = None
+_async_loop = None
+_async_tables = {}
+
+def _resource_kwargs() -> dict:
+    kwargs = {'region_name': settings.AWS_REGION}
+    if settings.DYNAMODB_ENDPOINT_URL:
+        kwargs['endpoint_url'] = settings.DYNAMODB_ENDPOINT_URL
+    return kwargs
+
+def _instrument(resource):
+    if settings.METRICS_ENABLED:
+        from app.core.metrics import register_dynamodb_hooks
+        register_dynamodb_hooks(resource.meta.client)
+    return resource
+
+def get_dynamodb_resource():
+    global _dynamodb
+    if _dynamodb is None:
+        import boto3
+        _dynamodb = _instrument(boto3.resource('dynamodb', **_resource_kwargs()))
+    return _dynamodb
+
+def get_dynamodb_table(table_name: str = None):
+    table_name = table_name or settings.DYNAMODB_TABLE
+    if table_name not in _tables:
+        _tables[table_name] = get_dynamodb_resource().Table(table_name)
+    return _tables[table_name]
+
+async def get_async_dynamodb_resource():
+    global _async_dynamodb, _async_context, _async_loop
+    loop = asyncio.get_running_loop()
+    if _async_dynamodb is None or _async_loop is not loop:
+        import aioboto3
+        _async_context = aioboto3.Session().resource('dynamodb', **_resource_kwargs())
+        _async_dynamodb = _instrument(await _async_context.__aenter__())
+        _async_loop = loop
+        _async_tables.clear()
+    return _async_dynamodb
+
+async def get_async_dynamodb_table(table_name: str = None):
+    table_name = table_name or settings.DYNAMODB_TABLE
+    dynamodb = await get_async_dynamodb_resource()
+    if table_name not in _async_tables:
+        _async_tables[table_name] = await dynamodb.Table(table_name)
+    return _async_tables[table_name]
+
+async def close_async_dynamodb():
+    global _async_dynamodb, _async_context, _async_loop
+    if _async_context is not None and _async_loop is asyncio.get_running_loop():
+        await _async_context.__aexit__(None, None, None)
+    _async_dynamodb = None
+    _async_context = None
+    _async_loop = None
+    _async_tables.clear()
+
+def reset_dynamodb():
+    # Drop cached clients, e.g. when tests switch to a mocked AWS
+    global _dynamodb, _async_dynamodb, _async_context, _async_loop
+    _dynamodb = None
+    _tables.clear()
+    _async_dynamodb = None
+    _async_context = None
+    _async_loop = None
+    _async_tables.clear()
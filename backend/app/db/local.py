@@ -0,0 +1,49 @@
+from app.core.config import settings
+from app.db.memory import StripedGameStore, MemoryUserStore, MemoryCounterStore
+from app.db.sqlite import SqliteGameStore, SqliteUserStore, SqliteCounterStore
+
+# What the repositories store games, user stats and analytics counters in
+# when USE_DYNAMODB is off, selected by LOCAL_STORE.
+
+GAME_STORES = {
+    'memory': StripedGameStore,
+    'sqlite': SqliteGameStore,
+}
+
+USER_STORES = {
+    'memory': MemoryUserStore,
+    'sqlite': SqliteUserStore,
+}
+
+COUNTER_STORES = {
+    'memory': MemoryCounterStore,
+    'sqlite': SqliteCounterStore,
+}
+
+
+def get_game_store(name: str):
+    if name not in GAME_STORES:
+        raise ValueError(f"Unknown local store '{name}', expected one of {sorted(GAME_STORES)}")
+    return GAME_STORES[name]()
+
+
+def get_user_store(name: str, fields):
+    """A user store indexing the leaderboard `fields`."""
+    if name not in USER_STORES:
+        raise ValueError(f"Unknown local store '{name}', expected one of {sorted(USER_STORES)}")
+    return USER_STORES[name](fields)
+
+
+def get_counter_store(name: str):
+    if name not in COUNTER_STORES:
+        raise ValueError(f"Unknown local store '{name}', expected one of {sorted(COUNTER_STORES)}")
+    return COUNTER_STORES[name]()
+
+
+def check_async_store():
+    """
+    The async repositories call the local store on the event loop, which
+    only the memory store never blocks; SQLite would stall every request.
+    """
+    if not settings.USE_DYNAMODB and settings.LOCAL_STORE != 'memory':
+        raise ValueError("ASYNC_ENDPOINTS needs DynamoDB or the memory store")
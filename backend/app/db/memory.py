@@ -0,0 +1,168 @@
+import threading
+from bisect import bisect_left, bisect_right, insort
+from app.core.config import settings
+from app.models.compact import CompactGameStore
+from app.models.game import Game
+from app.models.user import UserStats
+
+# In-process stores for running without DynamoDB. FastAPI runs the sync
+# endpoints in a threadpool, so everything here is safe to call from many
+# threads at once. Nothing survives a restart; see app.db.sqlite for that.
+
+
+class StripedLocks:
+    """
+    A fixed set of re-entrant locks shared by key hash: two games only
+    contend when they land on the same stripe, and the number of locks
+    doesn't grow with the number of games.
+    """
+
+    def __init__(self, stripes: int = None):
+        self._locks = [threading.RLock() for _ in range(stripes or settings.GAME_LOCK_STRIPES)]
+
+    def __getitem__(self, key: str) -> threading.RLock:
+        return self._locks[hash(key) % len(self._locks)]
+
+
+class StripedGameStore(CompactGameStore):
+    """
+    CompactGameStore with a lock per game (striped). Reads take no lock: a
+    write swaps in a new CompactGame rather than changing the stored one.
+    Listings are kept alongside as sorted sort keys, written by the
+    repository through index().
+    """
+
+    def __init__(self, stripes: int = None):
+        super().__init__()
+        self.locks = StripedLocks(stripes)
+        self.listings = {}  # listing -> sorted sort keys
+        self._indexed = {}  # game_id -> (sort_key, listings)
+        self._listings_lock = threading.Lock()
+
+    def __delitem__(self, game_id: str):
+        super().__delitem__(game_id)
+        with self._listings_lock:
+            self._unindex(game_id)
+
+    def lock(self, game_id: str) -> threading.RLock:
+        """The lock to hold across a read-modify-write of the game."""
+        return self.locks[game_id]
+
+    def replace(self, game: Game, expected_version: int) -> bool:
+        """Store `game` if the stored one is still at `expected_version` (like DynamoDB's conditional write)."""
+        with self.locks[game.game_id]:
+            stored = self._games.get(game.game_id)
+            if stored is not None and stored.version != expected_version:
+                return False
+            self[game.game_id] = game
+            return True
+
+    def index(self, game_id: str, sort_key: str, listings: list[str]):
+        """Replace the game's listing entries."""
+        with self._listings_lock:
+            self._unindex(game_id)
+            self._indexed[game_id] = (sort_key, listings)
+            for listing in listings:
+                # O(log n) to find the spot, like the leaderboards
+                insort(self.listings.setdefault(listing, []), sort_key)
+
+    def page(self, listing: str, bound: str, limit: int) -> list[tuple]:
+        """(sort_key, game_id, date, players) for up to `limit` + 1 games, newest first, below `bound`."""
+        with self._listings_lock:
+            keys = self.listings.get(listing, [])
+            end = bisect_left(keys, bound) if bound else len(keys)
+            rows = []
+            for key in reversed(keys[max(0, end - limit - 1):end]):
+                game = self._games[key.rpartition('#')[2]]
+                rows.append((key, game.game_id, game.date, list(game.names[:game.num_players])))
+            return rows
+
+    def _unindex(self, game_id: str):
+        sort_key, listings = self._indexed.pop(game_id, (None, ()))
+        for listing in listings:
+            keys = self.listings[listing]
+            del keys[bisect_left(keys, sort_key)]
+
+
+class MemoryUserStore:
+    """
+    User stats plus one sorted (-value, username) index per leaderboard
+    field. Every write touches those shared indexes, so one lock guards the
+    whole store rather than one per user.
+    """
+
+    def __init__(self, fields):
+        self.users = {}
+        self.leaderboards = {field: [] for field in fields}
+        self._indexed = {}
+        self.completed_games = set()
+        self._lock = threading.RLock()
+
+    def get(self, username: str) -> UserStats:
+        return self.users.get(username)
+
+    def put(self, stats: UserStats):
+        with self._lock:
+            self.users[stats.username] = stats
+            self._reindex(stats)
+
+    def record(self, results: dict, game_id: str, apply):
+        """
+        Apply `apply(stats, counts)` for every username -> counts, all at
+        once, unless `game_id` was already recorded.
+        """
+        with self._lock:
+            if game_id is not None:
+                if game_id in self.completed_games:
+                    return
+                self.completed_games.add(game_id)
+            for username, counts in results.items():
+                self.put(apply(self.users.get(username) or UserStats(username=username), counts))
+
+    def page(self, field: str, after, limit: int) -> tuple[list[UserStats], bool]:
+        """Up to `limit` users by `field`, highest first, after the (value, username) `after`; and whether more follow."""
+        with self._lock:
+            index = self.leaderboards[field]
+            start = bisect_right(index, (-float(after[0]), after[1])) if after else 0
+            page = index[start:start + limit]
+            return [self.users[username] for _, username in page], start + limit < len(index)
+
+    def _reindex(self, stats: UserStats):
+        old = self._indexed.get(stats.username, {})
+        for field, index in self.leaderboards.items():
+            if field in old:
+                # bisect to the exact key, keeping updates O(log n) to find
+                key = (-old[field], stats.username)
+                del index[bisect_left(index, key)]
+            insort(index, (-getattr(stats, field), stats.username))
+        self._indexed[stats.username] = {field: getattr(stats, field) for field in self.leaderboards}
+
+
+class MemoryCounterStore:
+    """Analytics counters, {username: {counter: int}}, under one lock (increments are read-modify-write)."""
+
+    def __init__(self):
+        self.counters = {}
+        self.completed_games = set()
+        self._lock = threading.Lock()
+
+    def get(self, username: str) -> dict:
+        with self._lock:
+            return dict(self.counters.get(username, {}))
+
+    def add(self, deltas: dict, game_id: str = None):
+        """Add {username: {counter: amount}}, unless `game_id` was already counted."""
+        with self._lock:
+            if game_id is not None:
+                if game_id in self.completed_games:
+                    return
+                self.completed_games.add(game_id)
+            for username, counts in deltas.items():
+                stored = self.counters.setdefault(username, {})
+                for name, amount in counts.items():
+                    stored[name] = stored.get(name, 0) + amount
+
+    def put(self, counters: dict):
+        with self._lock:
+            for username, counts in counters.items():
+                self.counters[username] = dict(counts)
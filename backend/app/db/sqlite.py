@@ -0,0 +1,319 @@
+import json
+import queue
+import threading
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from app.core.config import settings
+from app.db.codec import DictCodec
+from app.db.memory import StripedLocks
+from app.models.game import Game
+from app.models.user import UserStats
+
+# An embedded alternative to DynamoDB for a self-hosted server: games, user
+# stats and analytics counters in one SQLite file (SQLITE_PATH) that
+# survives restarts. The database is in WAL mode, so readers never wait for
+# the writer. Statements are fixed SQL with parameters, which the sqlite3
+# module prepares once per connection and reuses from its statement cache.
+# Per-game locks are held in this process, so run one server process per
+# database file; versioned writes still make a second writer (a script,
+# say) fail instead of overwriting a newer game.
+
+STATEMENT_CACHE_SIZE = 128
+# Seconds a write waits for another connection's write to finish
+BUSY_TIMEOUT = 5.0
+# Seconds a thread waits for a free connection before giving up
+POOL_TIMEOUT = 30.0
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS games (
+    game_id TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    players TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS game_listings (
+    listing TEXT NOT NULL,
+    sort_key TEXT NOT NULL,
+    game_id TEXT NOT NULL,
+    PRIMARY KEY (listing, sort_key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS game_listings_by_game ON game_listings (game_id);
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    total_wins INTEGER NOT NULL,
+    high_score INTEGER NOT NULL,
+    games_played INTEGER NOT NULL,
+    total_score INTEGER NOT NULL,
+    average_score REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS completed_games (
+    game_id TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS analytics_counters (
+    username TEXT NOT NULL,
+    counter TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    PRIMARY KEY (username, counter)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS counted_games (
+    game_id TEXT PRIMARY KEY
+);
+'''
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class SqlitePool:
+    """A fixed set of connections to one database file; each is used by one thread at a time."""
+
+    def __init__(self, path: str, size: int):
+        import sqlite3
+        self.path = path
+        self.closed = False
+        self._idle = queue.LifoQueue()
+        for _ in range(size):
+            conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, isolation_level=None,
+                                   check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+            conn.execute('PRAGMA journal_mode=WAL')
+            # Durable at checkpoints rather than on every commit; a power cut can lose the last writes, not corrupt
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._idle.put(conn)
+        with self.connection() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def connection(self):
+        # Autocommit: a single statement is its own transaction
+        if self.closed:
+            raise RuntimeError(f"SQLite pool for '{self.path}' is closed")
+        try:
+            conn = self._idle.get(timeout=POOL_TIMEOUT)
+        except queue.Empty:
+            raise RuntimeError(f"No free SQLite connection for '{self.path}' after {POOL_TIMEOUT}s") from None
+        try:
+            yield conn
+        finally:
+            if self.closed:
+                conn.close()
+            else:
+                self._idle.put(conn)
+
+    @contextmanager
+    def transaction(self):
+        # IMMEDIATE takes the write lock up front, so two read-then-write
+        # transactions can't both read and then deadlock upgrading
+        with self.connection() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+
+    def close(self):
+        # Connections in use are closed as they come back
+        self.closed = True
+        while not self._idle.empty():
+            self._idle.get_nowait().close()
+
+
+def get_sqlite_pool(path: str = None) -> SqlitePool:
+    path = path or settings.SQLITE_PATH
+    with _pools_lock:
+        if path not in _pools:
+            _pools[path] = SqlitePool(path, settings.SQLITE_POOL_SIZE)
+        return _pools[path]
+
+
+def reset_sqlite():
+    # Close pooled connections, e.g. between tests using different files
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+
+class SqliteGameStore(MutableMapping):
+    """
+    game_id -> Game in the games table, each game one JSON document in the
+    DictCodec item format. Listings are kept in game_listings, written by
+    the repository through index().
+    """
+
+    def __init__(self, path: str = None, stripes: int = None):
+        self.pool = get_sqlite_pool(path)
+        self.locks = StripedLocks(stripes)
+        self.codec = DictCodec()
+
+    def __getitem__(self, game_id: str) -> Game:
+        with self.pool.connection() as conn:
+            row = conn.execute('SELECT data FROM games WHERE game_id = ?', (game_id,)).fetchone()
+        if row is None:
+            raise KeyError(game_id)
+        return self.codec.decode_game(json.loads(row[0]))
+
+    def __setitem__(self, game_id: str, game: Game):
+        with self.pool.connection() as conn:
+            conn.execute(
+                'INSERT INTO games (game_id, version, date, players, data) VALUES (?, ?, ?, ?, ?) '
+                'ON CONFLICT (game_id) DO UPDATE SET version = excluded.version, date = excluded.date, '
+                'players = excluded.players, data = excluded.data',
+                self._row(game)
+            )
+
+    def __delitem__(self, game_id: str):
+        with self.pool.transaction() as conn:
+            if conn.execute('DELETE FROM games WHERE game_id = ?', (game_id,)).rowcount == 0:
+                raise KeyError(game_id)
+            conn.execute('DELETE FROM game_listings WHERE game_id = ?', (game_id,))
+
+    def __iter__(self):
+        # Read the ids up front so a caller writing while iterating doesn't hold the connection
+        with self.pool.connection() as conn:
+            game_ids = [row[0] for row in conn.execute('SELECT game_id FROM games')]
+        return iter(game_ids)
+
+    def __len__(self) -> int:
+        with self.pool.connection() as conn:
+            return conn.execute('SELECT COUNT(*) FROM games').fetchone()[0]
+
+    def lock(self, game_id: str) -> threading.RLock:
+        return self.locks[game_id]
+
+    def replace(self, game: Game, expected_version: int) -> bool:
+        # One conditional upsert: a newer game written by another connection is never overwritten
+        with self.locks[game.game_id], self.pool.connection() as conn:
+            return conn.execute(
+                'INSERT INTO games (game_id, version, date, players, data) VALUES (?, ?, ?, ?, ?) '
+                'ON CONFLICT (game_id) DO UPDATE SET version = excluded.version, data = excluded.data '
+                'WHERE games.version = ?',
+                self._row(game) + (expected_version,)
+            ).rowcount == 1
+
+    def index(self, game_id: str, sort_key: str, listings: list[str]):
+        """Replace the game's listing entries."""
+        with self.pool.transaction() as conn:
+            conn.execute('DELETE FROM game_listings WHERE game_id = ?', (game_id,))
+            conn.executemany('INSERT INTO game_listings (listing, sort_key, game_id) VALUES (?, ?, ?)',
+                             [(listing, sort_key, game_id) for listing in listings])
+
+    def page(self, listing: str, bound: str, limit: int) -> list[tuple]:
+        """(sort_key, game_id, date, players) for up to `limit` + 1 games, newest first, below `bound`."""
+        with self.pool.connection() as conn:
+            if bound:
+                rows = conn.execute(
+                    'SELECT l.sort_key, g.game_id, g.date, g.players FROM game_listings l '
+                    'JOIN games g ON g.game_id = l.game_id WHERE l.listing = ? AND l.sort_key < ? '
+                    'ORDER BY l.sort_key DESC LIMIT ?',
+                    (listing, bound, limit + 1)
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    'SELECT l.sort_key, g.game_id, g.date, g.players FROM game_listings l '
+                    'JOIN games g ON g.game_id = l.game_id WHERE l.listing = ? '
+                    'ORDER BY l.sort_key DESC LIMIT ?',
+                    (listing, limit + 1)
+                ).fetchall()
+        return [(sort_key, game_id, date, json.loads(players)) for sort_key, game_id, date, players in rows]
+
+    def _row(self, game: Game) -> tuple:
+        item = self.codec.encode_game(game)
+        return (game.game_id, game.version, game.date, json.dumps(item['players']), json.dumps(item))
+
+
+USER_COLUMNS = tuple(UserStats.__fields__)
+
+
+class SqliteUserStore:
+    """User stats in the users table, with an index per leaderboard field so a page is one range read."""
+
+    def __init__(self, fields, path: str = None):
+        self.pool = get_sqlite_pool(path)
+        self.fields = tuple(fields)
+        columns = ', '.join(USER_COLUMNS)
+        self._select = f'SELECT {columns} FROM users'
+        self._upsert = (
+            f'INSERT INTO users ({columns}) VALUES ({", ".join("?" for _ in USER_COLUMNS)}) '
+            'ON CONFLICT (username) DO UPDATE SET '
+            + ', '.join(f'{c} = excluded.{c}' for c in USER_COLUMNS if c != 'username')
+        )
+        with self.pool.connection() as conn:
+            for field in self.fields:
+                conn.execute(f'CREATE INDEX IF NOT EXISTS users_by_{field} ON users ({field} DESC, username)')
+
+    def get(self, username: str) -> UserStats:
+        with self.pool.connection() as conn:
+            return self._stats(conn.execute(self._select + ' WHERE username = ?', (username,)).fetchone())
+
+    def put(self, stats: UserStats):
+        with self.pool.connection() as conn:
+            conn.execute(self._upsert, self._values(stats))
+
+    def record(self, results: dict, game_id: str, apply):
+        with self.pool.transaction() as conn:
+            if game_id is not None:
+                marked = conn.execute('INSERT OR IGNORE INTO completed_games (game_id) VALUES (?)', (game_id,))
+                if marked.rowcount == 0:
+                    return
+            for username, counts in results.items():
+                row = conn.execute(self._select + ' WHERE username = ?', (username,)).fetchone()
+                stats = self._stats(row) or UserStats(username=username)
+                conn.execute(self._upsert, self._values(apply(stats, counts)))
+
+    def page(self, field: str, after, limit: int) -> tuple[list[UserStats], bool]:
+        if field not in self.fields:
+            raise ValueError(f"Unknown leaderboard field '{field}'")
+        order = f' ORDER BY {field} DESC, username LIMIT ?'
+        with self.pool.connection() as conn:
+            if after:
+                value, username = float(after[0]), after[1]
+                rows = conn.execute(
+                    self._select + f' WHERE {field} < ? OR ({field} = ? AND username > ?)' + order,
+                    (value, value, username, limit + 1)
+                ).fetchall()
+            else:
+                rows = conn.execute(self._select + order, (limit + 1,)).fetchall()
+        return [self._stats(row) for row in rows[:limit]], len(rows) > limit
+
+    def _stats(self, row) -> UserStats:
+        if row is None:
+            return None
+        return UserStats(**dict(zip(USER_COLUMNS, row)))
+
+    def _values(self, stats: UserStats) -> tuple:
+        return tuple(getattr(stats, c) for c in USER_COLUMNS)
+
+
+class SqliteCounterStore:
+    """Analytics counters as (username, counter, value) rows, added to with an upsert like DynamoDB's ADD."""
+
+    def __init__(self, path: str = None):
+        self.pool = get_sqlite_pool(path)
+
+    def get(self, username: str) -> dict:
+        with self.pool.connection() as conn:
+            rows = conn.execute('SELECT counter, value FROM analytics_counters WHERE username = ?', (username,))
+            return dict(rows.fetchall())
+
+    def add(self, deltas: dict, game_id: str = None):
+        with self.pool.transaction() as conn:
+            if game_id is not None:
+                marked = conn.execute('INSERT OR IGNORE INTO counted_games (game_id) VALUES (?)', (game_id,))
+                if marked.rowcount == 0:
+                    return
+            conn.executemany(
+                'INSERT INTO analytics_counters (username, counter, value) VALUES (?, ?, ?) '
+                'ON CONFLICT (username, counter) DO UPDATE SET value = value + excluded.value',
+                [(username, name, amount) for username, counts in deltas.items() for name, amount in counts.items()]
+            )
+
+    def put(self, counters: dict):
+        with self.pool.transaction() as conn:
+            conn.executemany('DELETE FROM analytics_counters WHERE username = ?', [(u,) for u in counters])
+            conn.executemany(
+                'INSERT INTO analytics_counters (username, counter, value) VALUES (?, ?, ?)',
+                [(username, name, value) for username, counts in counters.items() for name, value in counts.items()]
+            )
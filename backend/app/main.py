@@ -1,6 +1,19 @@
-from fastapi import FastAPI
+import time
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.endpoints import games, users
+from fastapi.responses import PlainTextResponse
+from app.core import metrics
+from app.core.config import settings
+from app.core.http import CompressionMiddleware
+from app.core.idempotency import IdempotencyMiddleware, get_idempotency_store, REPLAYED_HEADER
+from app.db.dynamodb import get_dynamodb_table, close_async_dynamodb
+
+if settings.ASYNC_ENDPOINTS:
+    from app.api.endpoints import async_games as games, async_users as users
+else:
+    from app.api.endpoints import games, users
+from app.api.endpoints import advisor
+from app.services.bid_advisor import close_advisor_pool
 
 app = FastAPI(title="Skull King Companion API", version="0.1.0")
 
@@ -11,10 +24,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Lets browser clients read the ETag for their own conditional requests
+    expose_headers=["ETag", REPLAYED_HEADER],
 )
 
+if settings.IDEMPOTENCY_TTL > 0:
+    # Inside compression, so a replayed response is compressed like the original
+    app.add_middleware(IdempotencyMiddleware, store=get_idempotency_store(settings.IDEMPOTENCY_STORE))
+
+if settings.COMPRESSION_MINIMUM_SIZE > 0:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
 app.include_router(games.router, prefix="/api/games", tags=["games"])
 app.include_router(users.router, prefix="/api/users", tags=["users"])
+app.include_router(advisor.router, prefix="/api/advisor", tags=["advisor"])
 
 @app.get("/")
 def read_root():
@@ -24,5 +47,44 @@ def read_root():
 def health_check():
     return {"status": "healthy"}
 
-from mangum import Mangum
-handler = Mangum(app)
+if settings.METRICS_ENABLED:
+    @app.middleware("http")
+    async def record_timing(request: Request, call_next):
+        timings = metrics.start_request()
+        start = time.perf_counter()
+        response = await call_next(request)
+        total = time.perf_counter() - start
+        route = request.scope.get('route')
+        # App-level routes (/, /health, /metrics) have no parameters, so their path is the template
+        path = route.path if route else (request.url.path if 'endpoint' in request.scope else None)
+        metrics.observe_request(request.method, path, response.status_code, total)
+        response.headers['Server-Timing'] = metrics.server_timing(timings, total)
+        return response
+
+    @app.get("/metrics", include_in_schema=False)
+    def get_metrics():
+        from app.api import deps
+        service = deps.get_async_game_service() if settings.ASYNC_ENDPOINTS else deps.get_game_service()
+        gauges = {f'game_cache_{k}': v for k, v in service.repo.cache_stats().items()}
+        gauges.update({f'live_updates_{k}': v for k, v in deps.get_update_hub().stats().items()})
+        return PlainTextResponse(metrics.render(gauges), media_type=metrics.CONTENT_TYPE)
+
+@app.on_event("shutdown")
+async def close_dynamodb():
+    await close_async_dynamodb()
+    close_advisor_pool()
+    from app.api import deps
+    deps.get_update_hub().close()
+
+if settings.USE_DYNAMODB and settings.PRELOAD_DYNAMODB and not settings.ASYNC_ENDPOINTS:
+    get_dynamodb_table()
+
+# Mangum is only needed when running on Lambda; build it on the first event
+_mangum = None
+
+def handler(event, context):
+    global _mangum
+    if _mangum is None:
+        from mangum import Mangum
+        _mangum = Mangum(app)
+    return _mangum(event, context)
@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+class BidAdviceRequest(BaseModel):
+    hand: List[str]
+    round_num: int = Field(..., ge=1, le=10)
+    num_players: int = Field(..., ge=2, le=8)
+
+class BidEstimate(BaseModel):
+    bid: int
+    expected_score: float
+    make_probability: float
+
+class BidAdvice(BaseModel):
+    best_bid: int
+    estimates: List[BidEstimate]
+    simulations: int
+    cached: bool = False
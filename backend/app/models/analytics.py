@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import Dict
+
+class HeadToHead(BaseModel):
+    games: int = 0 # completed games played together
+    wins: int = 0 # finished ahead of the opponent
+    losses: int = 0
+    ties: int = 0
+
+class PlayerAnalytics(BaseModel):
+    username: str
+    rounds_played: int = 0
+    bid_accuracy: float = 0 # share of rounds where tricks won == bid
+    zero_bids: int = 0
+    zero_bid_success_rate: float = 0
+    average_score_by_round: Dict[int, float] = {} # round_num -> mean round score
+    bonus_points: int = 0 # bonus points that counted (bonuses only count on a made bid)
+    bonus_share: float = 0 # bonus_points / points scored in rounds where the bid was made
+    head_to_head: Dict[str, HeadToHead] = {} # opponent -> record against them
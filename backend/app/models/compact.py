@@ -0,0 +1,190 @@
+from array import array
+from collections.abc import MutableMapping
+from app.models.game import Game, Round, RoundResult, GameStatus, Standings
+
+# A game held between requests (the in-memory store, the DynamoDB read
+# cache) as a player table plus one fixed-width int array per column,
+# instead of a Round model per round holding a RoundResult model per player
+# keyed by name. Cell (round position r, player index p) of every column is
+# at r * len(names) + p. Services still work on the pydantic Game for the
+# length of a request; it is built from this form on read and folded back
+# into it on write.
+
+RESULT_FIELDS = tuple(RoundResult.__fields__)
+# Round.bids, then every RoundResult field, then Round.totals
+COLUMNS = ('bids',) + RESULT_FIELDS + ('totals',)
+_BIDS = 0
+_RESULTS = slice(1, 1 + len(RESULT_FIELDS))
+_TRICKS = 1 + RESULT_FIELDS.index('tricks_won')
+_TOTALS = len(COLUMNS) - 1
+# What score_rows() returns by default: the inputs to scoring a round
+SCORE_ROW_FIELDS = ('bid', 'tricks_won', 'bonus_points', 'penalty_points', 'loot_bonus')
+# An empty cell (no bid or result yet); the smallest value an 'i' array holds
+MISSING = -2 ** 31
+TYPECODE = 'i'
+
+
+class CompactGame:
+    """
+    One game in columnar form. `names` is the player list followed by any
+    other name a round or the totals mention, so every cell has an index.
+    """
+    __slots__ = ('game_id', 'date', 'status', 'version', 'num_players', 'names',
+                 'round_nums', 'cards_dealt', 'columns', 'totals', 'ranks')
+
+    @classmethod
+    def from_game(cls, game: Game) -> 'CompactGame':
+        index = {name: i for i, name in enumerate(game.players)}
+        names = list(game.players)
+        for keyed in _keyed_maps(game):
+            for name in keyed:
+                if name not in index:
+                    index[name] = len(names)
+                    names.append(name)
+
+        width = len(names)
+        cells = [[MISSING] * (width * len(game.rounds)) for _ in COLUMNS]
+        bids, totals = cells[_BIDS], cells[_TOTALS]
+        results = cells[_RESULTS]
+        for r, game_round in enumerate(game.rounds):
+            base = r * width
+            for name, bid in game_round.bids.items():
+                bids[base + index[name]] = bid
+            for name, res in game_round.results.items():
+                cell = base + index[name]
+                values = res.__dict__
+                for column, field in zip(results, RESULT_FIELDS):
+                    column[cell] = values[field]
+            for name, total in game_round.totals.items():
+                totals[base + index[name]] = total
+
+        compact = cls()
+        compact.game_id = game.game_id
+        compact.date = game.date
+        compact.status = GameStatus(game.status)
+        compact.version = game.version
+        compact.num_players = len(game.players)
+        compact.names = tuple(names)
+        compact.round_nums = array(TYPECODE, (r.round_num for r in game.rounds))
+        compact.cards_dealt = array(TYPECODE, (r.cards_dealt for r in game.rounds))
+        compact.columns = tuple(array(TYPECODE, column) for column in cells)
+        compact.totals = _player_array(game.totals, index, width)
+        compact.ranks = _player_array(game.ranks, index, width)
+        return compact
+
+    def to_game(self) -> Game:
+        """A new Game; nothing in it is shared with this object."""
+        names = self.names
+        width = len(names)
+        bid_column, total_column = self.columns[_BIDS], self.columns[_TOTALS]
+        tricks_column = self.columns[_TRICKS]
+        result_columns = self.columns[_RESULTS]
+        rounds = []
+        for r, round_num in enumerate(self.round_nums):
+            row = slice(r * width, (r + 1) * width)
+            # One slice per column and round; zip(*...) turns them into per-player result values
+            results = {
+                name: _model(RoundResult, dict(zip(RESULT_FIELDS, values)))
+                for name, tricks, values in zip(names, tricks_column[row], zip(*[c[row] for c in result_columns]))
+                if tricks != MISSING
+            }
+            rounds.append(_model(Round, {
+                'round_num': round_num,
+                'cards_dealt': self.cards_dealt[r],
+                'bids': _row_map(names, bid_column[row]),
+                'results': results,
+                'totals': _row_map(names, total_column[row])
+            }))
+        # Built from a Game that was already validated, so skip validation again
+        return Game.construct(
+            game_id=self.game_id,
+            players=list(names[:self.num_players]),
+            date=self.date,
+            status=self.status,
+            rounds=rounds,
+            totals=_row_map(names, self.totals),
+            ranks=_row_map(names, self.ranks),
+            version=self.version
+        )
+
+    def standings(self) -> Standings:
+        return Standings(game_id=self.game_id, status=self.status,
+                         totals=_row_map(self.names, self.totals), ranks=_row_map(self.names, self.ranks))
+
+    def score_rows(self, fields: tuple = SCORE_ROW_FIELDS) -> list[tuple]:
+        """
+        (player, round_num, *fields) for every recorded result, read straight
+        off the columns; `fields` are RoundResult fields.
+        """
+        columns = [self.columns[COLUMNS.index(f)] for f in fields]
+        tricks = self.columns[_TRICKS]
+        names = self.names
+        width = len(names)
+        rows = []
+        for r, round_num in enumerate(self.round_nums):
+            base = r * width
+            for p in range(width):
+                cell = base + p
+                if tricks[cell] != MISSING:
+                    rows.append((names[p], round_num) + tuple(column[cell] for column in columns))
+        return rows
+
+
+def _row_map(names: tuple, values) -> dict:
+    return {name: value for name, value in zip(names, values) if value != MISSING}
+
+
+def _model(cls, values: dict):
+    # What construct() does for a model with every field given and no
+    # private attributes, minus its per-field default handling (this is most
+    # of the cost of reading a game back)
+    model = cls.__new__(cls)
+    object.__setattr__(model, '__dict__', values)
+    object.__setattr__(model, '__fields_set__', set(values))
+    return model
+
+
+def _keyed_maps(game: Game):
+    yield game.totals
+    yield game.ranks
+    for r in game.rounds:
+        yield r.bids
+        yield r.results
+        yield r.totals
+
+
+def _player_array(values: dict, index: dict, width: int) -> array:
+    cells = [MISSING] * width
+    for name, value in values.items():
+        cells[index[name]] = value
+    return array(TYPECODE, cells)
+
+
+class CompactGameStore(MutableMapping):
+    """
+    game_id -> Game, held as CompactGame. Games are converted on the way in
+    and out, so a caller changing the Game it read never changes the stored
+    one behind the repository's back (the same as with DynamoDB).
+    """
+
+    def __init__(self):
+        self._games = {}
+
+    def __getitem__(self, game_id: str) -> Game:
+        return self._games[game_id].to_game()
+
+    def __setitem__(self, game_id: str, game: Game):
+        self._games[game_id] = CompactGame.from_game(game)
+
+    def __delitem__(self, game_id: str):
+        del self._games[game_id]
+
+    def __iter__(self):
+        return iter(self._games)
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def compact(self, game_id: str) -> CompactGame:
+        """The stored form itself (None if missing), for reads that don't need the whole Game."""
+        return self._games.get(game_id)
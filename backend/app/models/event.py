@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from typing import List, Dict, Any, Optional
+from enum import Enum
+
+class EventType(str, Enum):
+    CREATED = "created"
+    ROUND_STARTED = "round_started"
+    BIDS_SUBMITTED = "bids_submitted"
+    RESULTS_SUBMITTED = "results_submitted"
+    BATCH = "batch"  # several changes written together (POST /batch)
+    REPLACED = "replaced"  # whole game rewritten, e.g. a legacy game rescored
+    IMPORTED = "imported"  # restored from an archive
+
+class GameEvent(BaseModel):
+    game_id: str
+    seq: int  # the game version this event produces
+    timestamp: str
+    type: EventType
+    # What the event set: {"fields": {...}} for game fields,
+    # {"round_num": n, "fields": {...}} for a round's fields and
+    # {"round_num": n, "new": {...}} for a round started
+    changes: List[Dict[str, Any]] = []
+    game: Optional[Dict[str, Any]] = None  # the whole game, for created/replaced/imported
+    correction: bool = False  # re-sets bids or results an earlier event already set
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, validator, root_validator
 from typing import List, Dict, Optional
 from enum import Enum
 from datetime import datetime
@@ -30,6 +30,7 @@ class Round(BaseModel):
     cards_dealt: int
     bids: Dict[str, int] = {}  # player_name -> bid
     results: Dict[str, RoundResult] = {} # player_name -> result
+    totals: Dict[str, int] = {} # player_name -> cumulative score after this round
 
 class GameBase(BaseModel):
     players: List[str]
@@ -42,6 +43,105 @@ class Game(GameBase):
     date: str
     status: GameStatus
     rounds: List[Round] = []
+    totals: Dict[str, int] = {} # player_name -> running total
+    ranks: Dict[str, int] = {} # player_name -> current rank (1 = leading, ties share)
+    version: int = 0 # Incremented on every write, used for conditional updates
+
+    # round_num -> position in rounds, so lookups and duplicate checks are O(1)
+    _round_positions: Dict[int, int] = PrivateAttr(default=None)
+    _indexed_rounds: list = PrivateAttr(default=None)
     
     class Config:
         orm_mode = True
+
+    @validator('rounds')
+    def round_nums_unique(cls, rounds):
+        seen = set()
+        for r in rounds:
+            if r.round_num in seen:
+                raise ValueError(f"Duplicate round {r.round_num}")
+            seen.add(r.round_num)
+        return rounds
+
+    def round_positions(self) -> Dict[int, int]:
+        # Rebuilt only when `rounds` was replaced or changed outside add_round
+        if self._indexed_rounds is not self.rounds or len(self._round_positions) != len(self.rounds):
+            positions = {}
+            for i, r in enumerate(self.rounds):
+                if r.round_num in positions:
+                    raise ValueError(f"Duplicate round {r.round_num}")
+                positions[r.round_num] = i
+            self._round_positions = positions
+            self._indexed_rounds = self.rounds
+        return self._round_positions
+
+    def round_position(self, round_num: int) -> int:
+        return self.round_positions().get(round_num, -1)
+
+    def get_round(self, round_num: int) -> Optional[Round]:
+        idx = self.round_position(round_num)
+        return self.rounds[idx] if idx != -1 else None
+
+    def add_round(self, new_round: Round):
+        positions = self.round_positions()
+        if new_round.round_num in positions:
+            raise ValueError(f"Duplicate round {new_round.round_num}")
+        self.rounds.append(new_round)
+        positions[new_round.round_num] = len(self.rounds) - 1
+
+    def working_copy(self) -> 'Game':
+        """
+        A copy that game updates can change without touching this one. They
+        only replace rounds' bids/results and update totals in place, so
+        copying those is enough and far cheaper than a deep copy.
+        """
+        rounds = [r.copy(update={'totals': dict(r.totals)}) for r in self.rounds]
+        return self.copy(update={'rounds': rounds, 'totals': dict(self.totals), 'ranks': dict(self.ranks)})
+
+class GameSummary(BaseModel):
+    game_id: str
+    date: str
+    players: List[str]
+
+class GamePage(BaseModel):
+    games: List[GameSummary] = [] # newest first
+    next_cursor: Optional[str] = None # pass back as `cursor` for the next page
+
+class Standings(BaseModel):
+    game_id: str
+    status: GameStatus
+    totals: Dict[str, int] = {}
+    ranks: Dict[str, int] = {}
+
+class OperationType(str, Enum):
+    START = "start"
+    BIDS = "bids"
+    RESULTS = "results"
+
+class GameOperation(BaseModel):
+    op: OperationType
+    round_num: int
+    bids: Optional[Dict[str, int]] = None # for "bids": player_name -> bid
+    results: Optional[Dict[str, Dict[str, int]]] = None # for "results": same body as /rounds/{n}/results
+
+    @root_validator(skip_on_failure=True)
+    def payload_present(cls, values):
+        op = values['op']
+        if op == OperationType.BIDS and values.get('bids') is None:
+            raise ValueError("bids operation needs 'bids'")
+        if op == OperationType.RESULTS and values.get('results') is None:
+            raise ValueError("results operation needs 'results'")
+        return values
+
+class GameBatch(BaseModel):
+    operations: List[GameOperation] = Field(..., min_items=1)
+    expected_version: Optional[int] = None # reject with 409 if the game was written since
+    diff: bool = False # answer with a GameDiff instead of the whole game
+
+class GameDiff(BaseModel):
+    game_id: str
+    version: int
+    status: GameStatus
+    totals: Dict[str, int] = {}
+    ranks: Dict[str, int] = {}
+    rounds: List[Round] = [] # only the rounds the batch changed
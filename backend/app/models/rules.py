@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from enum import Enum
+
+class PenaltyRule(str, Enum):
+    ALWAYS = "always"          # standard: penalties apply whatever the bid
+    MADE_BID = "made_bid"      # only when the bid was made
+    ZERO_BID = "zero_bid"      # only against a zero bid
+
+class RuleSet(BaseModel):
+    """A scoring variant; the defaults are the rules the app scores games with."""
+    name: str = "standard"
+    # Bonuses count even when the bid failed
+    bonus_on_failure: bool = False
+    # Loot (RoundResult.loot_bonus) counts even when the bid failed
+    loot_always_counts: bool = False
+    penalties: PenaltyRule = PenaltyRule.ALWAYS
+    # Rascal's scoring: 10 points per card dealt for an exact bid, half for
+    # being one off, nothing otherwise; zero bids are scored the same way
+    rascal: bool = False
+
+    class Config:
+        frozen = True
@@ -1,7 +1,22 @@
 from pydantic import BaseModel
+from typing import List, Optional
+from enum import Enum
 
 class UserStats(BaseModel):
     username: str
     total_wins: int = 0
     high_score: int = 0
     games_played: int = 0
+    total_score: int = 0
+    average_score: float = 0
+
+class LeaderboardMetric(str, Enum):
+    WINS = "wins"
+    HIGH_SCORE = "high_score"
+    AVERAGE_SCORE = "average_score"
+    GAMES_PLAYED = "games_played"
+
+class LeaderboardPage(BaseModel):
+    metric: LeaderboardMetric
+    entries: List[UserStats] = []
+    next_cursor: Optional[str] = None # pass back as `cursor` for the next page
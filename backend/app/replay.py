@@ -0,0 +1,41 @@
+"""
+Rebuild a game from its event log (GAME_EVENT_LOG) as it was at any point,
+or list its history, using the storage configured in settings.
+
+Run from backend/:
+    python -m app.replay GAME_ID                    # current state, from the log alone
+    python -m app.replay GAME_ID --seq 12           # after the 12th write
+    python -m app.replay GAME_ID --at 2026-05-01T20:15:00
+    python -m app.replay GAME_ID --history          # one event per line, corrections flagged
+"""
+import argparse
+import sys
+from app.repositories.event_repository import EventLogGameRepository
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.replay", description="Replay a game's event log")
+    parser.add_argument("game_id")
+    point = parser.add_mutually_exclusive_group()
+    point.add_argument("--seq", type=int, help="stop after the event with this seq (= game version)")
+    point.add_argument("--at", help="stop at this ISO timestamp (UTC)")
+    point.add_argument("--history", action="store_true", help="list the events instead")
+    args = parser.parse_args(argv)
+
+    repo = EventLogGameRepository()
+    if args.history:
+        for event in repo.history(args.game_id):
+            print(event.json())
+        return
+
+    try:
+        game = repo.replay(args.game_id, args.seq, args.at)
+    except ValueError as e:
+        sys.exit(str(e))
+    if game is None:
+        sys.exit(f"Game {args.game_id} not found")
+    print(game.json(indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+from app.core.config import settings
+from app.db.dynamodb import get_dynamodb_table
+from app.db.local import get_counter_store
+from app.repositories.user_repository import (
+    MAX_BATCH_ITEMS, MAX_TRANSACTION_ATTEMPTS, completion_marker, already_recorded
+)
+import random
+import time
+import uuid
+
+class AnalyticsRepository:
+    """
+    Per-player analytics counters, a flat {counter: int} per player (see
+    analytics_service for what they count). On DynamoDB each player is one
+    item in the analytics table and counts are applied with ADD, which is
+    atomic and order-independent, so concurrent submissions never lose an
+    update and nothing has to be read first.
+    """
+
+    def __init__(self):
+        self.use_dynamodb = settings.USE_DYNAMODB
+        if not self.use_dynamodb:
+            self.store = get_counter_store(settings.LOCAL_STORE)
+
+    @property
+    def table(self):
+        return get_dynamodb_table(self.table_name)
+
+    def get_counters(self, username: str) -> dict:
+        if self.use_dynamodb:
+            response = self.table.get_item(Key={'username': username})
+            return self._counters_from_item(response.get('Item'))
+        return self.store.get(username)
+
+    def add_counters(self, deltas: dict, game_id: str = None):
+        """
+        Add {username: {counter: amount}} to the stored counts, every player
+        in one transaction. With a `game_id`, counts for a game that was
+        already counted are not added again.
+        """
+        if not self.use_dynamodb:
+            self.store.add(deltas, game_id)
+            return
+
+        from botocore.exceptions import ClientError
+        for i, chunk in enumerate(self._chunks(deltas)):
+            marker = game_id if i == 0 else None
+            for attempt in range(MAX_TRANSACTION_ATTEMPTS):
+                try:
+                    self.table.meta.client.transact_write_items(**self._add_request(chunk, marker))
+                    break
+                except ClientError as e:
+                    if marker is not None and already_recorded(e, len(chunk)):
+                        return
+                    if not self._should_retry(e, attempt):
+                        raise
+                    time.sleep(self._backoff(attempt))
+
+    def put_counters(self, counters: dict):
+        """Replace the counts of every player in `counters` (used by the backfill)."""
+        if not self.use_dynamodb:
+            self.store.put(counters)
+            return
+
+        with self.table.batch_writer(overwrite_by_pkeys=['username']) as batch:
+            for username, counts in counters.items():
+                batch.put_item(Item=dict(counts, username=username))
+
+    # Shared with AsyncAnalyticsRepository
+
+    def _counters_from_item(self, item: dict) -> dict:
+        if not item:
+            return {}
+        return {name: int(value) for name, value in item.items() if name != 'username'}
+
+    def _chunks(self, deltas: dict):
+        # A transaction may hold at most 100 items, one of them the completion marker
+        items = [(username, counts) for username, counts in deltas.items() if counts]
+        size = MAX_BATCH_ITEMS - 1
+        for i in range(0, len(items), size):
+            yield items[i:i + size]
+
+    def _add_request(self, chunk: list, game_id: str = None) -> dict:
+        transact_items = []
+        for username, counts in chunk:
+            names, values, adds = {}, {}, []
+            for i, (name, amount) in enumerate(counts.items()):
+                names[f'#c{i}'] = name
+                values[f':c{i}'] = amount
+                adds.append(f'#c{i} :c{i}')
+            transact_items.append({'Update': {
+                'TableName': self.table_name,
+                'Key': {'username': username},
+                'UpdateExpression': 'ADD ' + ', '.join(adds),
+                'ExpressionAttributeNames': names,
+                'ExpressionAttributeValues': values
+            }})
+        if game_id is not None:
+            transact_items.append(completion_marker(self.table_name, game_id))
+        # Makes SDK-level retries of this exact request idempotent
+        return {'TransactItems': transact_items, 'ClientRequestToken': str(uuid.uuid4())}
+
+    def _should_retry(self, error, attempt: int) -> bool:
+        # A cancelled transaction applied nothing, so it is safe to send again
+        return (
+            error.response['Error']['Code'] == 'TransactionCanceledException'
+            and attempt < MAX_TRANSACTION_ATTEMPTS - 1
+        )
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, 0.02 * 2 ** attempt)
+
+    @property
+    def table_name(self) -> str:
+        return settings.DYNAMODB_ANALYTICS_TABLE
@@ -0,0 +1,34 @@
+import asyncio
+from app.db.dynamodb import get_async_dynamodb_table
+from app.repositories.analytics_repository import AnalyticsRepository
+from app.repositories.user_repository import MAX_TRANSACTION_ATTEMPTS, already_recorded
+
+class AsyncAnalyticsRepository(AnalyticsRepository):
+    """Same counters and ADD updates as AnalyticsRepository, awaited through aioboto3."""
+
+    async def get_counters(self, username: str) -> dict:
+        if not self.use_dynamodb:
+            return super().get_counters(username)
+        table = await get_async_dynamodb_table(self.table_name)
+        response = await table.get_item(Key={'username': username})
+        return self._counters_from_item(response.get('Item'))
+
+    async def add_counters(self, deltas: dict, game_id: str = None):
+        if not self.use_dynamodb:
+            super().add_counters(deltas, game_id)
+            return
+
+        from botocore.exceptions import ClientError
+        table = await get_async_dynamodb_table(self.table_name)
+        for i, chunk in enumerate(self._chunks(deltas)):
+            marker = game_id if i == 0 else None
+            for attempt in range(MAX_TRANSACTION_ATTEMPTS):
+                try:
+                    await table.meta.client.transact_write_items(**self._add_request(chunk, marker))
+                    break
+                except ClientError as e:
+                    if marker is not None and already_recorded(e, len(chunk)):
+                        return
+                    if not self._should_retry(e, attempt):
+                        raise
+                    await asyncio.sleep(self._backoff(attempt))
@@ -0,0 +1,148 @@
+from app.models.game import Game, Round, Standings, GameSummary
+from app.core.config import settings
+from app.db.dynamodb import get_async_dynamodb_table
+from app.db.local import check_async_store
+from app.repositories.game_repository import GameRepository
+
+class AsyncGameRepository(GameRepository):
+    """
+    Same storage, item format, caching and version checks as GameRepository,
+    but DynamoDB is accessed through aioboto3 so a request waiting on the
+    database doesn't hold a thread.
+
+    Without DynamoDB only the memory store is supported (see
+    check_async_store). Its calls never suspend, so on the one event loop a
+    read-modify-write of a game isn't interleaved with another and needs
+    none of the per-game locks the sync service holds.
+    """
+
+    def __init__(self):
+        check_async_store()
+        super().__init__()
+
+    async def create_game(self, players: list[str]) -> Game:
+        game = self._new_game(players)
+
+        if self.use_dynamodb:
+            table = await get_async_dynamodb_table()
+            async with table.batch_writer() as batch:
+                for item in self._items_with_index(game):
+                    await batch.put_item(Item=item)
+            self._cache_put(game)
+        else:
+            self.games[game.game_id] = game
+            self._index_game(game)
+
+        return game
+
+    async def get_game(self, game_id: str) -> Game:
+        if not self.use_dynamodb:
+            return self.games.get(game_id)
+
+        if self.cache is not None:
+            validate = self._is_current if settings.GAME_CACHE_VALIDATE else None
+            cached = await self.cache.aget(game_id, validate)
+            if cached is not None:
+                return cached.to_game()
+
+        table = await get_async_dynamodb_table()
+        response = await table.get_item(Key={'game_id': game_id})
+        return self._game_from_item(response.get('Item'))
+
+    async def get_version(self, game_id: str):
+        if not self.use_dynamodb:
+            return self._stored_version(game_id)
+
+        table = await get_async_dynamodb_table()
+        response = await table.get_item(**self._version_request(game_id))
+        return self._version_from_item(response.get('Item'))
+
+    async def get_standings(self, game_id: str) -> Standings:
+        if not self.use_dynamodb:
+            return self._stored_standings(game_id)
+
+        table = await get_async_dynamodb_table()
+        response = await table.get_item(**self._standings_request(game_id))
+        item = response.get('Item')
+        if item:
+            return Standings(**item)
+        return None
+
+    async def list_games(self, player: str = None, before: str = None, limit: int = 20,
+                         cursor: str = None) -> tuple[list[GameSummary], str]:
+        if not self.use_dynamodb:
+            return super().list_games(player, before, limit, cursor)
+
+        bound = self._decode_cursor(cursor) if cursor else before
+        table = await get_async_dynamodb_table()
+        response = await table.query(**self._listing_request(self._listing_name(player), bound, limit))
+        return self._listing_page(response)
+
+    async def update_game(self, game: Game):
+        expected_version = game.version
+        game.version += 1
+        if not self.use_dynamodb:
+            self._replace_stored(game, expected_version)
+            return
+
+        from botocore.exceptions import ClientError
+        table = await get_async_dynamodb_table()
+        try:
+            await table.put_item(**self._put_request(game, expected_version))
+        except ClientError as e:
+            self._raise_for_conflict(game, expected_version, e)
+        self._cache_put(game)
+
+    async def append_round(self, game: Game, new_round: Round):
+        await self._update_fields(game, *self._append_round_expression(game, new_round))
+
+    async def update_game_fields(self, game: Game, game_fields=(), round_fields=None, new_rounds=()):
+        await self._update_fields(game, *self._fields_expression(game, game_fields, round_fields, new_rounds))
+
+    async def _update_fields(self, game: Game, assignments: list[str], names: dict, values: dict):
+        expected_version = game.version
+        game.version += 1
+        if not self.use_dynamodb:
+            self._replace_stored(game, expected_version)
+            return
+
+        from botocore.exceptions import ClientError
+        table = await get_async_dynamodb_table()
+        try:
+            await table.update_item(**self._update_request(game, expected_version, assignments, names, values))
+        except ClientError as e:
+            self._raise_for_conflict(game, expected_version, e)
+        self._cache_put(game)
+
+    async def scan_games(self, page_size: int = None):
+        if not self.use_dynamodb:
+            for game in super().scan_games(page_size):
+                yield game
+            return
+
+        table = await get_async_dynamodb_table()
+        request = self._scan_request(page_size)
+        while True:
+            response = await table.scan(**request)
+            for item in response.get('Items', []):
+                yield self.codec.decode_game(item)
+            if 'LastEvaluatedKey' not in response:
+                return
+            request['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    async def put_games(self, games: list[Game]):
+        if not self.use_dynamodb:
+            super().put_games(games)
+            return
+
+        table = await get_async_dynamodb_table()
+        async with table.batch_writer(overwrite_by_pkeys=['game_id']) as batch:
+            for game in games:
+                for item in self._items_with_index(game):
+                    await batch.put_item(Item=item)
+        self._cache_invalidate(game.game_id for game in games)
+
+    async def _is_current(self, cached: Game) -> bool:
+        table = await get_async_dynamodb_table()
+        response = await table.get_item(**self._version_request(cached.game_id))
+        return self._version_matches(response.get('Item'), cached)
@@ -0,0 +1,67 @@
+import asyncio
+from app.models.user import UserStats, LeaderboardMetric
+from app.db.dynamodb import get_async_dynamodb_resource, get_async_dynamodb_table
+from app.db.local import check_async_store
+from app.repositories.user_repository import (
+    UserRepository, MAX_TRANSACTION_ATTEMPTS, LEADERBOARD_FIELDS, already_recorded
+)
+
+class AsyncUserRepository(UserRepository):
+    """Same storage and transactional stats updates as UserRepository, awaited through aioboto3."""
+
+    def __init__(self):
+        check_async_store()
+        super().__init__()
+
+    async def get_user_stats(self, username: str) -> UserStats:
+        if not self.use_dynamodb:
+            return super().get_user_stats(username)
+        table = await get_async_dynamodb_table(self.table_name)
+        response = await table.get_item(Key={'username': username})
+        return self._stats_from_item(username, response.get('Item'))
+
+    async def update_user_stats(self, stats: UserStats):
+        if not self.use_dynamodb:
+            super().update_user_stats(stats)
+            return
+        table = await get_async_dynamodb_table(self.table_name)
+        await table.put_item(Item=self._stats_item(stats))
+
+    async def record_game_results(self, results: list[tuple[str, int, bool]], game_id: str = None):
+        if not self.use_dynamodb:
+            super().record_game_results(results, game_id)
+            return
+
+        from botocore.exceptions import ClientError
+        results = self._merge_results(results)
+        table = await get_async_dynamodb_table(self.table_name)
+        for i, chunk in enumerate(self._chunks(list(results.items()))):
+            marker = game_id if i == 0 else None
+            for attempt in range(MAX_TRANSACTION_ATTEMPTS):
+                current = await self._read_stats([username for username, _ in chunk])
+                try:
+                    await table.meta.client.transact_write_items(**self._transaction_request(chunk, current, marker))
+                    break
+                except ClientError as e:
+                    if marker is not None and already_recorded(e, len(chunk)):
+                        return
+                    if not self._should_retry(e, attempt):
+                        raise
+                    await asyncio.sleep(self._backoff(attempt))
+
+    async def get_leaderboard(self, metric: LeaderboardMetric, limit: int, cursor: str = None) -> tuple[list[UserStats], str]:
+        if not self.use_dynamodb:
+            return super().get_leaderboard(metric, limit, cursor)
+        table = await get_async_dynamodb_table(self.table_name)
+        response = await table.query(**self._leaderboard_request(LEADERBOARD_FIELDS[metric], limit, cursor))
+        return self._leaderboard_page(response)
+
+    async def _read_stats(self, usernames: list[str]) -> dict:
+        dynamodb = await get_async_dynamodb_resource()
+        request = self._batch_get_request(usernames)
+        current = {}
+        while request:
+            response = await dynamodb.batch_get_item(RequestItems=request)
+            self._collect_stats(response, current)
+            request = response.get('UnprocessedKeys')
+        return current
@@ -0,0 +1,301 @@
+from datetime import datetime
+from app.models.game import Game, Round, RoundResult, GameStatus
+from app.models.event import EventType, GameEvent
+from app.core.config import settings
+from app.db.dynamodb import get_dynamodb_table
+from app.db.codec import DictCodec, decode_round
+from app.repositories.game_repository import GameRepository, VersionConflictError
+
+REQUIRED_RESULT_FIELDS = {name for name, field in RoundResult.__fields__.items() if field.required}
+
+class EventLogGameRepository(GameRepository):
+    """
+    GameRepository that stores every write as a small event appended to a
+    per-game log, instead of updating the game document. The document in
+    the games table becomes a snapshot, rewritten every
+    GAME_SNAPSHOT_INTERVAL events; reads load the snapshot and replay the
+    events after it. Event seq numbers are game versions, so appending the
+    next seq conditionally is also the optimistic concurrency check.
+    """
+
+    def __init__(self):
+        if not settings.USE_DYNAMODB and settings.LOCAL_STORE != 'memory':
+            # The log itself is only kept in memory; snapshots alone would lose recent writes.
+            # Checked before the base class opens the local store
+            raise ValueError("GAME_EVENT_LOG needs DynamoDB or the memory store")
+        super().__init__()
+        self.snapshot_interval = settings.GAME_SNAPSHOT_INTERVAL
+        # Events are always plain maps, whatever GAME_CODEC the snapshots use
+        self.event_codec = DictCodec()
+        if not self.use_dynamodb:
+            self.events = {}  # game_id -> events in seq order
+
+    @property
+    def events_table(self):
+        return get_dynamodb_table(settings.DYNAMODB_EVENTS_TABLE)
+
+    def create_game(self, players: list[str]) -> Game:
+        game = self._new_game(players)
+        self._save_snapshot(game)
+        self._append(game, self._full_event(game, EventType.CREATED))
+        self._put_index(game)
+        return game
+
+    def get_game(self, game_id: str) -> Game:
+        snapshot = self._load_snapshot(game_id)
+        if snapshot is None:
+            return None
+        return self._replay(snapshot, self._read_events(game_id, snapshot.version))
+
+    def get_version(self, game_id: str):
+        # The newest event's seq; the snapshot's version only if nothing was logged since
+        if not self.use_dynamodb:
+            log = self.events.get(game_id)
+            return log[-1]['seq'] if log else super().get_version(game_id)
+
+        response = self.events_table.query(
+            KeyConditionExpression='#game_id = :game_id',
+            ExpressionAttributeNames={'#game_id': 'game_id', '#seq': 'seq'},
+            ExpressionAttributeValues={':game_id': game_id},
+            ProjectionExpression='#seq',
+            ScanIndexForward=False,
+            Limit=1,
+            ConsistentRead=True
+        )
+        items = response.get('Items')
+        return int(items[0]['seq']) if items else super().get_version(game_id)
+
+    def get_standings(self, game_id: str):
+        # The snapshot's totals may be behind, so standings need the replayed game
+        return self._standings_from_game(self.get_game(game_id))
+
+    def update_game(self, game: Game):
+        self._write(game, self._full_event(game, EventType.REPLACED, game.version + 1))
+
+    def append_round(self, game: Game, new_round: Round):
+        self.update_game_fields(game, new_rounds=[new_round])
+
+    def update_game_fields(self, game: Game, game_fields=(), round_fields=None, new_rounds=()):
+        changes = []
+        if game_fields:
+            changes.append({'fields': self.event_codec.encode_game_fields(game, game_fields)})
+        for idx, fields in (round_fields or {}).items():
+            r = game.rounds[idx]
+            encoded = self.event_codec.encode_round_fields(r, fields)
+            if 'results' in encoded:
+                # Most breakdown fields are 0; replay fills the defaults back in
+                encoded['results'] = {
+                    p: {k: v for k, v in res.items() if v or k in REQUIRED_RESULT_FIELDS}
+                    for p, res in encoded['results'].items()
+                }
+            changes.append({'round_num': r.round_num, 'fields': encoded})
+        for r in new_rounds:
+            changes.append({'round_num': r.round_num, 'new': self.event_codec.encode_round(r, game.players)})
+        event = self._event(game.game_id, game.version + 1, self._event_type(game, round_fields, new_rounds))
+        event['changes'] = changes
+        self._write(game, event)
+
+    def scan_games(self, page_size: int = None):
+        for snapshot in super().scan_games(page_size):
+            yield self._replay(snapshot, self._read_events(snapshot.game_id, snapshot.version))
+
+    def put_games(self, games: list[Game]):
+        """
+        Restore games exactly as given: the snapshot, an imported event at
+        its version, and no events after it (they belonged to the game that
+        was overwritten).
+        """
+        super().put_games(games)
+        if not self.use_dynamodb:
+            for game in games:
+                log = [e for e in self.events.get(game.game_id, []) if e['seq'] < game.version]
+                log.append(self._full_event(game, EventType.IMPORTED))
+                self.events[game.game_id] = log
+            return
+
+        with self.events_table.batch_writer(overwrite_by_pkeys=['game_id', 'seq']) as batch:
+            for game in games:
+                for stale in self._read_events(game.game_id, game.version):
+                    batch.delete_item(Key={'game_id': game.game_id, 'seq': stale['seq']})
+                batch.put_item(Item=self._full_event(game, EventType.IMPORTED))
+
+    def history(self, game_id: str) -> list[GameEvent]:
+        """Every logged event of the game, with re-submitted bids and results flagged as corrections."""
+        written = set()
+        history = []
+        for event in self._read_events(game_id, -1):
+            event = GameEvent(**event)
+            if event.game is not None:
+                written = {(r['round_num'], field) for r in event.game.get('rounds', [])
+                           for field in ('bids', 'results') if r.get(field)}
+            for change in event.changes:
+                for field in change.get('fields', {}):
+                    if 'round_num' in change and field in ('bids', 'results'):
+                        key = (change['round_num'], field)
+                        event.correction = event.correction or key in written
+                        written.add(key)
+            history.append(event)
+        return history
+
+    def replay(self, game_id: str, until_seq: int = None, until_time: str = None) -> Game:
+        """
+        Rebuild the game as it was after event `until_seq`, or as of the ISO
+        timestamp `until_time` (default: now), from the log alone.
+        """
+        events = [
+            e for e in self._read_events(game_id, -1)
+            if (until_seq is None or e['seq'] <= until_seq) and (until_time is None or e['timestamp'] <= until_time)
+        ]
+        # Start from the last event that holds the whole game
+        start = max((i for i, e in enumerate(events) if e.get('game') is not None), default=None)
+        if start is not None:
+            return self._replay(self._decode_game(events[start]['game']), events[start + 1:])
+
+        # Game stored before the log existed: only versions since its snapshot are known
+        snapshot = self._load_snapshot(game_id)
+        if snapshot is None:
+            return None
+        if not events or events[0]['seq'] != snapshot.version + 1:
+            raise ValueError(f"No history of game {game_id} before version {snapshot.version}")
+        return self._replay(snapshot, events)
+
+    # Writing
+
+    def _write(self, game: Game, event: dict):
+        self._append(game, event)
+        if game.version % self.snapshot_interval == 0:
+            self._save_snapshot(game)
+
+    def _append(self, game: Game, event: dict):
+        if self.use_dynamodb:
+            from botocore.exceptions import ClientError
+            try:
+                self.events_table.put_item(
+                    Item=event,
+                    ConditionExpression='attribute_not_exists(#seq)',
+                    ExpressionAttributeNames={'#seq': 'seq'}
+                )
+            except ClientError as e:
+                self._raise_for_conflict(game, game.version, e)
+        else:
+            log = self.events.setdefault(game.game_id, [])
+            if log and log[-1]['seq'] >= event['seq']:
+                raise VersionConflictError(f"Game {game.game_id} was modified concurrently")
+            log.append(event)
+        game.version = event['seq']
+
+    def _save_snapshot(self, game: Game):
+        if not self.use_dynamodb:
+            self.games[game.game_id] = game
+            return
+
+        from botocore.exceptions import ClientError
+        try:
+            self.table.put_item(
+                Item=self.codec.encode_game(game),
+                # Never replace a newer snapshot written by a faster writer
+                ConditionExpression='attribute_not_exists(#version) OR #version < :version',
+                ExpressionAttributeNames={'#version': 'version'},
+                ExpressionAttributeValues={':version': game.version}
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            return
+        self._cache_put(game)
+
+    def _event(self, game_id: str, seq: int, event_type: EventType) -> dict:
+        return {
+            'game_id': game_id,
+            'seq': seq,
+            'timestamp': datetime.utcnow().isoformat(),
+            'type': event_type.value,
+            'changes': [],
+        }
+
+    def _full_event(self, game: Game, event_type: EventType, seq: int = None) -> dict:
+        event = self._event(game.game_id, game.version if seq is None else seq, event_type)
+        event['game'] = self.event_codec.encode_game(game)
+        event['game']['version'] = event['seq']
+        return event
+
+    def _event_type(self, game: Game, round_fields: dict, new_rounds) -> EventType:
+        round_fields = round_fields or {}
+        if new_rounds and not round_fields:
+            started = len(new_rounds) == 1 and not new_rounds[0].bids and not new_rounds[0].results
+            return EventType.ROUND_STARTED if started else EventType.BATCH
+        if not new_rounds and list(round_fields.values()) == [['bids']]:
+            return EventType.BIDS_SUBMITTED
+        # One round's results, plus later rounds' totals on a correction
+        scored = [idx for idx, fields in round_fields.items() if 'results' in fields]
+        if not new_rounds and len(scored) == 1 and 'bids' not in round_fields[scored[0]] and all(
+            fields == ['totals'] and game.rounds[idx].round_num > game.rounds[scored[0]].round_num
+            for idx, fields in round_fields.items() if idx != scored[0]
+        ):
+            return EventType.RESULTS_SUBMITTED
+        return EventType.BATCH
+
+    # Reading
+
+    def _load_snapshot(self, game_id: str) -> Game:
+        if self.use_dynamodb:
+            return super().get_game(game_id)
+        # The store hands out a new Game, so replay never changes the stored snapshot
+        return self.games.get(game_id)
+
+    def _read_events(self, game_id: str, after_seq: int) -> list:
+        if not self.use_dynamodb:
+            log = self.events.get(game_id, [])
+            tail = []
+            for event in reversed(log):
+                if event['seq'] <= after_seq:
+                    break
+                tail.append(event)
+            tail.reverse()
+            return tail
+
+        request = {
+            'KeyConditionExpression': '#game_id = :game_id AND #seq > :after',
+            'ExpressionAttributeNames': {'#game_id': 'game_id', '#seq': 'seq'},
+            'ExpressionAttributeValues': {':game_id': game_id, ':after': after_seq},
+            'ConsistentRead': True,
+        }
+        events = []
+        while True:
+            response = self.events_table.query(**request)
+            for item in response.get('Items', []):
+                item['seq'] = int(item['seq'])
+                events.append(item)
+            if 'LastEvaluatedKey' not in response:
+                return events
+            request['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    def _replay(self, game: Game, events: list) -> Game:
+        for event in events:
+            if event.get('game') is not None:
+                game = self._decode_game(event['game'])
+            else:
+                for change in event['changes']:
+                    self._apply_change(game, change)
+            game.version = event['seq']
+        return game
+
+    def _apply_change(self, game: Game, change: dict):
+        if 'new' in change:
+            game.add_round(decode_round(change['new'], game.players))
+        elif 'round_num' in change:
+            r = game.get_round(int(change['round_num']))
+            # decode_round converts the stored values the same way a full round is read
+            decoded = decode_round(dict(change['fields'], round_num=r.round_num, cards_dealt=r.cards_dealt), game.players)
+            for field in change['fields']:
+                setattr(r, field, getattr(decoded, field))
+        else:
+            for field, value in change['fields'].items():
+                if field == 'status':
+                    value = GameStatus(value)
+                elif isinstance(value, dict):
+                    value = {k: int(v) for k, v in value.items()}
+                setattr(game, field, value)
+
+    def _decode_game(self, item: dict) -> Game:
+        return self.event_codec.decode_game(item)
@@ -1,51 +1,434 @@
-from app.models.game import Game, GameStatus
+from app.models.game import Game, Round, GameStatus, Standings, GameSummary
+from app.models.compact import CompactGame, CompactGameStore
+from contextlib import nullcontext
+import base64
 import uuid
 from datetime import datetime
 from app.core.config import settings
 from app.db.dynamodb import get_dynamodb_table
-import json
-from boto3.dynamodb.conditions import Key
+from app.db.codec import get_codec
+from app.db.local import get_game_store
+from app.core.cache import TTLCache
+
+# Games are listed newest first from the GAME_LISTING_INDEX GSI on the games
+# table. Creating a game also writes one small index item per listing it
+# appears in: ALL_GAMES_LISTING, and PLAYER_LISTING for each player. Only
+# index items have a `listing` attribute, so the GSI holds nothing else and
+# a page is a single Query however many games are stored.
+GAME_LISTING_INDEX = 'games_by_listing'
+ALL_GAMES_LISTING = 'all'
+PLAYER_LISTING = 'player#{}'
+INDEX_ITEM_PREFIX = 'index#'
+
+class VersionConflictError(Exception):
+    """The stored game was changed by someone else since it was read."""
+    pass
 
 class GameRepository:
     def __init__(self):
         self.use_dynamodb = settings.USE_DYNAMODB
+        self.codec = get_codec(settings.GAME_CODEC)
+        self.cache = None
         if not self.use_dynamodb:
-            self.games = {} # In-memory storage
-        else:
-            self.table = get_dynamodb_table()
+            self.games = get_game_store(settings.LOCAL_STORE)
+        elif settings.GAME_CACHE_SIZE > 0:
+            self.cache = TTLCache(settings.GAME_CACHE_SIZE, settings.GAME_CACHE_TTL)
+
+    @property
+    def table(self):
+        # Shared, lazily created table so startup doesn't touch boto3
+        return get_dynamodb_table()
 
     def create_game(self, players: list[str]) -> Game:
-        game_id = str(uuid.uuid4())
-        game = Game(
-            game_id=game_id,
-            players=players,
-            date=datetime.utcnow().isoformat(),
-            status=GameStatus.ACTIVE,
-            rounds=[]
-        )
-        
+        game = self._new_game(players)
+
         if self.use_dynamodb:
-            # Convert Pydantic model to dict, handling nested models
-            item = json.loads(game.json())
-            self.table.put_item(Item=item)
+            # The game and its index items go out together in one BatchWriteItem
+            with self.table.batch_writer() as batch:
+                for item in self._items_with_index(game):
+                    batch.put_item(Item=item)
+            self._cache_put(game)
         else:
-            self.games[game_id] = game
-            
+            self.games[game.game_id] = game
+            self._index_game(game)
+
         return game
 
     def get_game(self, game_id: str) -> Game:
         if self.use_dynamodb:
+            if self.cache is not None:
+                validate = self._is_current if settings.GAME_CACHE_VALIDATE else None
+                cached = self.cache.get(game_id, validate)
+                if cached is not None:
+                    # A fresh Game each time: callers mutate the game they get back
+                    return cached.to_game()
+
             response = self.table.get_item(Key={'game_id': game_id})
+            return self._game_from_item(response.get('Item'))
+        else:
+            return self.games.get(game_id)
+
+    def get_standings(self, game_id: str) -> Standings:
+        if self.use_dynamodb:
+            response = self.table.get_item(**self._standings_request(game_id))
             item = response.get('Item')
             if item:
-                return Game(**item)
+                return Standings(**item)
             return None
         else:
-            return self.games.get(game_id)
+            return self._stored_standings(game_id)
+
+    def get_version(self, game_id: str):
+        """The stored version of the game, or None if it doesn't exist, without reading the game."""
+        if self.use_dynamodb:
+            response = self.table.get_item(**self._version_request(game_id))
+            return self._version_from_item(response.get('Item'))
+        return self._stored_version(game_id)
+
+    def list_games(self, player: str = None, before: str = None, limit: int = 20,
+                   cursor: str = None) -> tuple[list[GameSummary], str]:
+        """
+        One page of games, newest first: all of them, or those `player` is in,
+        optionally only ones created before `before` (an ISO date or time).
+        Returns the page and the cursor for the next one.
+        """
+        listing = self._listing_name(player)
+        bound = self._decode_cursor(cursor) if cursor else before
+        if self.use_dynamodb:
+            response = self.table.query(**self._listing_request(listing, bound, limit))
+            return self._listing_page(response)
+
+        # The local store reads one extra row to know whether another page follows
+        rows = self.games.page(listing, bound, limit)
+        page = [GameSummary(game_id=game_id, date=date, players=players) for _, game_id, date, players in rows[:limit]]
+        return page, self._encode_cursor(rows[limit - 1][0]) if len(rows) > limit else None
+
+    def locked(self, game_id: str):
+        """
+        Hold while reading, changing and writing back a game, so writes from
+        other threads in this process wait instead of conflicting. DynamoDB
+        has no such lock; its conditional writes reject the loser instead.
+        """
+        if self.use_dynamodb:
+            return nullcontext()
+        return self.games.lock(game_id)
+
+    def cache_stats(self) -> dict:
+        if self.cache is None:
+            return {}
+        return self.cache.stats()
 
     def update_game(self, game: Game):
+        expected_version = game.version
+        game.version += 1
         if self.use_dynamodb:
-            item = json.loads(game.json())
-            self.table.put_item(Item=item)
+            from botocore.exceptions import ClientError
+            try:
+                self.table.put_item(**self._put_request(game, expected_version))
+            except ClientError as e:
+                self._raise_for_conflict(game, expected_version, e)
+            self._cache_put(game)
         else:
-            self.games[game.game_id] = game
+            self._replace_stored(game, expected_version)
+
+    def append_round(self, game: Game, new_round: Round):
+        # new_round must already be appended to game.rounds
+        self._update_fields(game, *self._append_round_expression(game, new_round))
+
+    def update_game_fields(self, game: Game, game_fields=(), round_fields=None, new_rounds=()):
+        """
+        Persist only the listed top-level fields of the game, the listed
+        fields of individual rounds ({round_idx: [field, ...]}) and any
+        `new_rounds` appended to game.rounds with a single UpdateExpression,
+        instead of rewriting the whole item. DynamoDB rejects overlapping
+        paths, so round_fields and new_rounds can't be combined.
+        """
+        self._update_fields(game, *self._fields_expression(game, game_fields, round_fields, new_rounds))
+
+    def _update_fields(self, game: Game, assignments: list[str], names: dict, values: dict):
+        expected_version = game.version
+        game.version += 1
+        if not self.use_dynamodb:
+            self._replace_stored(game, expected_version)
+            return
+
+        from botocore.exceptions import ClientError
+        try:
+            self.table.update_item(**self._update_request(game, expected_version, assignments, names, values))
+        except ClientError as e:
+            self._raise_for_conflict(game, expected_version, e)
+        self._cache_put(game)
+
+    def scan_games(self, page_size: int = None, compact: bool = False):
+        """
+        Yield every stored game, reading DynamoDB one Scan page at a time so
+        memory stays flat however large the table is. With `compact`, games
+        come as CompactGame, which in memory skips building the models.
+        """
+        if not self.use_dynamodb:
+            # Snapshot the ids so concurrent writes don't break iteration
+            for game_id in list(self.games):
+                game = self._stored(game_id, compact)
+                if game is not None:
+                    yield game
+            return
+
+        request = self._scan_request(page_size)
+        while True:
+            response = self.table.scan(**request)
+            for item in response.get('Items', []):
+                # Bypasses the cache on purpose: a full export would just flush it
+                game = self.codec.decode_game(item)
+                yield CompactGame.from_game(game) if compact else game
+            if 'LastEvaluatedKey' not in response:
+                return
+            request['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    def put_games(self, games: list[Game]):
+        """
+        Store games exactly as given, versions included, overwriting existing
+        ones (e.g. when restoring an archive). On DynamoDB writes go out in
+        BatchWriteItem calls of 25, with unprocessed items resent.
+        """
+        if not self.use_dynamodb:
+            for game in games:
+                self.games[game.game_id] = game
+                self._index_game(game)
+            return
+
+        with self.table.batch_writer(overwrite_by_pkeys=['game_id']) as batch:
+            for game in games:
+                # Index items too, so restoring an archive also lists games stored before listings existed
+                for item in self._items_with_index(game):
+                    batch.put_item(Item=item)
+        self._cache_invalidate(game.game_id for game in games)
+
+    def _put_index(self, game: Game):
+        if not self.use_dynamodb:
+            self._index_game(game)
+            return
+        with self.table.batch_writer() as batch:
+            for item in self._index_items(game):
+                batch.put_item(Item=item)
+
+    def _index_game(self, game: Game):
+        self.games.index(game.game_id, self._sort_key(self._summary(game)), self._game_listings(game.players))
+
+    def _replace_stored(self, game: Game, expected_version: int):
+        # The store checks the version and writes in one step
+        if not self.games.replace(game, expected_version):
+            game.version = expected_version
+            raise VersionConflictError(f"Game {game.game_id} was modified concurrently")
+
+    def _is_current(self, cached: Game) -> bool:
+        response = self.table.get_item(**self._version_request(cached.game_id))
+        return self._version_matches(response.get('Item'), cached)
+
+    # Request building and item handling shared with AsyncGameRepository,
+    # which only swaps the I/O.
+
+    def _new_game(self, players: list[str]) -> Game:
+        return Game(
+            game_id=str(uuid.uuid4()),
+            players=players,
+            date=datetime.utcnow().isoformat(),
+            status=GameStatus.ACTIVE,
+            rounds=[],
+            totals={p: 0 for p in players},
+            ranks={p: 1 for p in players}
+        )
+
+    def _game_from_item(self, item: dict) -> Game:
+        if not item or 'listing' in item:
+            return None
+        game = self.codec.decode_game(item)
+        self._cache_put(game)
+        return game
+
+    def _standings_request(self, game_id: str) -> dict:
+        # Only fetch the running totals, not the full round history
+        return {
+            'Key': {'game_id': game_id},
+            'ProjectionExpression': 'game_id, #status, totals, ranks',
+            'ExpressionAttributeNames': {'#status': 'status'}
+        }
+
+    def _stored(self, game_id: str, compact: bool = False):
+        if compact and isinstance(self.games, CompactGameStore):
+            return self.games.compact(game_id)
+        game = self.games.get(game_id)
+        return CompactGame.from_game(game) if compact and game is not None else game
+
+    def _stored_version(self, game_id: str):
+        # In memory, version and standings come off the compact form without building a Game
+        game = self._stored(game_id, compact=True)
+        return game.version if game else None
+
+    def _stored_standings(self, game_id: str) -> Standings:
+        game = self._stored(game_id, compact=True)
+        return game.standings() if game else None
+
+    def _standings_from_game(self, game: Game) -> Standings:
+        if game:
+            return Standings(game_id=game.game_id, status=game.status, totals=game.totals, ranks=game.ranks)
+        return None
+
+    def _summary(self, game: Game) -> GameSummary:
+        return GameSummary(game_id=game.game_id, date=game.date, players=list(game.players))
+
+    def _sort_key(self, summary: GameSummary) -> str:
+        # Dates are ISO strings, so these sort by date; the id breaks ties
+        return f'{summary.date}#{summary.game_id}'
+
+    def _listing_name(self, player: str = None) -> str:
+        return PLAYER_LISTING.format(player) if player else ALL_GAMES_LISTING
+
+    def _game_listings(self, players: list[str]) -> list[str]:
+        return [ALL_GAMES_LISTING] + [PLAYER_LISTING.format(p) for p in dict.fromkeys(players)]
+
+    def _index_items(self, game: Game) -> list[dict]:
+        summary = self._summary(game)
+        return [
+            {
+                'game_id': f'{INDEX_ITEM_PREFIX}{listing}#{game.game_id}',
+                'listing': listing,
+                'sort_key': self._sort_key(summary),
+                'summary': summary.dict()
+            }
+            for listing in self._game_listings(game.players)
+        ]
+
+    def _items_with_index(self, game: Game) -> list[dict]:
+        return [self.codec.encode_game(game)] + self._index_items(game)
+
+    def _listing_request(self, listing: str, bound: str, limit: int) -> dict:
+        request = {
+            'IndexName': GAME_LISTING_INDEX,
+            'KeyConditionExpression': '#listing = :listing',
+            'ExpressionAttributeNames': {'#listing': 'listing'},
+            'ExpressionAttributeValues': {':listing': listing},
+            'ScanIndexForward': False,
+            'Limit': limit
+        }
+        if bound:
+            request['KeyConditionExpression'] += ' AND #sort_key < :bound'
+            request['ExpressionAttributeNames']['#sort_key'] = 'sort_key'
+            request['ExpressionAttributeValues'][':bound'] = bound
+        return request
+
+    def _listing_page(self, response: dict) -> tuple[list[GameSummary], str]:
+        page = [GameSummary(**item['summary']) for item in response.get('Items', [])]
+        last_key = response.get('LastEvaluatedKey')
+        return page, self._encode_cursor(last_key['sort_key']) if last_key else None
+
+    def _encode_cursor(self, sort_key: str) -> str:
+        return base64.urlsafe_b64encode(sort_key.encode()).decode()
+
+    def _decode_cursor(self, cursor: str) -> str:
+        try:
+            return base64.b64decode(cursor.encode(), altchars=b'-_', validate=True).decode()
+        except ValueError:
+            raise ValueError("Invalid cursor")
+
+    def _scan_request(self, page_size: int = None) -> dict:
+        # Every game, but not the listing index items stored alongside them
+        request = {
+            'FilterExpression': 'attribute_not_exists(#listing)',
+            'ExpressionAttributeNames': {'#listing': 'listing'}
+        }
+        if page_size:
+            request['Limit'] = page_size
+        return request
+
+    def _version_request(self, game_id: str) -> dict:
+        # Another container may have written the game; a strongly consistent
+        # read of just the version attribute is much cheaper than the item.
+        return {
+            'Key': {'game_id': game_id},
+            'ProjectionExpression': '#version',
+            'ExpressionAttributeNames': {'#version': 'version'},
+            'ConsistentRead': True
+        }
+
+    def _version_from_item(self, item: dict):
+        if item is None:
+            return None
+        # Games written before versioning have no version attribute
+        return int(item.get('version', 0))
+
+    def _version_matches(self, item: dict, cached: Game) -> bool:
+        return item is not None and int(item.get('version', 0)) == cached.version
+
+    def _put_request(self, game: Game, expected_version: int) -> dict:
+        return {
+            'Item': self.codec.encode_game(game),
+            'ConditionExpression': self._version_condition(expected_version),
+            'ExpressionAttributeNames': {'#version': 'version'},
+            'ExpressionAttributeValues': {':expected': expected_version}
+        }
+
+    def _append_round_expression(self, game: Game, new_round: Round):
+        return self._fields_expression(game, new_rounds=[new_round])
+
+    def _fields_expression(self, game: Game, game_fields=(), round_fields=None, new_rounds=()):
+        assignments = []
+        names = {}
+        values = {}
+        if new_rounds:
+            names['#rounds'] = 'rounds'
+            values[':new_rounds'] = [self.codec.encode_round(r, game.players) for r in new_rounds]
+            values[':empty'] = []
+            assignments.append('#rounds = list_append(if_not_exists(#rounds, :empty), :new_rounds)')
+        if game_fields:
+            game_data = self.codec.encode_game_fields(game, game_fields)
+            for field in game_fields:
+                names[f'#{field}'] = field
+                values[f':{field}'] = game_data[field]
+                assignments.append(f'#{field} = :{field}')
+        for idx, fields in (round_fields or {}).items():
+            names['#rounds'] = 'rounds'
+            if not self.codec.supports_round_fields:
+                # Codec stores rounds as opaque values, so rewrite just this round
+                values[f':r{idx}'] = self.codec.encode_round(game.rounds[idx], game.players)
+                assignments.append(f'#rounds[{idx}] = :r{idx}')
+                continue
+            round_data = self.codec.encode_round_fields(game.rounds[idx], fields)
+            for field in fields:
+                names[f'#{field}'] = field
+                values[f':r{idx}_{field}'] = round_data[field]
+                assignments.append(f'#rounds[{idx}].#{field} = :r{idx}_{field}')
+        return assignments, names, values
+
+    def _update_request(self, game: Game, expected_version: int, assignments: list[str], names: dict, values: dict) -> dict:
+        return {
+            'Key': {'game_id': game.game_id},
+            'UpdateExpression': 'SET ' + ', '.join(assignments + ['#version = :version']),
+            # The item must already exist; updates never create games
+            'ConditionExpression': 'attribute_exists(game_id) AND (' + self._version_condition(expected_version) + ')',
+            'ExpressionAttributeNames': dict(names, **{'#version': 'version'}),
+            'ExpressionAttributeValues': dict(values, **{':expected': expected_version, ':version': game.version})
+        }
+
+    def _version_condition(self, expected_version: int) -> str:
+        if expected_version == 0:
+            # Games written before versioning have no version attribute
+            return 'attribute_not_exists(#version) OR #version = :expected'
+        return '#version = :expected'
+
+    def _cache_put(self, game: Game):
+        if self.cache is not None:
+            # Compact, which also copies it: later changes to `game` don't reach the cache
+            self.cache.put(game.game_id, CompactGame.from_game(game))
+
+    def _cache_invalidate(self, game_ids):
+        if self.cache is not None:
+            for game_id in game_ids:
+                self.cache.invalidate(game_id)
+
+    def _raise_for_conflict(self, game: Game, expected_version: int, error):
+        game.version = expected_version
+        if self.cache is not None:
+            self.cache.invalidate(game.game_id)
+        if error.response['Error']['Code'] == 'ConditionalCheckFailedException':
+            raise VersionConflictError(f"Game {game.game_id} was modified concurrently")
+        raise error
@@ -1,14 +1,249 @@
-from app.models.user import UserStats
+from app.models.user import UserStats, LeaderboardMetric
+from app.core.config import settings
+from app.db.dynamodb import get_dynamodb_resource, get_dynamodb_table
+from app.db.local import get_user_store
+from decimal import Decimal
+import base64
+import json
+import random
+import time
+import uuid
+
+# DynamoDB caps transactions and batch reads at 100 items
+MAX_BATCH_ITEMS = 100
+# A concurrent completion for the same player cancels our transaction;
+# re-read and retry a few times before giving up
+MAX_TRANSACTION_ATTEMPTS = 5
+
+# Leaderboard metric -> UserStats field. On DynamoDB each one is a GSI
+# (LEADERBOARD_PARTITION, field) on the users table, so a top-K page is a
+# single Query regardless of how many users exist.
+LEADERBOARD_FIELDS = {
+    LeaderboardMetric.WINS: 'total_wins',
+    LeaderboardMetric.HIGH_SCORE: 'high_score',
+    LeaderboardMetric.AVERAGE_SCORE: 'average_score',
+    LeaderboardMetric.GAMES_PLAYED: 'games_played',
+}
+LEADERBOARD_PARTITION = 'global'
+# A finished game is counted at most once: the stats transaction also
+# creates this marker item (conditionally) in the users table, so a retried
+# or repeated completion of the same game is rejected by DynamoDB itself.
+COMPLETION_MARKER = 'game#{}'
 
 class UserRepository:
     def __init__(self):
-        # In-memory storage for local development
-        self.users = {}
+        self.use_dynamodb = settings.USE_DYNAMODB
+        if not self.use_dynamodb:
+            # Local development or a self-hosted server: memory or SQLite
+            self.store = get_user_store(settings.LOCAL_STORE, sorted(set(LEADERBOARD_FIELDS.values())))
+
+    @property
+    def table(self):
+        return get_dynamodb_table(settings.DYNAMODB_USERS_TABLE)
 
     def get_user_stats(self, username: str) -> UserStats:
-        if username not in self.users:
-            self.users[username] = UserStats(username=username)
-        return self.users[username]
+        if self.use_dynamodb:
+            response = self.table.get_item(Key={'username': username})
+            return self._stats_from_item(username, response.get('Item'))
+        return self.store.get(username) or UserStats(username=username)
 
     def update_user_stats(self, stats: UserStats):
-        self.users[stats.username] = stats
+        if self.use_dynamodb:
+            self.table.put_item(Item=self._stats_item(stats))
+        else:
+            self.store.put(stats)
+
+    def record_game_results(self, results: list[tuple[str, int, bool]], game_id: str = None):
+        """
+        Count one finished game for every (username, score, won). On DynamoDB
+        all players are written in a single transaction, each conditioned on
+        the games_played we read, so concurrent completions never lose an
+        update; a cancelled transaction is re-read and retried. With a
+        `game_id`, a game that was already counted is not counted again.
+        """
+        results = self._merge_results(results)
+        if not self.use_dynamodb:
+            self.store.record(results, game_id, self._apply_results)
+            return
+
+        from botocore.exceptions import ClientError
+        for i, chunk in enumerate(self._chunks(list(results.items()))):
+            # The marker rides with the first chunk; a game with over 99 players isn't atomic anyway
+            marker = game_id if i == 0 else None
+            for attempt in range(MAX_TRANSACTION_ATTEMPTS):
+                current = self._read_stats([username for username, _ in chunk])
+                try:
+                    self.table.meta.client.transact_write_items(**self._transaction_request(chunk, current, marker))
+                    break
+                except ClientError as e:
+                    if marker is not None and already_recorded(e, len(chunk)):
+                        return
+                    if not self._should_retry(e, attempt):
+                        raise
+                    time.sleep(self._backoff(attempt))
+
+    def get_leaderboard(self, metric: LeaderboardMetric, limit: int, cursor: str = None) -> tuple[list[UserStats], str]:
+        """One page of users ranked by `metric`, highest first, and the cursor for the next page."""
+        field = LEADERBOARD_FIELDS[metric]
+        if self.use_dynamodb:
+            response = self.table.query(**self._leaderboard_request(field, limit, cursor))
+            return self._leaderboard_page(response)
+
+        after = self._local_cursor(cursor) if cursor else None
+        entries, more = self.store.page(field, after, limit)
+        if not more:
+            return entries, None
+        last = entries[-1]
+        return entries, self._encode_cursor([getattr(last, field), last.username])
+
+    def _read_stats(self, usernames: list[str]) -> dict:
+        request = self._batch_get_request(usernames)
+        current = {}
+        while request:
+            response = get_dynamodb_resource().batch_get_item(RequestItems=request)
+            self._collect_stats(response, current)
+            request = response.get('UnprocessedKeys')
+        return current
+
+    def _local_cursor(self, cursor: str) -> tuple:
+        # The local stores page after a (value, username) pair. Their keys are
+        # floats, and a Decimal such as 24.67 is not equal to the float it came from
+        key = self._decode_cursor(cursor)
+        if (not isinstance(key, list) or len(key) != 2 or isinstance(key[0], bool)
+                or not isinstance(key[0], (int, Decimal)) or not isinstance(key[1], str)):
+            raise ValueError("Invalid cursor")
+        return float(key[0]), key[1]
+
+    # Shared with AsyncUserRepository
+
+    def _stats_from_item(self, username: str, item: dict) -> UserStats:
+        if not item:
+            return UserStats(username=username)
+        return UserStats(**item)
+
+    def _stats_item(self, stats: UserStats) -> dict:
+        item = stats.dict()
+        # DynamoDB takes Decimals, not floats
+        item['average_score'] = Decimal(str(stats.average_score))
+        item['leaderboard'] = LEADERBOARD_PARTITION
+        return item
+
+    def _merge_results(self, results) -> dict:
+        # username -> (games, wins, best score, total score); a transaction may only touch each item once
+        merged = {}
+        for username, score, won in results:
+            games, wins, best, total = merged.get(username, (0, 0, score, 0))
+            merged[username] = (games + 1, wins + int(won), max(best, score), total + score)
+        return merged
+
+    def _apply_results(self, stats: UserStats, counts: tuple) -> UserStats:
+        games, wins, best, total = counts
+        games_played = stats.games_played + games
+        total_score = stats.total_score + total
+        return UserStats(
+            username=stats.username,
+            games_played=games_played,
+            total_wins=stats.total_wins + wins,
+            high_score=max(stats.high_score, best),
+            total_score=total_score,
+            average_score=round(total_score / games_played, 2)
+        )
+
+    def _chunks(self, items: list):
+        # One place per transaction is kept for the completion marker
+        size = MAX_BATCH_ITEMS - 1
+        for i in range(0, len(items), size):
+            yield items[i:i + size]
+
+    def _batch_get_request(self, usernames: list[str]) -> dict:
+        return {self.table_name: {'Keys': [{'username': u} for u in usernames], 'ConsistentRead': True}}
+
+    def _collect_stats(self, response: dict, current: dict):
+        for item in response.get('Responses', {}).get(self.table_name, []):
+            current[item['username']] = UserStats(**item)
+
+    def _transaction_request(self, chunk: list, current: dict, game_id: str = None) -> dict:
+        transact_items = []
+        for username, counts in chunk:
+            stats = current.get(username) or UserStats(username=username)
+            transact_items.append({'Put': {
+                'TableName': self.table_name,
+                'Item': self._stats_item(self._apply_results(stats, counts)),
+                # Optimistic check: nobody else counted a game for this player since we read
+                'ConditionExpression': 'attribute_not_exists(games_played) OR games_played = :seen',
+                'ExpressionAttributeValues': {':seen': stats.games_played}
+            }})
+        if game_id is not None:
+            transact_items.append(completion_marker(self.table_name, game_id))
+        # Makes SDK-level retries of this exact request idempotent
+        return {'TransactItems': transact_items, 'ClientRequestToken': str(uuid.uuid4())}
+
+    def _should_retry(self, error, attempt: int) -> bool:
+        return (
+            error.response['Error']['Code'] == 'TransactionCanceledException'
+            and attempt < MAX_TRANSACTION_ATTEMPTS - 1
+        )
+
+    def _backoff(self, attempt: int) -> float:
+        # Jittered exponential backoff so racing completions spread out
+        return random.uniform(0, 0.02 * 2 ** attempt)
+
+    def _leaderboard_request(self, field: str, limit: int, cursor: str) -> dict:
+        request = {
+            'IndexName': f'leaderboard_{field}',
+            'KeyConditionExpression': '#lb = :lb',
+            'ExpressionAttributeNames': {'#lb': 'leaderboard'},
+            'ExpressionAttributeValues': {':lb': LEADERBOARD_PARTITION},
+            'ScanIndexForward': False,
+            'Limit': limit
+        }
+        if cursor:
+            request['ExclusiveStartKey'] = self._decode_cursor(cursor)
+        return request
+
+    def _leaderboard_page(self, response: dict) -> tuple[list[UserStats], str]:
+        entries = [UserStats(**item) for item in response.get('Items', [])]
+        last_key = response.get('LastEvaluatedKey')
+        return entries, self._encode_cursor(last_key) if last_key else None
+
+    def _encode_cursor(self, key) -> str:
+        def plain(value):
+            if isinstance(value, Decimal):
+                return int(value) if value == value.to_integral_value() else float(value)
+            return value
+        if isinstance(key, dict):
+            key = {k: plain(v) for k, v in key.items()}
+        else:
+            key = [plain(v) for v in key]
+        return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+    def _decode_cursor(self, cursor: str):
+        try:
+            key = json.loads(base64.urlsafe_b64decode(cursor.encode()), parse_float=Decimal)
+        except ValueError:
+            raise ValueError("Invalid cursor")
+        if isinstance(key, dict):
+            # DynamoDB keys need Decimal numbers
+            return {k: Decimal(v) if isinstance(v, int) else v for k, v in key.items()}
+        return key
+
+    @property
+    def table_name(self) -> str:
+        return settings.DYNAMODB_USERS_TABLE
+
+
+def completion_marker(table_name: str, game_id: str) -> dict:
+    """Transaction item that fails if `game_id` was already counted in `table_name` (a username-keyed table)."""
+    return {'Put': {
+        'TableName': table_name,
+        'Item': {'username': COMPLETION_MARKER.format(game_id)},
+        'ConditionExpression': 'attribute_not_exists(username)'
+    }}
+
+
+def already_recorded(error, marker_index: int) -> bool:
+    """Whether a cancelled transaction failed on the completion marker at `marker_index`."""
+    if error.response['Error']['Code'] != 'TransactionCanceledException':
+        return False
+    reasons = error.response.get('CancellationReasons') or []
+    return len(reasons) > marker_index and reasons[marker_index].get('Code') == 'ConditionalCheckFailed'
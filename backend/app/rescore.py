@@ -0,0 +1,66 @@
+"""
+Re-score the game archive under alternate rule sets and report how the
+outcomes would change, using the storage configured in settings (or an
+NDJSON archive written by `python -m app.archive export`).
+
+Run from backend/:
+    python -m app.rescore [--variant rascal ...] [-o deltas.ndjson] [--summary summary.json]
+    python -m app.rescore --input games.ndjson --workers 4
+
+Per-game deltas are written as NDJSON; the aggregate summary (winner
+changes, score distributions) is written as JSON, to stdout by default.
+"""
+import argparse
+import json
+import sys
+from app.services.archive_service import ArchiveService, parse_game
+from app.services.rescore_service import RescoreService, RESCORE_CHUNK_SIZE
+from app.services.scoring import RULE_SETS, get_rule_set
+
+
+def read_games(src):
+    for line_num, line in enumerate(src, 1):
+        if line.strip():
+            yield parse_game(line, line_num)
+
+
+def main(argv=None):
+    variants = sorted(name for name in RULE_SETS if name != "standard")
+    parser = argparse.ArgumentParser(prog="python -m app.rescore", description="Re-score games under rule variants")
+    parser.add_argument("--variant", action="append", choices=variants,
+                        help="rule set to compare against the standard rules (repeatable; default: all)")
+    parser.add_argument("--input", help="NDJSON archive to read instead of the game store, or - for stdin")
+    parser.add_argument("-o", "--output", help="write per-game deltas here as NDJSON")
+    parser.add_argument("--summary", help="write the summary here instead of stdout")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes (default: score in-process)")
+    parser.add_argument("--chunk-size", type=int, default=RESCORE_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    src = None
+    out = open(args.output, "w") if args.output else None
+    try:
+        if args.input:
+            src = sys.stdin if args.input == "-" else open(args.input)
+            games = read_games(src)
+        else:
+            games = None
+        on_game = (lambda delta: out.write(json.dumps(delta, separators=(",", ":")) + "\n")) if out else None
+        service = RescoreService(ArchiveService().repo)
+        summary = service.rescore([get_rule_set(name) for name in args.variant or variants], games, on_game,
+                                  args.workers, args.chunk_size)
+    finally:
+        if src is not None and src is not sys.stdin:
+            src.close()
+        if out is not None:
+            out.close()
+
+    if args.summary:
+        with open(args.summary, "w") as f:
+            json.dump(summary, f, indent=2)
+    else:
+        json.dump(summary, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
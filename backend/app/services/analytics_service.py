@@ -0,0 +1,181 @@
+from app.models.analytics import PlayerAnalytics, HeadToHead
+from app.models.compact import CompactGame
+from app.models.game import GameStatus
+from app.repositories.analytics_repository import AnalyticsRepository
+from app.services.jobs import chunked, run_chunks
+
+# Games sent to a backfill worker at a time
+BACKFILL_CHUNK_SIZE = 200
+# RoundResult fields a scored round contributes, after (player, round_num)
+ROW_FIELDS = ('bid', 'tricks_won', 'bonus_points', 'round_score')
+
+# Each player's analytics are kept as plain additive counters, so a scored
+# round (or a correction: the new result counted, the old one taken back)
+# is one small increment per player, and reading them never touches games.
+ROUNDS = 'rounds'
+BIDS_MADE = 'bids_made'
+MADE_POINTS = 'made_points'
+BONUS_POINTS = 'bonus_points'
+ZERO_BIDS = 'zero_bids'
+ZERO_BIDS_MADE = 'zero_bids_made'
+ROUND_ROUNDS = 'round#{}#rounds'
+ROUND_POINTS = 'round#{}#points'
+# Against one opponent: 'games', 'wins', 'losses' or 'ties'
+VERSUS = 'vs#{}#{}'
+
+class AnalyticsService:
+    def __init__(self, repo: AnalyticsRepository = None):
+        self.repo = repo or AnalyticsRepository()
+
+    def get_analytics(self, username: str) -> PlayerAnalytics:
+        return summarize(username, self.repo.get_counters(username))
+
+    def record_results(self, changes: list[tuple[int, dict, dict]]):
+        """Count re-scored rounds, given as (round_num, previous results, new results)."""
+        deltas = round_deltas(changes)
+        if deltas:
+            self.repo.add_counters(deltas)
+
+    def record_game(self, totals: dict, game_id: str = None):
+        """Count a completed game's head-to-head outcomes from its final totals, once per game_id."""
+        counters = {}
+        count_game(counters, totals)
+        self.repo.add_counters(counters, game_id)
+
+    def backfill(self, games, workers: int = 0, chunk_size: int = BACKFILL_CHUNK_SIZE) -> dict:
+        """
+        Recompute every player's counters from `games` (Game or CompactGame)
+        and replace the stored ones. Games are streamed in chunks and counted
+        in up to `workers` processes; only the per-player counters are kept
+        in memory. Writes made while it runs can be lost, so run it while
+        games aren't being scored.
+        """
+        counters = {}
+        games_seen = 0
+        chunks = chunked((_game_rows(g) for g in games), chunk_size)
+        for partial, count in run_chunks(count_chunk, chunks, workers):
+            games_seen += count
+            for username, counts in partial.items():
+                _merge(counters.setdefault(username, {}), counts)
+        self.repo.put_counters(counters)
+        return {'games': games_seen, 'players': len(counters)}
+
+
+def _game_rows(game) -> tuple:
+    # Just the counted inputs, so chunks are cheap to send to a worker
+    if isinstance(game, CompactGame):
+        rows = game.score_rows(ROW_FIELDS)
+        standings = game.standings()
+        status, totals = standings.status, standings.totals
+    else:
+        rows = [
+            (player, r.round_num, res.bid, res.tricks_won, res.bonus_points, res.round_score)
+            for r in game.rounds for player, res in r.results.items()
+        ]
+        status, totals = game.status, game.totals
+    return rows, totals if status == GameStatus.COMPLETED else None
+
+
+def count_chunk(chunk: list) -> tuple[dict, int]:
+    """
+    Counters for a chunk of (rows, final totals or None) and the number of
+    games in it. Module-level so it can run in a worker process.
+    """
+    counters = {}
+    for rows, totals in chunk:
+        for player, round_num, bid, tricks_won, bonus_points, round_score in rows:
+            count_round(counters.setdefault(player, {}), round_num, bid, tricks_won, bonus_points, round_score)
+        if totals:
+            count_game(counters, totals)
+    return counters, len(chunk)
+
+
+def count_round(counts: dict, round_num: int, bid: int, tricks_won: int, bonus_points: int, round_score: int,
+                sign: int = 1):
+    made = bid == tricks_won
+    _add(counts, ROUNDS, sign)
+    _add(counts, ROUND_ROUNDS.format(round_num), sign)
+    _add(counts, ROUND_POINTS.format(round_num), sign * round_score)
+    if made:
+        _add(counts, BIDS_MADE, sign)
+        _add(counts, MADE_POINTS, sign * round_score)
+        # Bonuses only score on a made bid
+        _add(counts, BONUS_POINTS, sign * bonus_points)
+    if bid == 0:
+        _add(counts, ZERO_BIDS, sign)
+        if made:
+            _add(counts, ZERO_BIDS_MADE, sign)
+
+
+def count_game(counters: dict, totals: dict):
+    for player, total in totals.items():
+        counts = counters.setdefault(player, {})
+        for opponent, other in totals.items():
+            if opponent == player:
+                continue
+            outcome = 'wins' if total > other else 'losses' if total < other else 'ties'
+            _add(counts, VERSUS.format(opponent, 'games'), 1)
+            _add(counts, VERSUS.format(opponent, outcome), 1)
+
+
+def round_deltas(changes: list[tuple[int, dict, dict]]) -> dict:
+    counters = {}
+    for round_num, previous, results in changes:
+        for sign, side in ((-1, previous), (1, results)):
+            for player, res in side.items():
+                count_round(counters.setdefault(player, {}), round_num, res.bid, res.tricks_won,
+                            res.bonus_points, res.round_score, sign)
+    # A correction that changed nothing for a player leaves nothing to write
+    deltas = {}
+    for player, counts in counters.items():
+        counts = {name: amount for name, amount in counts.items() if amount}
+        if counts:
+            deltas[player] = counts
+    return deltas
+
+
+def summarize(username: str, counts: dict) -> PlayerAnalytics:
+    by_round = {}
+    head_to_head = {}
+    for name, value in counts.items():
+        if name.startswith('round#'):
+            _, round_num, field = name.split('#')
+            by_round.setdefault(int(round_num), {})[field] = value
+        elif name.startswith('vs#'):
+            # Split from the right: player names may contain '#'
+            opponent, _, outcome = name[3:].rpartition('#')
+            head_to_head.setdefault(opponent, {})[outcome] = value
+
+    rounds = counts.get(ROUNDS, 0)
+    zero_bids = counts.get(ZERO_BIDS, 0)
+    return PlayerAnalytics(
+        username=username,
+        rounds_played=rounds,
+        bid_accuracy=_rate(counts.get(BIDS_MADE, 0), rounds),
+        zero_bids=zero_bids,
+        zero_bid_success_rate=_rate(counts.get(ZERO_BIDS_MADE, 0), zero_bids),
+        average_score_by_round={
+            round_num: round(fields.get('points', 0) / fields['rounds'], 2)
+            for round_num, fields in sorted(by_round.items()) if fields.get('rounds')
+        },
+        bonus_points=counts.get(BONUS_POINTS, 0),
+        bonus_share=_rate(counts.get(BONUS_POINTS, 0), counts.get(MADE_POINTS, 0)),
+        head_to_head={
+            opponent: HeadToHead(**record) for opponent, record in sorted(head_to_head.items())
+            if record.get('games')
+        }
+    )
+
+
+def _rate(part: int, whole: int) -> float:
+    return round(part / whole, 4) if whole > 0 else 0
+
+
+def _add(counts: dict, name: str, amount: int):
+    if amount:
+        counts[name] = counts.get(name, 0) + amount
+
+
+def _merge(into: dict, counts: dict):
+    for name, amount in counts.items():
+        into[name] = into.get(name, 0) + amount
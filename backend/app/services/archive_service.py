@@ -0,0 +1,84 @@
+import json
+import os
+from app.models.game import Game
+from app.db.codec import DictCodec
+from app.repositories.game_repository import GameRepository
+
+# Games written per batch_writer flush on import. The checkpoint advances
+# once per batch, so this is also how much work a resumed import repeats.
+IMPORT_BATCH_SIZE = 500
+
+class ArchiveService:
+    """
+    Bulk export and import of games as NDJSON: one Game JSON document per
+    line, the same shape GET /api/games/{game_id} returns.
+    """
+
+    def __init__(self, repo: GameRepository = None):
+        self.repo = repo or GameRepository()
+        # Same document as game.json(), built without pydantic's slower serializer
+        self.encoder = DictCodec()
+
+    def export_games(self, page_size: int = None):
+        """Yield the archive line by line; only one Scan page is ever held in memory."""
+        for game in self.repo.scan_games(page_size):
+            yield self._line(game)
+
+    def _line(self, game: Game) -> str:
+        return json.dumps(self.encoder.encode_game(game), separators=(',', ':')) + '\n'
+
+    def import_games(self, lines, batch_size: int = IMPORT_BATCH_SIZE, checkpoint: str = None) -> int:
+        """
+        Store every game in `lines` and return how many were imported.
+        Input is pulled a batch at a time and only after the previous batch
+        was written, so a throttled table slows the reader down instead of
+        buffering the archive. With `checkpoint`, the number of input lines
+        fully written is saved after each batch and lines already covered
+        are skipped when an interrupted import is re-run with the same file.
+        """
+        done = read_checkpoint(checkpoint)
+        imported = 0
+        for batch, consumed in self._batches(lines, done, batch_size):
+            self.repo.put_games(batch)
+            imported += len(batch)
+            done = consumed
+            write_checkpoint(checkpoint, done)
+        return imported
+
+    def _batches(self, lines, skip: int, batch_size: int):
+        # Yields (games, input lines consumed so far) for each full or final batch
+        batch = []
+        line_num = 0
+        for line_num, line in enumerate(lines, 1):
+            if line_num <= skip or not line.strip():
+                continue
+            batch.append(parse_game(line, line_num))
+            if len(batch) >= batch_size:
+                yield batch, line_num
+                batch = []
+        if batch:
+            yield batch, line_num
+
+
+def parse_game(line, line_num: int) -> Game:
+    try:
+        return Game.parse_raw(line)
+    except ValueError as e:
+        raise ValueError(f"Line {line_num}: invalid game: {e}")
+
+
+def read_checkpoint(path: str) -> int:
+    if not path or not os.path.exists(path):
+        return 0
+    with open(path) as f:
+        return json.load(f)['lines']
+
+
+def write_checkpoint(path: str, lines: int):
+    if not path:
+        return
+    # Write then rename, so a crash never leaves a truncated checkpoint
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump({'lines': lines}, f)
+    os.replace(tmp, path)
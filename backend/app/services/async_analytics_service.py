@@ -0,0 +1,20 @@
+from app.models.analytics import PlayerAnalytics
+from app.repositories.async_analytics_repository import AsyncAnalyticsRepository
+from app.services.analytics_service import AnalyticsService, summarize, round_deltas, count_game
+
+class AsyncAnalyticsService(AnalyticsService):
+    def __init__(self, repo: AsyncAnalyticsRepository = None):
+        self.repo = repo or AsyncAnalyticsRepository()
+
+    async def get_analytics(self, username: str) -> PlayerAnalytics:
+        return summarize(username, await self.repo.get_counters(username))
+
+    async def record_results(self, changes: list[tuple[int, dict, dict]]):
+        deltas = round_deltas(changes)
+        if deltas:
+            await self.repo.add_counters(deltas)
+
+    async def record_game(self, totals: dict, game_id: str = None):
+        counters = {}
+        count_game(counters, totals)
+        await self.repo.add_counters(counters, game_id)
@@ -0,0 +1,20 @@
+from app.repositories.async_game_repository import AsyncGameRepository
+from app.services.archive_service import ArchiveService, IMPORT_BATCH_SIZE, read_checkpoint, write_checkpoint
+
+class AsyncArchiveService(ArchiveService):
+    def __init__(self, repo: AsyncGameRepository = None):
+        super().__init__(repo or AsyncGameRepository())
+
+    async def export_games(self, page_size: int = None):
+        async for game in self.repo.scan_games(page_size):
+            yield self._line(game)
+
+    async def import_games(self, lines, batch_size: int = IMPORT_BATCH_SIZE, checkpoint: str = None) -> int:
+        done = read_checkpoint(checkpoint)
+        imported = 0
+        for batch, consumed in self._batches(lines, done, batch_size):
+            await self.repo.put_games(batch)
+            imported += len(batch)
+            done = consumed
+            write_checkpoint(checkpoint, done)
+        return imported
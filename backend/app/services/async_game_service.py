@@ -0,0 +1,99 @@
+from app.repositories.async_game_repository import AsyncGameRepository
+from app.models.game import Game, Standings, GameBatch, GamePage
+from app.services.game_service import GameService
+from app.services.async_user_service import AsyncUserService
+from app.services.async_analytics_service import AsyncAnalyticsService
+
+class AsyncGameService(GameService):
+    """
+    GameService for the async endpoints: the same game rules (all the
+    in-memory helpers are shared), with every repository call awaited.
+    """
+
+    def __init__(self, repo: AsyncGameRepository = None, user_service: AsyncUserService = None, updates=None,
+                 analytics: AsyncAnalyticsService = None):
+        self.repo = repo or AsyncGameRepository()
+        self.user_service = user_service or AsyncUserService()
+        self.updates = updates
+        self.analytics = analytics
+
+    async def create_game(self, players: list[str]) -> Game:
+        return await self.repo.create_game(players)
+
+    async def get_game(self, game_id: str) -> Game:
+        return await self.repo.get_game(game_id)
+
+    async def get_game_version(self, game_id: str):
+        return await self.repo.get_version(game_id)
+
+    async def list_games(self, player: str = None, before: str = None, limit: int = 20, cursor: str = None) -> GamePage:
+        games, next_cursor = await self.repo.list_games(player, before, limit, cursor)
+        return GamePage(games=games, next_cursor=next_cursor)
+
+    async def get_standings(self, game_id: str) -> Standings:
+        standings = await self.repo.get_standings(game_id)
+        if standings and not standings.totals:
+            # Game stored before running totals existed; fold it once
+            game = await self.repo.get_game(game_id)
+            self._rebuild_totals(game)
+            standings = Standings(game_id=game.game_id, status=game.status, totals=game.totals, ranks=game.ranks)
+        return standings
+
+    async def start_round(self, game_id: str, round_num: int) -> Game:
+        game = self._require_game(await self.repo.get_game(game_id))
+        new_round = self._add_round(game, round_num)
+        if new_round:
+            await self.repo.append_round(game, new_round)
+            self._publish(game, [new_round])
+        return game
+
+    async def submit_bids(self, game_id: str, round_num: int, bids: dict[str, int]) -> Game:
+        game = self._require_game(await self.repo.get_game(game_id))
+        if self._same_bids(game, round_num, bids):
+            return game
+        round_idx = self._set_bids(game, round_num, bids)
+        await self.repo.update_game_fields(game, round_fields={round_idx: ['bids']})
+        self._publish(game, [game.rounds[round_idx]])
+        return game
+
+    async def submit_results(self, game_id: str, round_num: int, results: dict) -> Game:
+        game = self._require_game(await self.repo.get_game(game_id))
+        previous = self._results_by_round(game)
+        status = game.status
+        changed = self._score_round(game, round_num, results)
+        if not self._rescored_same(game, round_num, previous, status, changed):
+            if changed:
+                await self.repo.update_game_fields(game, *changed)
+            else:
+                await self.repo.update_game(game)
+            self._publish(game, self._changed_rounds(game, changed))
+            if self.analytics is not None:
+                await self.analytics.record_results(self._result_changes(previous, game))
+
+        # Only count the game once the write has gone through
+        if round_num == 10:
+            await self._handle_game_completion(game)
+        return game
+
+    async def apply_batch(self, game_id: str, batch: GameBatch):
+        stored = self._require_game(await self.repo.get_game(game_id))
+        game = self._batch_copy(stored, batch)
+        changes = self._apply_operations(game, batch.operations)
+        if game != stored:
+            if changes is None:
+                await self.repo.update_game(game)
+            elif any(changes):
+                await self.repo.update_game_fields(game, *changes)
+            if self.updates is not None and (changes is None or any(changes)):
+                self.updates.publish(self._diff(stored, game))
+            if self.analytics is not None:
+                await self.analytics.record_results(self._result_changes(self._results_by_round(stored), game))
+
+        if self._completes_game(batch):
+            await self._handle_game_completion(game)
+        return self._batch_response(stored, game, batch)
+
+    async def _handle_game_completion(self, game: Game):
+        await self.user_service.record_game_results(self._final_scores(game), game.game_id)
+        if self.analytics is not None:
+            await self.analytics.record_game(game.totals, game.game_id)
@@ -0,0 +1,20 @@
+from app.repositories.async_user_repository import AsyncUserRepository
+from app.models.user import UserStats, LeaderboardMetric, LeaderboardPage
+from app.services.user_service import UserService
+
+class AsyncUserService(UserService):
+    def __init__(self, repo: AsyncUserRepository = None):
+        self.repo = repo or AsyncUserRepository()
+
+    async def get_user_stats(self, username: str) -> UserStats:
+        return await self.repo.get_user_stats(username)
+
+    async def update_stats_after_game(self, username: str, score: int, won: bool):
+        await self.record_game_results([(username, score, won)])
+
+    async def record_game_results(self, results: list[tuple[str, int, bool]], game_id: str = None):
+        await self.repo.record_game_results(results, game_id)
+
+    async def get_leaderboard(self, metric: LeaderboardMetric, limit: int = 20, cursor: str = None) -> LeaderboardPage:
+        entries, next_cursor = await self.repo.get_leaderboard(metric, limit, cursor)
+        return LeaderboardPage(metric=metric, entries=entries, next_cursor=next_cursor)
@@ -0,0 +1,248 @@
+import random
+import time
+from app.core.config import settings
+from app.core.cache import TTLCache
+from app.models.advisor import BidAdvice, BidEstimate
+from app.services import deck
+from app.services.deck import KIND, SUIT, STRENGTH, TRICK_KEYS, NUMBER, MERMAID, SKULL_KING, TIGRESS, NO_SUIT
+from app.services.scoring import calculate_round_scores
+
+# Deals are split into this many chunks per worker, so a slow worker
+# doesn't hold back the others past the time budget
+CHUNKS_PER_WORKER = 4
+
+_pool = None
+
+
+def _get_pool(workers: int):
+    global _pool
+    if _pool is None:
+        from concurrent.futures import ProcessPoolExecutor
+        _pool = ProcessPoolExecutor(max_workers=workers)
+    return _pool
+
+
+def close_advisor_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+class BidAdvisor:
+    """
+    Estimates the expected score of every bid for a hand by Monte Carlo:
+    deal the unseen cards to the other players many times, play each round
+    out with a simple bid-chasing strategy for everyone, and score each bid
+    with the real scoring rules. Results are cached per canonical hand.
+    """
+
+    def __init__(self, simulations: int = None, time_budget: float = None, workers: int = None, cache_size: int = None):
+        self.simulations = simulations or settings.ADVISOR_SIMULATIONS
+        self.time_budget = settings.ADVISOR_TIME_BUDGET if time_budget is None else time_budget
+        self.workers = settings.ADVISOR_WORKERS if workers is None else workers
+        cache_size = settings.ADVISOR_CACHE_SIZE if cache_size is None else cache_size
+        # Advice never goes stale, so entries only leave by LRU eviction
+        self.cache = TTLCache(cache_size, float('inf')) if cache_size > 0 else None
+
+    def advise(self, hand: list[str], round_num: int, num_players: int) -> BidAdvice:
+        cards = deck.parse_hand(hand)
+        if len(cards) != round_num:
+            raise ValueError(f"Round {round_num} deals {round_num} cards, got {len(cards)}")
+        if round_num * num_players > deck.DECK_SIZE:
+            raise ValueError(f"Not enough cards to deal {round_num} to {num_players} players")
+
+        key = (deck.canonical_hand(cards), round_num, num_players)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached.copy(update={'cached': True})
+
+        advice = self._estimate(list(key[0]), round_num, num_players, hash(key))
+        if self.cache is not None:
+            self.cache.put(key, advice)
+        return advice
+
+    def _estimate(self, hand: list[int], round_num: int, num_players: int, seed: int) -> BidAdvice:
+        deadline = time.time() + self.time_budget
+        results = None
+        if self.workers > 1:
+            chunks = self.workers * CHUNKS_PER_WORKER
+            sizes = [self.simulations // chunks + (i < self.simulations % chunks) for i in range(chunks)]
+            try:
+                futures = [
+                    _get_pool(self.workers).submit(simulate, hand, round_num, num_players, size, seed + i, deadline)
+                    for i, size in enumerate(sizes) if size
+                ]
+                results = [f.result() for f in futures]
+            except (OSError, NotImplementedError):
+                # No working multiprocessing here (e.g. no /dev/shm on Lambda);
+                # stay in-process from now on
+                self.workers = 0
+        if results is None:
+            results = [simulate(hand, round_num, num_players, self.simulations, seed, deadline)]
+
+        deals = sum(r[0] for r in results)
+        score_sums = [sum(r[1][bid] for r in results) for bid in range(round_num + 1)]
+        made = [sum(r[2][bid] for r in results) for bid in range(round_num + 1)]
+        estimates = [
+            BidEstimate(bid=bid, expected_score=round(score_sums[bid] / deals, 1), make_probability=round(made[bid] / deals, 3))
+            for bid in range(round_num + 1)
+        ]
+        best = max(estimates, key=lambda e: e.expected_score)
+        return BidAdvice(best_bid=best.bid, estimates=estimates, simulations=deals)
+
+
+def simulate(hand: list[int], round_num: int, num_players: int, deals: int, seed: int, deadline: float = None):
+    """
+    Play `deals` random deals (at least one, then until `deadline`) and
+    return (deals played, total score per bid, times each bid was made).
+    Module-level so it can run in a worker process.
+    """
+    rng = random.Random(seed)
+    unseen = [c for c in range(deck.DECK_SIZE) if c not in hand]
+    score_sums = [0] * (round_num + 1)
+    made = [0] * (round_num + 1)
+    bids = list(range(round_num + 1))
+    played = 0
+    while played < deals and (played == 0 or deadline is None or time.time() < deadline):
+        tricks, bonuses = simulate_deal(hand, unseen, round_num, num_players, rng)
+        for bid, score in enumerate(calculate_round_scores(bids, tricks, round_num, bonuses)):
+            score_sums[bid] += score
+        for bid in bids:
+            made[bid] += tricks[bid] == bid
+        played += 1
+    return played, score_sums, made
+
+
+def simulate_deal(hand: list[int], unseen: list[int], round_num: int, num_players: int, rng: random.Random):
+    """
+    Deal the other hands, then return (tricks won, bonus) of our hand for
+    every bid 0..round_num. We chase our bid (try to win until it is met,
+    then try to lose), so the play differs per bid; rather than replaying
+    the round for each bid, one run always tries to win and every bid
+    branches off the moment it is reached.
+    """
+    rng.shuffle(unseen)
+    seat = rng.randrange(num_players)  # seat 0 leads the first trick
+    hands = []
+    dealt = 0
+    for p in range(num_players):
+        if p == seat:
+            hands.append(list(hand))
+        else:
+            hands.append(unseen[dealt:dealt + round_num])
+            dealt += round_num
+    targets = [_estimate_bid(h) for h in hands]
+
+    # Branch points: state right after we won our k-th trick (k=0 is the start)
+    snapshots = [([list(h) for h in hands], 0, [0] * num_players, 0)]
+    targets[seat] = round_num + 1
+    base = _play_out([list(h) for h in hands], 0, [0] * num_players, 0, targets, seat, snapshots)
+
+    tricks = []
+    bonuses = []
+    for bid in range(round_num + 1):
+        if bid >= len(snapshots):
+            # Never reached even when trying to win every trick
+            tricks.append(base[0])
+            bonuses.append(base[1])
+            continue
+        branch_hands, leader, won, bonus = snapshots[bid]
+        targets[seat] = bid
+        result = _play_out([list(h) for h in branch_hands], leader, list(won), bonus, targets, seat, None)
+        tricks.append(result[0])
+        bonuses.append(result[1])
+    return tricks, bonuses
+
+
+def _estimate_bid(hand: list[int]) -> int:
+    # Opponents bid one trick per card that usually takes one: specials
+    # other than escapes, high trumps and the top of the colored suits
+    return sum(1 for c in hand if STRENGTH[c] >= 30 or (KIND[c] == NUMBER and deck.RANK[c] >= 13))
+
+
+def _play_out(hands, leader: int, won: list, bonus: int, targets: list, seat: int, snapshots):
+    """Play the remaining tricks; returns our (tricks won, bonus)."""
+    num_players = len(hands)
+    while hands[0]:
+        trick = []
+        led = NO_SUIT
+        best = -1
+        best_pos = 0
+        has_sk = False
+        mermaid_pos = -1
+        for pos in range(num_players):
+            player = (leader + pos) % num_players
+            card, held = _choose(hands[player], not trick, won[player] < targets[player], led, best, has_sk, mermaid_pos >= 0)
+            hands[player].remove(held)
+            trick.append(card)
+
+            # Incremental trick_winner(): see app.services.deck
+            kind = KIND[card]
+            if kind == SKULL_KING:
+                has_sk = True
+                if mermaid_pos >= 0:
+                    best, best_pos = 600, mermaid_pos
+                elif best < 500:
+                    best, best_pos = 500, pos
+            elif kind == MERMAID:
+                if mermaid_pos < 0:
+                    mermaid_pos = pos
+                    if has_sk:
+                        best, best_pos = 600, pos
+                    elif best < 300:
+                        best, best_pos = 300, pos
+            else:
+                if led == NO_SUIT and kind == NUMBER:
+                    led = SUIT[card]
+                key = TRICK_KEYS[led][card]
+                if key > best:
+                    best, best_pos = key, pos
+
+        winner = (leader + best_pos) % num_players
+        won[winner] += 1
+        if winner == seat:
+            bonus += deck.capture_bonus(trick, best_pos)
+            if snapshots is not None:
+                snapshots.append(([list(h) for h in hands], winner, list(won), bonus))
+        leader = winner
+    return won[seat], bonus
+
+
+def _choose(hand, leading: bool, want_win: bool, led: int, best: int, has_sk: bool, has_mermaid: bool):
+    """(card played, card taken from hand); they differ only for the Tigress."""
+    options = []
+    for c in deck.legal_cards(hand, led):
+        if KIND[c] == TIGRESS:
+            options.append((deck.TIGRESS_PIRATE if want_win else deck.TIGRESS_ESCAPE, c))
+        else:
+            options.append((c, c))
+
+    def strength(option):
+        return STRENGTH[option[0]]
+
+    if leading:
+        return max(options, key=strength) if want_win else min(options, key=strength)
+
+    winners = []
+    losers = []
+    for option in options:
+        (winners if _wins(option[0], led, best, has_sk, has_mermaid) else losers).append(option)
+    if want_win:
+        # Cheapest card that takes the trick so far
+        return min(winners or options, key=strength)
+    # Get rid of the strongest card that still loses
+    return max(losers, key=strength) if losers else min(options, key=strength)
+
+
+def _wins(card: int, led: int, best: int, has_sk: bool, has_mermaid: bool) -> bool:
+    """Whether `card` would take the trick as it stands."""
+    kind = KIND[card]
+    if kind == SKULL_KING:
+        return not has_mermaid and best < 500
+    if kind == MERMAID:
+        return (has_sk and not has_mermaid) or best < 300
+    if led == NO_SUIT and kind == NUMBER:
+        led = SUIT[card]
+    return TRICK_KEYS[led][card] > best
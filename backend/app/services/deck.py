@@ -0,0 +1,160 @@
+"""
+The Skull King deck and trick rules, with cards as small ints so the bid
+simulator can resolve tricks with table lookups instead of objects.
+
+Card ids 0-55 are the numbered cards (suit * 14 + rank - 1), followed by
+5 pirates, the Tigress, the Skull King, 2 mermaids and 5 escapes. When the
+Tigress is played it becomes TIGRESS_PIRATE or TIGRESS_ESCAPE.
+"""
+
+SUITS = ('green', 'yellow', 'purple', 'black')
+TRUMP = 3  # black (Jolly Roger) beats the other suits
+COLORED_SUITS = (0, 1, 2)
+RANKS = 14
+
+NUMBER, ESCAPE, MERMAID, PIRATE, TIGRESS, SKULL_KING = range(6)
+SPECIALS = (
+    ('pirate', PIRATE, 5),
+    ('tigress', TIGRESS, 1),
+    ('skull-king', SKULL_KING, 1),
+    ('mermaid', MERMAID, 2),
+    ('escape', ESCAPE, 5),
+)
+
+KIND = [NUMBER] * (len(SUITS) * RANKS)
+SUIT = [s for s in range(len(SUITS)) for _ in range(RANKS)]
+RANK = [r for _ in SUITS for r in range(1, RANKS + 1)]
+CARD_NAMES = [f'{SUITS[s]}-{r}' for s, r in zip(SUIT, RANK)]
+for _name, _kind, _count in SPECIALS:
+    for _ in range(_count):
+        KIND.append(_kind)
+        SUIT.append(-1)
+        RANK.append(0)
+        CARD_NAMES.append(_name)
+DECK_SIZE = len(KIND)
+
+# The two ways the Tigress can be played; never dealt
+TIGRESS_PIRATE = DECK_SIZE
+TIGRESS_ESCAPE = DECK_SIZE + 1
+KIND += [PIRATE, ESCAPE]
+SUIT += [-1, -1]
+RANK += [0, 0]
+CARD_NAMES += ['tigress', 'tigress']
+
+# Trick strength per led suit (index 4 = nothing led yet). The first card
+# with the highest key wins, which also gives "first pirate wins" and
+# "all escapes: the leader wins".
+_SPECIAL_KEYS = {ESCAPE: 0, MERMAID: 300, PIRATE: 400, TIGRESS: 400, SKULL_KING: 500}
+NO_SUIT = len(SUITS)
+
+
+def _key(card: int, led: int) -> int:
+    kind = KIND[card]
+    if kind != NUMBER:
+        return _SPECIAL_KEYS[kind]
+    if SUIT[card] == TRUMP:
+        return 200 + RANK[card]
+    if SUIT[card] == led:
+        return 100 + RANK[card]
+    return 1
+
+
+TRICK_KEYS = [[_key(c, led) for c in range(len(KIND))] for led in range(NO_SUIT + 1)]
+
+# Rough card strength, used to pick the weakest/strongest card to play
+STRENGTH = [
+    0 if k == ESCAPE else 40 if k == MERMAID else 45 if k == PIRATE else 44 if k == TIGRESS
+    else 50 if k == SKULL_KING else (20 + RANK[c] if SUIT[c] == TRUMP else RANK[c])
+    for c, k in enumerate(KIND)
+]
+
+
+def parse_card(name: str) -> int:
+    """Card id for names like 'green-7', 'black-14', 'pirate', 'skull-king'; the first free copy of specials."""
+    name = name.strip().lower().replace('_', '-').replace(' ', '-')
+    if '-' in name and name.rsplit('-', 1)[1].isdigit():
+        suit, rank = name.rsplit('-', 1)
+        if suit in SUITS and 1 <= int(rank) <= RANKS:
+            return SUITS.index(suit) * RANKS + int(rank) - 1
+    elif name in ('skullking', 'skull-king', 'king'):
+        return CARD_NAMES.index('skull-king')
+    elif name in CARD_NAMES:
+        return CARD_NAMES.index(name)
+    raise ValueError(f"Unknown card '{name}'")
+
+
+def parse_hand(names: list[str]) -> list[int]:
+    """Card ids for a hand, giving repeated specials distinct copies."""
+    hand = []
+    for name in names:
+        card = parse_card(name)
+        # Specials come in several copies; take the next unused one
+        while card in hand and card + 1 < DECK_SIZE and CARD_NAMES[card + 1] == CARD_NAMES[card]:
+            card += 1
+        if card in hand:
+            raise ValueError(f"Too many '{name}' cards in hand")
+        hand.append(card)
+    return hand
+
+
+def led_suit(trick: list[int]) -> int:
+    for card in trick:
+        if KIND[card] == NUMBER:
+            return SUIT[card]
+    return NO_SUIT
+
+
+def trick_winner(trick: list[int]) -> int:
+    """Position in `trick` (cards in play order) of the winning card."""
+    kinds = [KIND[c] for c in trick]
+    if SKULL_KING in kinds and MERMAID in kinds:
+        # The mermaid captures the Skull King
+        return kinds.index(MERMAID)
+    keys = TRICK_KEYS[led_suit(trick)]
+    best = 0
+    for i in range(1, len(trick)):
+        if keys[trick[i]] > keys[trick[best]]:
+            best = i
+    return best
+
+
+def legal_cards(hand: list[int], led: int) -> list[int]:
+    """Cards that may be played: specials always, numbers must follow the led suit if possible."""
+    if led != NO_SUIT and any(KIND[c] == NUMBER and SUIT[c] == led for c in hand):
+        return [c for c in hand if KIND[c] != NUMBER or SUIT[c] == led]
+    return list(hand)
+
+
+def capture_bonus(trick: list[int], winner: int) -> int:
+    """Bonus points the winner of a trick earns (only paid out on a made bid)."""
+    winning_kind = KIND[trick[winner]]
+    bonus = 0
+    for card in trick:
+        kind = KIND[card]
+        if kind == NUMBER and RANK[card] == 14:
+            bonus += 20 if SUIT[card] == TRUMP else 10
+        elif kind == MERMAID and winning_kind == PIRATE:
+            bonus += 20
+        elif kind == PIRATE and winning_kind == SKULL_KING:
+            bonus += 30
+        elif kind == SKULL_KING and winning_kind == MERMAID:
+            bonus += 40
+    return bonus
+
+
+def canonical_hand(hand: list[int]) -> tuple:
+    """
+    The three colored suits are interchangeable, so relabel them in a fixed
+    order (by the ranks held in each); equivalent hands share one key.
+    """
+    held = {s: sorted(RANK[c] for c in hand if SUIT[c] == s) for s in COLORED_SUITS}
+    order = sorted(COLORED_SUITS, key=lambda s: (len(held[s]), held[s]), reverse=True)
+    relabel = {s: i for i, s in enumerate(order)}
+    relabel[TRUMP] = TRUMP
+    canonical = []
+    for card in hand:
+        if KIND[card] == NUMBER:
+            canonical.append(relabel[SUIT[card]] * RANKS + RANK[card] - 1)
+        else:
+            canonical.append(card)
+    return tuple(sorted(canonical))
@@ -1,12 +1,25 @@
-from app.repositories.game_repository import GameRepository
-from app.models.game import Game, Round, RoundResult, GameStatus
-from app.services.scoring import calculate_round_score
+import functools
+from app.repositories.game_repository import GameRepository, VersionConflictError
+from app.models.game import Game, Round, RoundResult, GameStatus, Standings, GameBatch, GameDiff, GamePage, OperationType
+from app.services.scoring import calculate_round_scores, rank_players
 from app.services.user_service import UserService
 
+def _per_game(method):
+    # Read, change and write the game under its lock (see GameRepository.locked)
+    @functools.wraps(method)
+    def locked(self, game_id: str, *args, **kwargs):
+        with self.repo.locked(game_id):
+            return method(self, game_id, *args, **kwargs)
+    return locked
+
 class GameService:
-    def __init__(self):
-        self.repo = GameRepository()
-        self.user_service = UserService()
+    def __init__(self, repo: GameRepository = None, user_service: UserService = None, updates=None, analytics=None):
+        self.repo = repo or GameRepository()
+        self.user_service = user_service or UserService()
+        # UpdateHub that watchers of a game get each write from (None: nobody is told)
+        self.updates = updates
+        # AnalyticsService counting every scored round (None: not kept)
+        self.analytics = analytics
 
     def create_game(self, players: list[str]) -> Game:
         return self.repo.create_game(players)
@@ -14,68 +27,151 @@ class GameService:
     def get_game(self, game_id: str) -> Game:
         return self.repo.get_game(game_id)
 
+    def get_game_version(self, game_id: str):
+        return self.repo.get_version(game_id)
+
+    def list_games(self, player: str = None, before: str = None, limit: int = 20, cursor: str = None) -> GamePage:
+        games, next_cursor = self.repo.list_games(player, before, limit, cursor)
+        return GamePage(games=games, next_cursor=next_cursor)
+
+    def get_standings(self, game_id: str) -> Standings:
+        standings = self.repo.get_standings(game_id)
+        if standings and not standings.totals:
+            # Game stored before running totals existed; fold it once
+            game = self.repo.get_game(game_id)
+            self._rebuild_totals(game)
+            standings = Standings(game_id=game.game_id, status=game.status, totals=game.totals, ranks=game.ranks)
+        return standings
+
+    @_per_game
     def start_round(self, game_id: str, round_num: int) -> Game:
-        game = self.repo.get_game(game_id)
-        if not game:
-            raise ValueError("Game not found")
-            
-        # Check if round already exists
-        for r in game.rounds:
-            if r.round_num == round_num:
-                return game # Already started
-                
-        new_round = Round(round_num=round_num, cards_dealt=round_num)
-        game.rounds.append(new_round)
-        self.repo.update_game(game)
+        game = self._require_game(self.repo.get_game(game_id))
+        new_round = self._add_round(game, round_num)
+        if new_round:
+            self.repo.append_round(game, new_round)
+            self._publish(game, [new_round])
         return game
 
+    @_per_game
     def submit_bids(self, game_id: str, round_num: int, bids: dict[str, int]) -> Game:
-        game = self.repo.get_game(game_id)
-        if not game:
-            raise ValueError("Game not found")
-            
-        round_idx = -1
-        for i, r in enumerate(game.rounds):
-            if r.round_num == round_num:
-                round_idx = i
-                break
-        
-        if round_idx == -1:
-            raise ValueError("Round not found")
-            
-        game.rounds[round_idx].bids = bids
-        self.repo.update_game(game)
+        game = self._require_game(self.repo.get_game(game_id))
+        if self._same_bids(game, round_num, bids):
+            # A retry of a submission that already went through: nothing to write
+            return game
+        round_idx = self._set_bids(game, round_num, bids)
+        self.repo.update_game_fields(game, round_fields={round_idx: ['bids']})
+        self._publish(game, [game.rounds[round_idx]])
         return game
 
+    @_per_game
     def submit_results(self, game_id: str, round_num: int, results: dict) -> Game:
         # results: {player_name: {tricks_won: int, bonus: int, penalty: int}}
-        game = self.repo.get_game(game_id)
+        game = self._require_game(self.repo.get_game(game_id))
+        previous = self._results_by_round(game)
+        status = game.status
+        changed = self._score_round(game, round_num, results)
+        # A retry scores the same results again: nothing to write or publish
+        if not self._rescored_same(game, round_num, previous, status, changed):
+            if changed:
+                self.repo.update_game_fields(game, *changed)
+            else:
+                self.repo.update_game(game)
+            self._publish(game, self._changed_rounds(game, changed))
+            if self.analytics is not None:
+                self.analytics.record_results(self._result_changes(previous, game))
+
+        # Only count the game once the write has gone through; counted once per game however often it runs
+        if round_num == 10:
+            self._handle_game_completion(game)
+        return game
+
+    @_per_game
+    def apply_batch(self, game_id: str, batch: GameBatch):
+        """
+        Apply an ordered list of start/bids/results operations (possibly
+        several rounds, for catch-up entry) with one read and one conditional
+        write. Operations run on a copy, so if any of them fails nothing is
+        stored. Returns the game, or a GameDiff if the batch asked for one.
+        """
+        stored = self._require_game(self.repo.get_game(game_id))
+        game = self._batch_copy(stored, batch)
+        changes = self._apply_operations(game, batch.operations)
+        # A replayed batch leaves the game as it was and writes nothing
+        if game != stored:
+            if changes is None:
+                self.repo.update_game(game)
+            elif any(changes):
+                self.repo.update_game_fields(game, *changes)
+            if self.updates is not None and (changes is None or any(changes)):
+                self.updates.publish(self._diff(stored, game))
+            if self.analytics is not None:
+                self.analytics.record_results(self._result_changes(self._results_by_round(stored), game))
+
+        if self._completes_game(batch):
+            self._handle_game_completion(game)
+        return self._batch_response(stored, game, batch)
+
+    # The helpers below only change the in-memory game; the public methods
+    # above (and their async counterparts) decide how to persist it.
+
+    def _require_game(self, game: Game) -> Game:
         if not game:
             raise ValueError("Game not found")
+        return game
 
-        round_idx = -1
-        for i, r in enumerate(game.rounds):
-            if r.round_num == round_num:
-                round_idx = i
-                break
-        
+    def _add_round(self, game: Game, round_num: int) -> Round:
+        # Check if round already exists
+        if game.get_round(round_num):
+            return None # Already started
+
+        new_round = Round(round_num=round_num, cards_dealt=round_num)
+        game.add_round(new_round)
+        return new_round
+
+    def _set_bids(self, game: Game, round_num: int, bids: dict[str, int]) -> int:
+        round_idx = game.round_position(round_num)
+        if round_idx == -1:
+            raise ValueError("Round not found")
+
+        game.rounds[round_idx].bids = bids
+        return round_idx
+
+    def _same_bids(self, game: Game, round_num: int, bids: dict[str, int]) -> bool:
+        current_round = game.get_round(round_num)
+        return current_round is not None and current_round.bids == bids
+
+    def _rescored_same(self, game: Game, round_num: int, previous: dict, status: GameStatus, changed) -> bool:
+        # Scoring the same results again leaves totals and ranks as they were;
+        # a full rewrite (changed is None) always has something to store
+        return (bool(changed) and game.status == status
+                and game.get_round(round_num).results == previous.get(round_num))
+
+    def _score_round(self, game: Game, round_num: int, results: dict):
+        """
+        Score a round into the game. Returns the (game_fields, round_fields)
+        that changed for a partial write, or None if the whole game must be
+        rewritten.
+        """
+        round_idx = game.round_position(round_num)
         if round_idx == -1:
             raise ValueError("Round not found")
             
         current_round = game.rounds[round_idx]
         
-        # Calculate scores
+        # Calculate scores for the whole round in one batch
+        player_names = list(results.keys())
+        bids = [current_round.bids.get(p, 0) for p in player_names]
+        tricks = [results[p].get('tricks_won', 0) for p in player_names]
+        bonuses = [results[p].get('bonus', 0) for p in player_names]
+        penalties = [results[p].get('penalty', 0) for p in player_names]
+        scores = calculate_round_scores(bids, tricks, round_num, bonuses, penalties)
+
         round_results = {}
-        for player_name, data in results.items():
-            bid = current_round.bids.get(player_name, 0)
-            tricks = data.get('tricks_won', 0)
-            bonus = data.get('bonus', 0)
-            penalty = data.get('penalty', 0)
-            
-            score = calculate_round_score(bid, tricks, round_num, bonus, penalty)
-            
+        for player_name, bid, tricks_won, bonus, penalty, score in zip(
+            player_names, bids, tricks, bonuses, penalties, scores
+        ):
             round_results[player_name] = RoundResult(
-                tricks_won=tricks,
+                tricks_won=tricks_won,
                 bid=bid,
                 bonus_points=bonus,
                 penalty_points=penalty,
@@ -87,30 +183,161 @@ class GameService:
                 loot_bonus=0
             )
             
+        previous_results = current_round.results
+        had_totals = bool(game.totals)
         current_round.results = round_results
+        self._apply_round_totals(game, current_round, previous_results)
         
         # Check if game is over (Round 10)
         if round_num == 10:
             game.status = GameStatus.COMPLETED
-            self._handle_game_completion(game)
-            
-        self.repo.update_game(game)
-        return game
 
-    def _handle_game_completion(self, game: Game):
-        # Calculate total scores
-        player_scores = {p: 0 for p in game.players}
+        if not had_totals:
+            return None
+
+        # Only this round and the running totals changed (plus later rounds' totals on a correction)
+        round_fields = {
+            i: ['totals'] for i, r in enumerate(game.rounds)
+            if r.totals and r.round_num > round_num
+        }
+        round_fields[round_idx] = ['results', 'totals']
+        return ['totals', 'ranks', 'status'], round_fields
+
+    def _apply_round_totals(self, game: Game, current_round: Round, previous_results: dict):
+        # Only the change in this round's scores is applied, so a normal
+        # submission costs O(players) instead of re-walking every round.
+        if not game.totals:
+            self._rebuild_totals(game)
+            return
+
+        deltas = {p: res.round_score for p, res in current_round.results.items()}
+        for p, res in previous_results.items():
+            deltas[p] = deltas.get(p, 0) - res.round_score
+
+        if not current_round.totals:
+            # First time this round is scored: start from the latest scored round before it
+            previous_round = None
+            for r in game.rounds:
+                if r.totals and r.round_num < current_round.round_num:
+                    if previous_round is None or r.round_num > previous_round.round_num:
+                        previous_round = r
+            base = previous_round.totals if previous_round else {}
+            current_round.totals = {p: base.get(p, 0) for p in game.players}
+
+        # This round and any later rounds already scored (corrections) shift by the same delta
         for r in game.rounds:
+            if r.totals and r.round_num >= current_round.round_num:
+                for p, d in deltas.items():
+                    r.totals[p] = r.totals.get(p, 0) + d
+
+        for p, d in deltas.items():
+            game.totals[p] = game.totals.get(p, 0) + d
+        game.ranks = rank_players(game.totals)
+
+    def _rebuild_totals(self, game: Game):
+        totals = {p: 0 for p in game.players}
+        for r in sorted(game.rounds, key=lambda r: r.round_num):
+            if not r.results:
+                continue
             for p, res in r.results.items():
-                player_scores[p] += res.round_score
-        
+                totals[p] = totals.get(p, 0) + res.round_score
+            r.totals = dict(totals)
+        game.totals = totals
+        game.ranks = rank_players(totals)
+
+    def _batch_copy(self, stored: Game, batch: GameBatch) -> Game:
+        if batch.expected_version is not None and stored.version != batch.expected_version:
+            raise VersionConflictError(f"Game {stored.game_id} is at version {stored.version}, not {batch.expected_version}")
+        return stored.working_copy()
+
+    def _apply_operations(self, game: Game, operations):
+        """
+        Run the operations against the game and merge what each one changed.
+        Returns (game_fields, round_fields, new_rounds) for update_game_fields,
+        or None if the whole game must be rewritten.
+        """
+        first_new = len(game.rounds)
+        new_rounds = []
+        game_fields = []
+        round_fields = {}
+        rewrite = False
+        for op in operations:
+            if op.op == OperationType.START:
+                new_round = self._add_round(game, op.round_num)
+                if new_round:
+                    new_rounds.append(new_round)
+            elif op.op == OperationType.BIDS:
+                round_idx = self._set_bids(game, op.round_num, op.bids)
+                round_fields.setdefault(round_idx, []).append('bids')
+            else:
+                changed = self._score_round(game, op.round_num, op.results)
+                if changed is None:
+                    rewrite = True
+                    continue
+                game_fields.extend(f for f in changed[0] if f not in game_fields)
+                for round_idx, fields in changed[1].items():
+                    known = round_fields.setdefault(round_idx, [])
+                    known.extend(f for f in fields if f not in known)
+
+        # Rounds appended here are written whole, so their own field changes are already covered
+        round_fields = {idx: fields for idx, fields in round_fields.items() if idx < first_new}
+        if rewrite or (new_rounds and round_fields):
+            # One UpdateExpression can't both append to and edit inside `rounds`
+            return None
+        return game_fields, round_fields, new_rounds
+
+    def _completes_game(self, batch: GameBatch) -> bool:
+        return any(op.op == OperationType.RESULTS and op.round_num == 10 for op in batch.operations)
+
+    def _batch_response(self, stored: Game, game: Game, batch: GameBatch):
+        return self._diff(stored, game) if batch.diff else game
+
+    def _diff(self, stored: Game, game: Game) -> GameDiff:
+        before = {r.round_num: r for r in stored.rounds}
+        return self._game_diff(game, [r for r in game.rounds if before.get(r.round_num) != r])
+
+    def _game_diff(self, game: Game, rounds: list[Round]) -> GameDiff:
+        return GameDiff(
+            game_id=game.game_id,
+            version=game.version,
+            status=game.status,
+            totals=game.totals,
+            ranks=game.ranks,
+            rounds=rounds
+        )
+
+    def _changed_rounds(self, game: Game, changed) -> list[Round]:
+        # Rounds named in a partial write's round_fields; a full rewrite sends them all
+        if not changed:
+            return game.rounds
+        return [game.rounds[i] for i in sorted(changed[1])]
+
+    def _results_by_round(self, game: Game) -> dict:
+        # Scoring replaces a round's results dict rather than changing it, so references are enough
+        return {r.round_num: r.results for r in game.rounds}
+
+    def _result_changes(self, previous: dict, game: Game) -> list[tuple[int, dict, dict]]:
+        # (round_num, previous results, new results) for every round whose results changed
+        return [
+            (r.round_num, previous.get(r.round_num, {}), r.results) for r in game.rounds
+            if r.results != previous.get(r.round_num, {})
+        ]
+
+    def _publish(self, game: Game, rounds: list[Round]):
+        if self.updates is not None:
+            self.updates.publish(self._game_diff(game, rounds))
+
+    def _handle_game_completion(self, game: Game):
+        # One batched write for all players instead of a get + put each
+        # Keyed by game, so a retried final round doesn't count the game twice
+        self.user_service.record_game_results(self._final_scores(game), game.game_id)
+        if self.analytics is not None:
+            self.analytics.record_game(game.totals, game.game_id)
+
+    def _final_scores(self, game: Game) -> list[tuple[str, int, bool]]:
+        player_scores = game.totals
+
         # Determine winner (highest score)
         # Handle ties? For now, multiple winners possible
-        max_score = -float('inf')
-        for s in player_scores.values():
-            if s > max_score:
-                max_score = s
-                
-        for player, score in player_scores.items():
-            won = (score == max_score)
-            self.user_service.update_stats_after_game(player, score, won)
+        max_score = max(player_scores.values(), default=0)
+        return [(player, score, score == max_score) for player, score in player_scores.items()]
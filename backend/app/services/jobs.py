@@ -0,0 +1,38 @@
+from collections import deque
+from itertools import islice
+
+# Helpers for the offline jobs that stream the whole archive (re-scoring,
+# the analytics backfill): games go out in chunks, optionally to worker
+# processes, and only a few chunks per worker are in flight at a time.
+
+
+def chunked(iterable, size: int):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_chunks(func, chunks, workers: int, *args):
+    """
+    Yield func(chunk, *args) for every chunk, in order. With `workers` > 1
+    the calls run in that many worker processes, so `func` must be a
+    module-level function.
+    """
+    if workers <= 1:
+        for chunk in chunks:
+            yield func(chunk, *args)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Reading ahead of the workers is capped so a fast scan can't buffer the archive
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(func, chunk, *args))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,253 @@
+import asyncio
+import importlib
+import threading
+from collections import deque
+from app.core.config import settings
+from app.models.game import GameDiff
+
+# Live game updates: GameService publishes a GameDiff after every write and
+# the hub pushes it to everyone watching that game as server-sent events.
+# Each message is framed once and kept in a small per-game ring buffer;
+# watchers are coroutines waiting on one shared event per game, so a publish
+# costs the same whether one client is watching or thousands, and a slow
+# client only falls behind in the buffer instead of holding up the writer.
+
+# Sent in place of the updates a watcher fell too far behind to receive
+RESYNC = object()
+
+
+class Broker:
+    """
+    Carries published updates to the hub of every instance. LocalBroker only
+    reaches this process; a multi-instance deployment plugs in one backed by
+    a shared pub/sub channel by naming it in LIVE_UPDATE_BROKER.
+    """
+
+    def start(self, deliver):
+        """Called once by the hub. Pass every update, from any instance, to `deliver(game_id, version, message)`."""
+        self.deliver = deliver
+
+    def publish(self, game_id: str, version: int, message: str):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class LocalBroker(Broker):
+    def publish(self, game_id: str, version: int, message: str):
+        self.deliver(game_id, version, message)
+
+
+BROKERS = {'local': LocalBroker}
+
+
+def load_broker(name: str) -> Broker:
+    """A broker from BROKERS by name, or any Broker class as 'package.module:ClassName'."""
+    if name in BROKERS:
+        return BROKERS[name]()
+    module, _, attr = name.partition(':')
+    if not attr:
+        raise ValueError(f"Unknown broker '{name}', expected one of {sorted(BROKERS)} or 'module:Class'")
+    return getattr(importlib.import_module(module), attr)()
+
+
+def sse_frame(event: str, data: str, event_id=None) -> bytes:
+    lines = [f'id: {event_id}'] if event_id is not None else []
+    lines.append(f'event: {event}')
+    lines.extend(f'data: {line}' for line in data.split('\n'))
+    return ('\n'.join(lines) + '\n\n').encode()
+
+
+HEARTBEAT = b': ping\n\n'
+
+
+class _Channel:
+    """Recent updates of one watched game. Only touched from its event loop."""
+
+    def __init__(self, loop, buffer_size: int, heartbeat: float):
+        self.loop = loop
+        self.frames = deque(maxlen=buffer_size)  # (seq, version, frame)
+        self.seq = 0
+        self.changed = asyncio.Event()
+        self.watchers = 0
+        self.heartbeat = heartbeat
+        # One timer per game rather than a timeout per watcher
+        self._timer = loop.call_later(heartbeat, self._beat)
+
+    def push(self, version: int, frame: bytes):
+        self.seq += 1
+        self.frames.append((self.seq, version, frame))
+        self._wake()
+
+    def close(self):
+        self._timer.cancel()
+
+    def _beat(self):
+        self._wake()
+        self._timer = self.loop.call_later(self.heartbeat, self._beat)
+
+    def _wake(self):
+        # Wake everyone waiting on the current event, and give later waits a fresh one
+        changed, self.changed = self.changed, asyncio.Event()
+        changed.set()
+
+
+class Subscription:
+    """One watcher's position in a game's updates; create with UpdateHub.subscribe()."""
+
+    def __init__(self, hub: 'UpdateHub', game_id: str, channel: _Channel):
+        self.hub = hub
+        self.game_id = game_id
+        self.channel = channel
+        self.cursor = channel.seq
+        # Version the watcher has; older or repeated updates are skipped
+        self.version = -1
+
+    async def frames(self):
+        """
+        Yield the frames of updates newer than `self.version` as they
+        arrive, HEARTBEAT when nothing happened for a while, and RESYNC if
+        updates were dropped because this watcher fell behind the buffer.
+        """
+        channel = self.channel
+        idle = False
+        while True:
+            changed = channel.changed
+            if self.cursor < channel.seq:
+                frames = channel.frames
+                oldest = frames[0][0]
+                if self.cursor < oldest - 1:
+                    self.cursor = channel.seq
+                    yield RESYNC
+                    continue
+                # Copied first: the buffer may move on while we are suspended in a yield
+                new = [frames[i] for i in range(self.cursor - oldest + 1, len(frames))]
+                self.cursor = new[-1][0]
+                for _, version, frame in new:
+                    if version > self.version:
+                        self.version = version
+                        yield frame
+            elif idle:
+                yield HEARTBEAT
+            if changed is not channel.changed:
+                idle = False
+                continue  # more arrived while we were yielding
+            await changed.wait()
+            idle = self.cursor == channel.seq
+
+    def close(self):
+        self.hub._leave(self.game_id, self.channel)
+
+
+class UpdateHub:
+    """
+    Fans game updates out to the watchers in this process. publish() may be
+    called from any thread (the sync endpoints run in FastAPI's threadpool);
+    delivery is handed to the event loop the game's watchers run on.
+    """
+
+    def __init__(self, broker: Broker = None, buffer_size: int = None, heartbeat: float = None):
+        self.broker = broker or load_broker(settings.LIVE_UPDATE_BROKER)
+        self.buffer_size = buffer_size or settings.LIVE_UPDATE_BUFFER
+        self.heartbeat = heartbeat or settings.LIVE_UPDATE_HEARTBEAT
+        self._channels = {}
+        self._lock = threading.Lock()
+        self.published = 0
+        self.failed = 0
+        self.broker.start(self._deliver)
+
+    def publish(self, diff: GameDiff):
+        # The write this reports has already gone through, so a broker
+        # failure is counted rather than failing the request
+        try:
+            self.broker.publish(diff.game_id, diff.version, diff.json())
+            self.published += 1
+        except Exception:
+            self.failed += 1
+
+    def subscribe(self, game_id: str) -> Subscription:
+        """Start receiving a game's updates. Must be called from the event loop that reads them."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            channel = self._channels.get(game_id)
+            if channel is None or channel.loop is not loop:
+                channel = self._channels[game_id] = _Channel(loop, self.buffer_size, self.heartbeat)
+            channel.watchers += 1
+        return Subscription(self, game_id, channel)
+
+    def stats(self) -> dict:
+        with self._lock:
+            channels = list(self._channels.values())
+        return {
+            'games': len(channels),
+            'watchers': sum(c.watchers for c in channels),
+            'published': self.published,
+            'failed': self.failed,
+        }
+
+    def close(self):
+        self.broker.close()
+
+    def _leave(self, game_id: str, channel: _Channel):
+        with self._lock:
+            channel.watchers -= 1
+            if channel.watchers > 0:
+                return
+            channel.close()
+            if self._channels.get(game_id) is channel:
+                del self._channels[game_id]
+
+    def _deliver(self, game_id: str, version: int, message: str):
+        channel = self._channels.get(game_id)
+        if channel is None:
+            return  # nobody here is watching this game
+        # Framed once, then shared by every watcher
+        frame = sse_frame('update', message, version)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is channel.loop:
+            channel.push(version, frame)
+            return
+        try:
+            channel.loop.call_soon_threadsafe(channel.push, version, frame)
+        except RuntimeError:
+            pass  # that loop has closed, and its watchers with it
+
+
+async def stream_game(hub: UpdateHub, game_id: str, get_game, get_version, last_event_id: str = None):
+    """
+    The event stream for one watcher: the full game as a `game` event (unless
+    Last-Event-ID says the client is already current), then an `update` event
+    per write. `get_game`/`get_version` are coroutine functions. The
+    subscription is taken before the game is read, so no write falls between.
+    """
+    subscription = hub.subscribe(game_id)
+    try:
+        known = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+        if known is not None and known == await get_version(game_id):
+            subscription.version = known
+        else:
+            frame = await _game_frame(subscription, get_game)
+            if frame is None:
+                return
+            yield frame
+
+        async for frame in subscription.frames():
+            if frame is RESYNC:
+                frame = await _game_frame(subscription, get_game)
+                if frame is None:
+                    return
+            yield frame
+    finally:
+        subscription.close()
+
+
+async def _game_frame(subscription: Subscription, get_game):
+    game = await get_game(subscription.game_id)
+    if game is None:
+        return None
+    subscription.version = game.version
+    return sse_frame('game', game.json(), game.version)
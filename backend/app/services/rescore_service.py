@@ -0,0 +1,164 @@
+from app.models.compact import CompactGame
+from app.models.rules import RuleSet
+from app.repositories.game_repository import GameRepository
+from app.services.jobs import chunked, run_chunks
+from app.services.scoring import STANDARD_RULES, calculate_round_scores
+
+# Games sent to a worker at a time
+RESCORE_CHUNK_SIZE = 200
+# Width of the final-score histogram buckets in the summary
+SCORE_BUCKET = 50
+
+class RescoreService:
+    """
+    Re-scores stored games under alternate rule sets and reports how the
+    outcomes would change against a baseline (the standard rules). Games are
+    streamed in chunks and only a few chunks per worker are in flight, so
+    memory is bounded by the chunk size, not by the size of the archive.
+    """
+
+    def __init__(self, repo: GameRepository = None):
+        self.repo = repo or GameRepository()
+
+    def rescore(self, variants: list[RuleSet], games=None, on_game=None, workers: int = 0,
+                chunk_size: int = RESCORE_CHUNK_SIZE, baseline: RuleSet = STANDARD_RULES) -> dict:
+        """
+        Re-score `games` (default: every stored game) under each variant and
+        return the aggregate summary. `on_game(delta)` receives the per-game
+        deltas as they are produced, in input order. With `workers` > 1 the
+        scoring runs in that many worker processes.
+        """
+        if games is None:
+            games = self.repo.scan_games(compact=True)
+        variants = list(variants)
+        chunks = chunked((_game_rows(g) for g in games), chunk_size)
+
+        summary = _empty_summary(baseline, variants)
+        for deltas, partial in run_chunks(rescore_chunk, chunks, workers, baseline, variants):
+            _merge(summary, partial)
+            if on_game is not None:
+                for delta in deltas:
+                    on_game(delta)
+        return _finish(summary)
+
+
+def _game_rows(game) -> tuple:
+    # Just the scoring inputs, so chunks are cheap to send to a worker
+    if isinstance(game, CompactGame):
+        return game.game_id, game.score_rows()
+    rows = [
+        (player, r.round_num, res.bid, res.tricks_won, res.bonus_points, res.penalty_points, res.loot_bonus)
+        for r in game.rounds for player, res in r.results.items()
+    ]
+    return game.game_id, rows
+
+
+def rescore_chunk(chunk: list, baseline: RuleSet, variants: list[RuleSet]):
+    """
+    Score a chunk of (game_id, rows) under the baseline and every variant.
+    Returns (per-game deltas, partial summary). Module-level so it can run
+    in a worker process.
+    """
+    offsets = []
+    columns = ([], [], [], [], [], [])
+    for game_id, rows in chunk:
+        offsets.append(len(columns[0]))
+        for _, round_num, bid, tricks, bonus, penalty, loot in rows:
+            for column, value in zip(columns, (bid, tricks, round_num, bonus, penalty, loot)):
+                column.append(value)
+    offsets.append(len(columns[0]))
+
+    scores = {rules.name: calculate_round_scores(*columns, rules=rules) for rules in [baseline] + variants}
+    partial = _empty_summary(baseline, variants)
+    deltas = []
+    for i, (game_id, rows) in enumerate(chunk):
+        if not rows:
+            partial['skipped'] += 1
+            continue
+        start = offsets[i]
+        before = _totals(rows, scores[baseline.name][start:offsets[i + 1]])
+        winners_before = _winners(before)
+        partial['games'] += 1
+        _count_scores(partial['baseline_distribution'], before)
+
+        delta = {'game_id': game_id, 'baseline': {'totals': before, 'winners': winners_before}, 'variants': {}}
+        for rules in variants:
+            after = _totals(rows, scores[rules.name][start:offsets[i + 1]])
+            winners = _winners(after)
+            changed = winners != winners_before
+            delta['variants'][rules.name] = {
+                'totals': after,
+                'delta': {p: after[p] - before[p] for p in after},
+                'winners': winners,
+                'winner_changed': changed,
+            }
+            stats = partial['variants'][rules.name]
+            stats['winner_changes'] += changed
+            for p in after:
+                shift = after[p] - before[p]
+                stats['delta_sum'] += shift
+                stats['max_abs_delta'] = max(stats['max_abs_delta'], abs(shift))
+            stats['player_games'] += len(after)
+            _count_scores(stats['score_distribution'], after)
+        deltas.append(delta)
+    return deltas, partial
+
+
+def _totals(rows, scores) -> dict:
+    totals = {}
+    for row, score in zip(rows, scores):
+        totals[row[0]] = totals.get(row[0], 0) + score
+    return totals
+
+
+def _winners(totals: dict) -> list:
+    best = max(totals.values())
+    return sorted(p for p, total in totals.items() if total == best)
+
+
+def _count_scores(histogram: dict, totals: dict):
+    for total in totals.values():
+        bucket = total // SCORE_BUCKET * SCORE_BUCKET
+        histogram[bucket] = histogram.get(bucket, 0) + 1
+
+
+def _empty_summary(baseline: RuleSet, variants: list[RuleSet]) -> dict:
+    return {
+        'baseline': baseline.name,
+        'games': 0,
+        'skipped': 0,  # games without any results yet
+        'baseline_distribution': {},
+        'variants': {
+            rules.name: {'winner_changes': 0, 'player_games': 0, 'delta_sum': 0, 'max_abs_delta': 0,
+                         'score_distribution': {}}
+            for rules in variants
+        },
+    }
+
+
+def _merge(summary: dict, partial: dict):
+    summary['games'] += partial['games']
+    summary['skipped'] += partial['skipped']
+    _merge_counts(summary['baseline_distribution'], partial['baseline_distribution'])
+    for name, stats in partial['variants'].items():
+        total = summary['variants'][name]
+        for key in ('winner_changes', 'player_games', 'delta_sum'):
+            total[key] += stats[key]
+        total['max_abs_delta'] = max(total['max_abs_delta'], stats['max_abs_delta'])
+        _merge_counts(total['score_distribution'], stats['score_distribution'])
+
+
+def _merge_counts(into: dict, counts: dict):
+    for bucket, count in counts.items():
+        into[bucket] = into.get(bucket, 0) + count
+
+
+def _finish(summary: dict) -> dict:
+    """Add the rates and means, and sort the histograms by bucket."""
+    games = summary['games']
+    summary['baseline_distribution'] = dict(sorted(summary['baseline_distribution'].items()))
+    for stats in summary['variants'].values():
+        stats['winner_change_rate'] = round(stats['winner_changes'] / games, 4) if games else 0
+        stats['mean_delta'] = round(stats['delta_sum'] / stats['player_games'], 2) if stats['player_games'] else 0
+        stats['score_distribution'] = dict(sorted(stats['score_distribution'].items()))
+    return summary
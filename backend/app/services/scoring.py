@@ -1,3 +1,27 @@
+from collections.abc import Sized
+from itertools import repeat
+from app.models.rules import RuleSet, PenaltyRule
+
+STANDARD_RULES = RuleSet()
+
+# Variants discussed in calculate_round_score, for comparing outcomes
+RULE_SETS = {
+    rules.name: rules for rules in (
+        STANDARD_RULES,
+        RuleSet(name="bonus_on_failure", bonus_on_failure=True),
+        RuleSet(name="loot_always_counts", loot_always_counts=True),
+        RuleSet(name="zero_bid_penalties", penalties=PenaltyRule.ZERO_BID),
+        RuleSet(name="rascal", rascal=True),
+    )
+}
+
+
+def get_rule_set(name: str) -> RuleSet:
+    if name not in RULE_SETS:
+        raise ValueError(f"Unknown rule set '{name}', expected one of {sorted(RULE_SETS)}")
+    return RULE_SETS[name]
+
+
 def calculate_round_score(
     bid: int,
     tricks_won: int,
@@ -69,3 +93,123 @@ def calculate_round_score(
     # Penalties (like capturing a Pirate with a 0 bid) are different.
     
     return score
+
+
+def calculate_round_scores(
+    bids,
+    tricks_won,
+    round_nums,
+    bonus_points=None,
+    penalty_points=None,
+    loot_points=None,
+    rules: RuleSet = None
+) -> list[int]:
+    """
+    Calculate scores for many players in one pass.
+
+    Takes columnar sequences of equal length, one entry per player-round, so a
+    single round, a whole game or many games can be scored by flattening them
+    into the same columns. `round_nums` may be a single int when every entry
+    belongs to the same round, and omitted bonus/penalty columns count as 0.
+    Results always match `calculate_round_score`, which stays the reference.
+
+    With `rules`, scores follow that variant instead; `loot_points` (the
+    part of each bonus that is loot) only matters to variants that treat
+    loot differently.
+    """
+    if isinstance(round_nums, int):
+        round_nums = repeat(round_nums)
+    if bonus_points is None:
+        bonus_points = repeat(0)
+    if penalty_points is None:
+        penalty_points = repeat(0)
+    _check_lengths(bids, tricks_won, round_nums, bonus_points, penalty_points, loot_points)
+    if rules is not None and rules != STANDARD_RULES:
+        return _variant_scores(bids, tricks_won, round_nums, bonus_points, penalty_points,
+                               repeat(0) if loot_points is None else loot_points, rules)
+
+    # Same rules as calculate_round_score, folded into one expression:
+    # bonuses only count on a made non-zero bid, penalties always apply.
+    return [
+        (
+            (r * 10 if t == 0 else -(r * 10))
+            if b == 0
+            else (b * 20 + bonus if b == t else -(abs(b - t) * 10))
+        ) - penalty
+        for b, t, r, bonus, penalty in zip(bids, tricks_won, round_nums, bonus_points, penalty_points)
+    ]
+
+
+def _check_lengths(*columns):
+    # zip() stops at the shortest column, which would silently drop rows
+    # (zip(strict=True) needs Python 3.10; Lambda runs 3.9)
+    lengths = {len(column) for column in columns if isinstance(column, Sized)}
+    if len(lengths) > 1:
+        raise ValueError(f"Score columns differ in length: {sorted(lengths)}")
+
+
+def _variant_scores(bids, tricks_won, round_nums, bonus_points, penalty_points, loot_points, rules: RuleSet):
+    scores = []
+    for b, t, r, bonus, penalty, loot in zip(bids, tricks_won, round_nums, bonus_points, penalty_points, loot_points):
+        made = b == t
+        if rules.rascal:
+            score = r * 10 if made else (r * 5 if abs(b - t) == 1 else 0)
+        elif b == 0:
+            score = r * 10 if made else -(r * 10)
+        else:
+            score = b * 20 if made else -(abs(b - t) * 10)
+
+        if (made and (b > 0 or rules.rascal)) or (not made and rules.bonus_on_failure):
+            score += bonus
+        elif rules.loot_always_counts:
+            score += loot
+
+        if rules.penalties == PenaltyRule.ALWAYS or (
+            made if rules.penalties == PenaltyRule.MADE_BID else b == 0
+        ):
+            score -= penalty
+        scores.append(score)
+    return scores
+
+
+def calculate_game_scores(games, rules: RuleSet = None) -> list[dict[int, dict[str, int]]]:
+    """
+    Re-score every recorded result of one or more games in a single batch,
+    under the standard rules or the given variant.
+
+    Returns, per game, {round_num: {player_name: round_score}}.
+    """
+    games = list(games)
+    keys = []
+    bids, tricks, rounds, bonuses, penalties = [], [], [], [], []
+    # Only variants that treat loot separately need it split out
+    loot = [] if rules is not None and rules.loot_always_counts else None
+    for game_idx, game in enumerate(games):
+        for r in game.rounds:
+            for player_name, res in r.results.items():
+                keys.append((game_idx, r.round_num, player_name))
+                bids.append(res.bid)
+                tricks.append(res.tricks_won)
+                rounds.append(r.round_num)
+                bonuses.append(res.bonus_points)
+                penalties.append(res.penalty_points)
+                if loot is not None:
+                    loot.append(res.loot_bonus)
+
+    scores = calculate_round_scores(bids, tricks, rounds, bonuses, penalties, loot, rules)
+
+    output = [{} for _ in range(len(games))]
+    for (game_idx, round_num, player_name), score in zip(keys, scores):
+        output[game_idx].setdefault(round_num, {})[player_name] = score
+    return output
+
+
+def rank_players(totals: dict[str, int]) -> dict[str, int]:
+    """
+    Rank players by total score, highest first. Tied players share a rank
+    and the next rank is skipped (1, 1, 3).
+    """
+    first_position = {}
+    for position, score in enumerate(sorted(totals.values(), reverse=True), start=1):
+        first_position.setdefault(score, position)
+    return {player: first_position[score] for player, score in totals.items()}
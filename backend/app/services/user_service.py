@@ -1,18 +1,20 @@
 from app.repositories.user_repository import UserRepository
-from app.models.user import UserStats
+from app.models.user import UserStats, LeaderboardMetric, LeaderboardPage
 
 class UserService:
-    def __init__(self):
-        self.repo = UserRepository()
+    def __init__(self, repo: UserRepository = None):
+        self.repo = repo or UserRepository()
 
     def get_user_stats(self, username: str) -> UserStats:
         return self.repo.get_user_stats(username)
 
     def update_stats_after_game(self, username: str, score: int, won: bool):
-        stats = self.repo.get_user_stats(username)
-        stats.games_played += 1
-        if won:
-            stats.total_wins += 1
-        if score > stats.high_score:
-            stats.high_score = score
-        self.repo.update_user_stats(stats)
+        self.record_game_results([(username, score, won)])
+
+    def record_game_results(self, results: list[tuple[str, int, bool]], game_id: str = None):
+        # (username, score, won) for every player of one finished game; counted once per game_id
+        self.repo.record_game_results(results, game_id)
+
+    def get_leaderboard(self, metric: LeaderboardMetric, limit: int = 20, cursor: str = None) -> LeaderboardPage:
+        entries, next_cursor = self.repo.get_leaderboard(metric, limit, cursor)
+        return LeaderboardPage(metric=metric, entries=entries, next_cursor=next_cursor)
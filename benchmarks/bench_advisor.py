@@ -0,0 +1,50 @@
+"""
+Latency of the bid advisor on random hands (cache disabled), against the
+configured time budget, plus how many deals fit in that budget.
+
+Run from the repository root:
+    python benchmarks/bench_advisor.py [requests] [num_players] [workers]
+"""
+import sys
+import os
+import random
+import time
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from app.core.config import settings
+from app.services import deck
+from app.services.bid_advisor import BidAdvisor, close_advisor_pool
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    num_players = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else settings.ADVISOR_WORKERS
+    rng = random.Random(5)
+    advisor = BidAdvisor(workers=workers, cache_size=0)
+
+    print(f"{requests} requests, {num_players} players, workers={workers}, "
+          f"budget {settings.ADVISOR_TIME_BUDGET * 1000:.0f} ms, up to {advisor.simulations} deals")
+    print(f"{'round':>5} {'p50 ms':>8} {'p95 ms':>8} {'deals':>7}")
+    for round_num in (1, 5, 10):
+        if round_num * num_players > deck.DECK_SIZE:
+            continue
+        latencies, deals = [], []
+        for _ in range(requests):
+            hand = [deck.CARD_NAMES[c] for c in rng.sample(range(deck.DECK_SIZE), round_num)]
+            start = time.perf_counter()
+            advice = advisor.advise(hand, round_num, num_players)
+            latencies.append(time.perf_counter() - start)
+            deals.append(advice.simulations)
+        print(f"{round_num:>5} {percentile(latencies, 0.5) * 1000:>8.1f} {percentile(latencies, 0.95) * 1000:>8.1f} "
+              f"{sum(deals) // len(deals):>7}")
+    close_advisor_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Throughput and peak memory of the NDJSON archive pipeline on a synthetic
+archive (1M completed games by default). Export reads from a repository
+that generates games on the fly and import writes into one that discards
+them, so the numbers cover encoding/parsing and batching only, and a flat
+peak RSS shows neither direction buffers the archive.
+
+Run from the repository root:
+    python benchmarks/bench_archive.py [num_games] [num_players]
+"""
+import sys
+import os
+import resource
+import time
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from synthetic import make_game
+from app.repositories.game_repository import GameRepository
+from app.services.archive_service import ArchiveService
+
+
+class SyntheticRepository(GameRepository):
+    """Yields `num_games` copies of one game on scan and counts what gets put."""
+
+    def __init__(self, num_games: int = 0, num_players: int = 6):
+        super().__init__()
+        self.num_games = num_games
+        self.template = make_game(num_players)
+        self.stored = 0
+
+    def scan_games(self, page_size: int = None):
+        for i in range(self.num_games):
+            yield self.template.copy(update={'game_id': 'bench-%d' % i})
+
+    def put_games(self, games):
+        self.stored += len(games)
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def bench(num_games: int = 1_000_000, num_players: int = 6):
+    print(f"{num_games} games, {num_players} players, 10 rounds each")
+    print(f"  baseline peak RSS {peak_rss_mb():.0f} MB")
+
+    exporter = ArchiveService(SyntheticRepository(num_games, num_players))
+    size = 0
+    start = time.perf_counter()
+    for line in exporter.export_games():
+        size += len(line)
+    elapsed = time.perf_counter() - start
+    print(f"  export {num_games / elapsed:9.0f} games/s  {size / elapsed / 1e6:6.1f} MB/s  "
+          f"archive {size / 1e6:.0f} MB  peak RSS {peak_rss_mb():.0f} MB")
+
+    # Re-generate the lines instead of keeping them, as reading a file would
+    importer = ArchiveService(SyntheticRepository())
+    start = time.perf_counter()
+    imported = importer.import_games(exporter.export_games())
+    elapsed = time.perf_counter() - start
+    assert imported == importer.repo.stored == num_games
+    print(f"  export+import {num_games / elapsed:9.0f} games/s  peak RSS {peak_rss_mb():.0f} MB")
+
+
+if __name__ == "__main__":
+    bench(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 6,
+    )
@@ -0,0 +1,66 @@
+"""
+Encode/decode cost and item size of each game codec, on completed 10-round
+games. Items go through boto3's type (de)serializer, so reads see Decimals
+and Binary values exactly as they come back from DynamoDB.
+
+Run from the repository root:
+    python benchmarks/bench_codec.py [num_players] [iterations]
+"""
+import sys
+import os
+import time
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from boto3.dynamodb.types import TypeSerializer, TypeDeserializer
+
+from app.db.codec import CODECS, get_codec
+from synthetic import make_game
+
+
+def item_size(value) -> int:
+    # Approximates DynamoDB's item size accounting, which is what capacity is billed on
+    if isinstance(value, dict):
+        return 3 + sum(len(k.encode("utf-8")) + 1 + item_size(v) for k, v in value.items())
+    if isinstance(value, list):
+        return 3 + sum(1 + item_size(v) for v in value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, bool):
+        return 1
+    return 1 + (len(str(abs(value))) + 1) // 2
+
+
+def bench(num_players: int = 6, iterations: int = 2000):
+    serializer, deserializer = TypeSerializer(), TypeDeserializer()
+    game = make_game(num_players)
+    print(f"{num_players} players, 10 rounds, {iterations} iterations")
+    for name in sorted(CODECS):
+        codec = get_codec(name)
+        encoded = codec.encode_game(game)
+        # Top-level attributes don't carry the map overhead
+        size = item_size(encoded) - 3
+        wire = {k: serializer.serialize(v) for k, v in encoded.items()}
+        item = {k: deserializer.deserialize(v) for k, v in wire.items()}
+        assert codec.decode_game(item) == game
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            codec.encode_game(game)
+        encode_time = (time.perf_counter() - start) / iterations
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            codec.decode_game(item)
+        decode_time = (time.perf_counter() - start) / iterations
+
+        print(f"  {name:7s} encode {encode_time * 1e6:8.1f} us  decode {decode_time * 1e6:8.1f} us  "
+              f"item {size:6d} bytes")
+
+
+if __name__ == "__main__":
+    bench(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 6,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 2000,
+    )
@@ -0,0 +1,80 @@
+"""
+Cold-start cost of the Lambda entry point: time to import app.main plus the
+latency of the first requests, each measured in a fresh interpreter.
+
+Run from the repository root:
+    python benchmarks/bench_cold_start.py [runs] [--json]
+
+The backend honours the usual settings environment (USE_DYNAMODB,
+DYNAMODB_TABLE, PRELOAD_DYNAMODB, ...), so the same script can be pointed
+at a real table. Use --json to emit one machine-readable line per release.
+"""
+import sys
+import os
+import json
+import statistics
+import subprocess
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+
+CHILD = r'''
+import json, sys, time
+
+def event(method, path):
+    return {
+        "resource": "/{proxy+}", "path": path, "httpMethod": method,
+        "headers": {"Host": "localhost"}, "multiValueHeaders": {},
+        "queryStringParameters": None, "multiValueQueryStringParameters": None,
+        "pathParameters": {"proxy": path.lstrip("/")}, "stageVariables": None,
+        "requestContext": {"resourcePath": "/{proxy+}", "httpMethod": method, "path": path,
+                           "stage": "Prod", "identity": {"sourceIp": "127.0.0.1"}},
+        "body": None, "isBase64Encoded": False,
+    }
+
+start = time.perf_counter()
+import app.main
+import_time = time.perf_counter() - start
+loaded = {m: m in sys.modules for m in ("boto3", "botocore", "mangum")}
+
+start = time.perf_counter()
+app.main.handler(event("GET", "/health"), None)
+first_request = time.perf_counter() - start
+
+start = time.perf_counter()
+app.main.handler(event("GET", "/api/games/does-not-exist"), None)
+first_game_request = time.perf_counter() - start
+
+print(json.dumps({"import": import_time, "first_request": first_request,
+                  "first_game_request": first_game_request, "loaded_at_import": loaded}))
+'''
+
+
+def run_once():
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD], cwd=BACKEND_DIR, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def bench(runs: int = 10, as_json: bool = False):
+    samples = [run_once() for _ in range(runs)]
+    summary = {
+        key: round(statistics.median(s[key] for s in samples) * 1000, 2)
+        for key in ("import", "first_request", "first_game_request")
+    }
+    summary["runs"] = runs
+    summary["loaded_at_import"] = samples[-1]["loaded_at_import"]
+
+    if as_json:
+        print(json.dumps(summary))
+        return
+    print(f"median of {runs} fresh interpreters")
+    print(f"import app.main:        {summary['import']:8.2f} ms")
+    print(f"first request (health): {summary['first_request']:8.2f} ms")
+    print(f"first game request:     {summary['first_game_request']:8.2f} ms")
+    print(f"loaded at import:       {summary['loaded_at_import']}")
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    bench(int(args[0]) if args else 10, "--json" in sys.argv)
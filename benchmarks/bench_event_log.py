@@ -0,0 +1,93 @@
+"""
+Event log (GAME_EVENT_LOG) vs. the document model: request bytes and time
+per write (including the read each write starts with, and any snapshot),
+and get_game time, over a 10-round game on moto's DynamoDB.
+
+Run from the repository root:
+    python benchmarks/bench_event_log.py [num_players] [snapshot_interval]
+
+moto runs in-process, so times show relative client-side cost, not AWS
+latency; request bytes carry over directly.
+"""
+import sys
+import os
+import random
+import time
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+
+import boto3
+from moto import mock_aws
+
+from app.core.config import settings
+from app.db.dynamodb import get_dynamodb_resource, reset_dynamodb
+from app.repositories.event_repository import EventLogGameRepository
+from app.repositories.game_repository import GameRepository
+from app.services.game_service import GameService
+from bench_partial_updates import FullRewriteRepository
+from conftest import create_events_table, create_users_table
+from synthetic import round_inputs
+
+
+def play(service, players, rounds, sent):
+    game_id = service.create_game(players).game_id
+    write_bytes, write_times, read_times = [], [], []
+    for round_num, bids, results in rounds:
+        for action, args in (("start", ()), ("bids", (bids,)), ("results", (results,))):
+            method = {"start": service.start_round, "bids": service.submit_bids, "results": service.submit_results}[action]
+            before = sum(sent)
+            start = time.perf_counter()
+            method(game_id, round_num, *args)
+            write_times.append(time.perf_counter() - start)
+            write_bytes.append(sum(sent) - before)
+
+            start = time.perf_counter()
+            service.get_game(game_id)
+            read_times.append(time.perf_counter() - start)
+    return write_bytes, write_times, read_times
+
+
+def main():
+    num_players = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    settings.GAME_SNAPSHOT_INTERVAL = int(sys.argv[2]) if len(sys.argv) > 2 else settings.GAME_SNAPSHOT_INTERVAL
+    settings.USE_DYNAMODB = True
+    settings.METRICS_ENABLED = False
+    players = ["Player %d" % i for i in range(num_players)]
+    rounds = round_inputs(random.Random(1), players)
+
+    reset_dynamodb()
+    with mock_aws():
+        dynamodb = boto3.resource("dynamodb", region_name=settings.AWS_REGION)
+        dynamodb.create_table(
+            TableName=settings.DYNAMODB_TABLE,
+            KeySchema=[{"AttributeName": "game_id", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "game_id", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        create_users_table(dynamodb, settings.DYNAMODB_USERS_TABLE)
+        create_events_table(dynamodb, settings.DYNAMODB_EVENTS_TABLE)
+
+        # Every repository shares one client, so hook it once
+        sent = []
+        get_dynamodb_resource().meta.client.meta.events.register(
+            "request-created.dynamodb.*", lambda request, **kwargs: sent.append(len(request.body or b""))
+        )
+        print(f"{num_players} players, 10 rounds, snapshot every {settings.GAME_SNAPSHOT_INTERVAL} events")
+        print(f"{'model':16s} {'write bytes':>12s} {'p50':>7s} {'max':>7s} {'write ms':>9s} {'get_game ms':>12s}")
+        for label, repo_cls in (("full rewrite", FullRewriteRepository), ("partial update", GameRepository),
+                                ("event log", EventLogGameRepository)):
+            service = GameService(repo=repo_cls())
+            sent.clear()
+            write_bytes, write_times, read_times = play(service, players, rounds, sent)
+            n = len(write_bytes)
+            print(f"{label:16s} {sum(write_bytes) / n:12.0f} {sorted(write_bytes)[n // 2]:7d} {max(write_bytes):7d} "
+                  f"{sum(write_times) / n * 1000:9.2f} {sum(read_times) / n * 1000:12.2f}")
+    reset_dynamodb()
+
+
+if __name__ == "__main__":
+    main()
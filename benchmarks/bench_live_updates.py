@@ -0,0 +1,79 @@
+"""
+Live update fan-out: time from a publish on a writer thread until every
+watcher of the game has the update, and memory per idle watcher, for a
+growing number of watchers in one process.
+
+Run from the repository root:
+    python benchmarks/bench_live_updates.py [updates]
+
+Watchers here are bare subscriptions; real clients add the cost of writing
+each frame to their socket, which the hub leaves to the server.
+"""
+import sys
+import os
+import asyncio
+import threading
+import time
+import tracemalloc
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from app.models.game import GameDiff, GameStatus
+from app.services.live_updates import UpdateHub
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def fan_out(num_watchers: int, updates: int):
+    hub = UpdateHub(heartbeat=60)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    subscriptions = [hub.subscribe("game") for _ in range(num_watchers)]
+    remaining = [num_watchers]
+    done = asyncio.Event()
+
+    async def watch(subscription):
+        async for _ in subscription.frames():
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                done.set()
+
+    tasks = [asyncio.create_task(watch(s)) for s in subscriptions]
+    await asyncio.sleep(0)
+    per_watcher = (tracemalloc.get_traced_memory()[0] - before) / num_watchers
+    tracemalloc.stop()
+
+    diff = GameDiff(game_id="game", version=0, status=GameStatus.ACTIVE, totals={f"Player {i}": 0 for i in range(6)})
+    latencies = []
+    for version in range(1, updates + 1):
+        remaining[0] = num_watchers
+        done.clear()
+        diff.version = version
+        start = time.perf_counter()
+        writer = threading.Thread(target=hub.publish, args=(diff,))
+        writer.start()
+        await done.wait()
+        latencies.append(time.perf_counter() - start)
+        writer.join()
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return latencies, per_watcher
+
+
+def main():
+    updates = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print(f"{updates} updates per row")
+    print(f"{'watchers':>8} {'p50 ms':>8} {'p95 ms':>8} {'us/watcher':>11} {'KB/watcher':>11}")
+    for num_watchers in (10, 100, 1000, 5000):
+        latencies, per_watcher = asyncio.run(fan_out(num_watchers, updates))
+        p50 = percentile(latencies, 0.5)
+        print(f"{num_watchers:8d} {p50 * 1000:8.2f} {percentile(latencies, 0.95) * 1000:8.2f} "
+              f"{p50 / num_watchers * 1e6:11.2f} {per_watcher / 1024:11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Load test of the sync (threadpool) and async (aioboto3) request paths.
+
+Starts uvicorn once per mode and drives it with many concurrent clients, each
+playing rounds on its own game (start, bids, results, then spectator GETs).
+DynamoDB is a moto server started here unless --endpoint-url points at
+another stand-in such as DynamoDB Local; --memory uses the in-memory store.
+
+Run from the repository root:
+    python benchmarks/bench_load.py [--concurrency 200] [--duration 10]
+                                    [--endpoint-url URL | --memory]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import random
+import socket
+import statistics
+import subprocess
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+TABLE_NAME = "skull_king_load_test"
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def create_table(endpoint_url: str):
+    import boto3
+    dynamodb = boto3.resource("dynamodb", region_name="us-east-1", endpoint_url=endpoint_url)
+    if TABLE_NAME not in [t.name for t in dynamodb.tables.all()]:
+        dynamodb.create_table(
+            TableName=TABLE_NAME,
+            KeySchema=[{"AttributeName": "game_id", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "game_id", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+
+
+def start_api(async_mode: bool, endpoint_url: str, port: int):
+    env = dict(
+        os.environ,
+        ASYNC_ENDPOINTS=str(async_mode),
+        USE_DYNAMODB=str(endpoint_url is not None),
+        DYNAMODB_ENDPOINT_URL=endpoint_url or "",
+        DYNAMODB_TABLE=TABLE_NAME,
+        AWS_ACCESS_KEY_ID=os.environ.get("AWS_ACCESS_KEY_ID", "testing"),
+        AWS_SECRET_ACCESS_KEY=os.environ.get("AWS_SECRET_ACCESS_KEY", "testing"),
+    )
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    deadline = time.time() + 15
+    while time.time() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/health")
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("API did not start")
+
+
+async def player(client: httpx.AsyncClient, stop_at: float, latencies: list, seed: int):
+    rng = random.Random(seed)
+    players = ["P%d" % i for i in range(rng.randint(2, 8))]
+
+    async def call(method, url, **kwargs):
+        start = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        latencies.append(time.perf_counter() - start)
+        response.raise_for_status()
+        return response.json()
+
+    while time.time() < stop_at:
+        game = await call("POST", "/api/games/", json={"players": players})
+        game_id = game["game_id"]
+        for round_num in range(1, 11):
+            if time.time() >= stop_at:
+                return
+            await call("POST", f"/api/games/{game_id}/rounds/{round_num}/start")
+            await call("POST", f"/api/games/{game_id}/rounds/{round_num}/bids",
+                       json={p: rng.randint(0, round_num) for p in players})
+            await call("POST", f"/api/games/{game_id}/rounds/{round_num}/results",
+                       json={p: {"tricks_won": rng.randint(0, round_num)} for p in players})
+            for _ in range(3):
+                await call("GET", f"/api/games/{game_id}")
+
+
+async def drive(port: int, concurrency: int, duration: float) -> dict:
+    latencies = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60) as client:
+        start = time.time()
+        await asyncio.gather(*(player(client, start + duration, latencies, i) for i in range(concurrency)))
+        elapsed = time.time() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--endpoint-url")
+    parser.add_argument("--memory", action="store_true")
+    args = parser.parse_args()
+
+    moto = None
+    endpoint_url = args.endpoint_url
+    if not args.memory and not endpoint_url:
+        import logging
+        from moto.server import ThreadedMotoServer
+        logging.getLogger("werkzeug").setLevel(logging.ERROR)
+        moto = ThreadedMotoServer(port=free_port())
+        moto.start()
+        host, port = moto.get_host_and_port()
+        endpoint_url = f"http://{host}:{port}"
+    if endpoint_url:
+        os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+        os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+        create_table(endpoint_url)
+
+    try:
+        backend = endpoint_url or "in-memory"
+        print(f"{args.concurrency} concurrent clients, {args.duration:.0f}s per mode, backend: {backend}")
+        for async_mode in (False, True):
+            port = free_port()
+            api = start_api(async_mode, endpoint_url, port)
+            try:
+                result = asyncio.run(drive(port, args.concurrency, args.duration))
+            finally:
+                api.terminate()
+                api.wait()
+            label = "async" if async_mode else "sync"
+            print(f"  {label:5s} {result['rps']:8.1f} req/s  p50 {result['p50_ms']:7.1f} ms  "
+                  f"p95 {result['p95_ms']:7.1f} ms  ({result['requests']} requests)")
+    finally:
+        if moto:
+            moto.stop()
+
+
+if __name__ == "__main__":
+    main()
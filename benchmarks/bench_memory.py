@@ -0,0 +1,60 @@
+"""
+Memory per stored game, as pydantic models (what the in-memory store held
+before) vs. CompactGame, over completed synthetic games of 2-8 players,
+plus what a read and a write of the compact form cost.
+
+Run from the repository root:
+    python benchmarks/bench_memory.py [games]
+
+Games are parsed from JSON first, so player names are separate strings per
+map the way they are when games arrive from the API or DynamoDB.
+"""
+import sys
+import os
+import gc
+import timeit
+import tracemalloc
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.models.compact import CompactGame
+from app.models.game import Game
+from synthetic import make_games
+
+
+def retained(build) -> int:
+    """Bytes still allocated after build() returns, held by what it returned."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return used
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    docs = [game.json() for game in make_games(count)]
+    games = [Game.parse_raw(doc) for doc in docs]
+    player_rounds = sum(len(g.players) * len(g.rounds) for g in games)
+
+    models = retained(lambda: [Game.parse_raw(doc) for doc in docs])
+    compact = retained(lambda: [CompactGame.from_game(g) for g in games])
+    print(f"{count} games, {player_rounds / count:.1f} player-rounds per game on average")
+    print(f"{'form':10s} {'bytes/game':>11s} {'bytes/player-round':>19s}")
+    for label, used in (("pydantic", models), ("compact", compact)):
+        print(f"{label:10s} {used / count:11.0f} {used / player_rounds:19.1f}")
+    print(f"compact uses {compact / models:.1%} of the memory")
+
+    stored = [CompactGame.from_game(g) for g in games]
+    for label, op, items in (("from_game", CompactGame.from_game, games), ("to_game", CompactGame.to_game, stored),
+                             ("copy(deep)", lambda g: g.copy(deep=True), games)):
+        seconds = min(timeit.repeat(lambda: [op(i) for i in items], number=1, repeat=5))
+        print(f"{label:10s} {seconds / count * 1e6:8.1f} us/game")
+
+
+if __name__ == "__main__":
+    main()
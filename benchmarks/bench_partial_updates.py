@@ -0,0 +1,87 @@
+"""
+Bytes sent to DynamoDB per game action: full put_item rewrites vs. partial
+UpdateExpression writes. Runs against moto, so no AWS account is needed.
+
+Run from the repository root:
+    python benchmarks/bench_partial_updates.py [num_players]
+
+Note that DynamoDB bills write capacity on the full item size for both
+operations; what shrinks is request payload, network time and the chance
+of clobbering a concurrent writer.
+"""
+import sys
+import os
+import random
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+
+import boto3
+from moto import mock_aws
+
+from app.core.config import settings
+from app.repositories.game_repository import GameRepository
+from app.services.game_service import GameService
+
+
+class FullRewriteRepository(GameRepository):
+    # The previous behaviour: every action rewrites the whole item
+    def append_round(self, game, new_round):
+        self.update_game(game)
+
+    def update_game_fields(self, game, game_fields=(), round_fields=None):
+        self.update_game(game)
+
+
+def play_game(service, players, rng, sent):
+    game = service.create_game(players)
+    per_action = {"start": [], "bids": [], "results": []}
+    for round_num in range(1, 11):
+        for action in ("start", "bids", "results"):
+            before = sum(sent)
+            if action == "start":
+                service.start_round(game.game_id, round_num)
+            elif action == "bids":
+                service.submit_bids(game.game_id, round_num, {p: rng.randint(0, round_num) for p in players})
+            else:
+                service.submit_results(game.game_id, round_num, {
+                    p: {"tricks_won": rng.randint(0, round_num), "bonus": rng.choice((0, 10, 20))}
+                    for p in players
+                })
+            per_action[action].append(sum(sent) - before)
+    return per_action
+
+
+def bench(num_players: int = 6):
+    settings.USE_DYNAMODB = True
+    players = ["Player %d" % i for i in range(num_players)]
+    with mock_aws():
+        dynamodb = boto3.resource("dynamodb", region_name=settings.AWS_REGION)
+        dynamodb.create_table(
+            TableName=settings.DYNAMODB_TABLE,
+            KeySchema=[{"AttributeName": "game_id", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "game_id", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+
+        for label, repo_cls in (("full put_item", FullRewriteRepository), ("partial update", GameRepository)):
+            service = GameService()
+            service.repo = repo_cls()
+            sent = []
+            client = service.repo.table.meta.client
+            client.meta.events.register(
+                "request-created.dynamodb.*",
+                lambda request, **kwargs: sent.append(len(request.body or b""))
+            )
+            per_action = play_game(service, players, random.Random(1), sent)
+
+            print(f"{label} ({num_players} players, 10 rounds)")
+            for action, sizes in per_action.items():
+                print(f"  {action:8s} avg {sum(sizes) / len(sizes):8.0f} bytes  round 10: {sizes[-1]:6d} bytes")
+            total = sum(sum(sizes) for sizes in per_action.values())
+            print(f"  total    {total} bytes")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 6)
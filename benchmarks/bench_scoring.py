@@ -0,0 +1,53 @@
+"""
+Throughput of the scalar scoring loop vs. the batch scorer.
+
+Run from the repository root:
+    python benchmarks/bench_scoring.py [num_games]
+"""
+import sys
+import os
+import random
+import time
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from app.services.scoring import calculate_round_score, calculate_round_scores
+
+
+def make_columns(num_games: int, seed: int = 42):
+    # 10 rounds per game, 2-8 players per game
+    rng = random.Random(seed)
+    bids, tricks, rounds, bonuses, penalties = [], [], [], [], []
+    for _ in range(num_games):
+        num_players = rng.randint(2, 8)
+        for round_num in range(1, 11):
+            for _ in range(num_players):
+                bids.append(rng.randint(0, round_num))
+                tricks.append(rng.randint(0, round_num))
+                rounds.append(round_num)
+                bonuses.append(rng.choice((0, 0, 0, 10, 20, 30, 40)))
+                penalties.append(rng.choice((0, 0, 0, 0, 5)))
+    return bids, tricks, rounds, bonuses, penalties
+
+
+def bench(num_games: int = 10000):
+    columns = make_columns(num_games)
+    n = len(columns[0])
+
+    start = time.perf_counter()
+    scalar = [calculate_round_score(*row) for row in zip(*columns)]
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = calculate_round_scores(*columns)
+    batch_time = time.perf_counter() - start
+
+    assert scalar == batch, "batch scores differ from scalar reference"
+
+    print(f"{num_games} games, {n} player-rounds")
+    print(f"scalar: {scalar_time:.4f}s ({n / scalar_time:,.0f} scores/s)")
+    print(f"batch:  {batch_time:.4f}s ({n / batch_time:,.0f} scores/s)")
+    print(f"speedup: {scalar_time / batch_time:.2f}x")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
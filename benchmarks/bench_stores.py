@@ -0,0 +1,164 @@
+"""
+Throughput of the game service on each storage backend: the lock-striped
+in-memory store, the SQLite file and DynamoDB (moto, in process), with
+several threads playing at once as FastAPI's threadpool would.
+
+Each thread plays whole games (create, then start/bids/results for 10
+rounds). With --shared, all threads play rounds on the same few games
+instead, so they queue on those games' locks.
+
+Run from the repository root:
+    python benchmarks/bench_stores.py [--threads 1 4 16] [--games 20] [--shared]
+
+moto serializes requests and adds its own overhead, so its numbers show
+the shape of the DynamoDB path, not AWS latency.
+"""
+import sys
+import os
+import argparse
+import contextlib
+import random
+import tempfile
+import threading
+import time
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+
+from app.core.config import settings
+from app.db.dynamodb import reset_dynamodb
+from app.db.sqlite import reset_sqlite
+from app.repositories.game_repository import VersionConflictError
+from app.services.game_service import GameService
+from synthetic import random_players, round_inputs
+
+BACKENDS = ("memory", "sqlite", "dynamodb")
+
+
+@contextlib.contextmanager
+def backend(name: str):
+    """Settings (and tables or files) for `name`; yields False if it can't run here."""
+    saved = (settings.USE_DYNAMODB, settings.LOCAL_STORE, settings.SQLITE_PATH)
+    try:
+        if name == "dynamodb":
+            try:
+                import boto3
+                from moto import mock_aws
+            except ImportError:
+                yield False
+                return
+            settings.USE_DYNAMODB = True
+            reset_dynamodb()
+            with mock_aws():
+                dynamodb = boto3.resource("dynamodb", region_name=settings.AWS_REGION)
+                for table, key in ((settings.DYNAMODB_TABLE, "game_id"), (settings.DYNAMODB_USERS_TABLE, "username")):
+                    dynamodb.create_table(
+                        TableName=table,
+                        KeySchema=[{"AttributeName": key, "KeyType": "HASH"}],
+                        AttributeDefinitions=[{"AttributeName": key, "AttributeType": "S"}],
+                        BillingMode="PAY_PER_REQUEST",
+                    )
+                yield True
+            reset_dynamodb()
+            return
+        settings.USE_DYNAMODB = False
+        settings.LOCAL_STORE = name
+        with tempfile.TemporaryDirectory() as tmp:
+            settings.SQLITE_PATH = os.path.join(tmp, "bench.db")
+            yield True
+            reset_sqlite()
+    finally:
+        settings.USE_DYNAMODB, settings.LOCAL_STORE, settings.SQLITE_PATH = saved
+
+
+def play_games(service, seed: int, games: int) -> int:
+    rng = random.Random(seed)
+    ops = 0
+    for _ in range(games):
+        players = random_players(rng)
+        game_id = service.create_game(players).game_id
+        for round_num, bids, results in round_inputs(rng, players):
+            service.start_round(game_id, round_num)
+            service.submit_bids(game_id, round_num, bids)
+            service.submit_results(game_id, round_num, results)
+        ops += 31
+    return ops
+
+
+def play_shared(service, game_ids: list, seed: int, games: int) -> tuple[int, int]:
+    # Rescore random rounds of shared games; every write is a read-modify-write of a contended game
+    rng = random.Random(seed)
+    ops = conflicts = 0
+    for _ in range(games * 10):
+        game_id = rng.choice(game_ids)
+        game = service.get_game(game_id)
+        round_num = rng.randint(1, 10)
+        results = {p: {"tricks_won": rng.randint(0, round_num)} for p in game.players}
+        try:
+            service.submit_results(game_id, round_num, results)
+        except VersionConflictError:
+            # Only DynamoDB can lose the race; the local stores queue on the game's lock
+            conflicts += 1
+        ops += 2
+    return ops, conflicts
+
+
+def run(name: str, threads: int, games: int, shared: bool):
+    service = GameService()
+    game_ids = []
+    if shared:
+        rng = random.Random(0)
+        for _ in range(4):
+            players = random_players(rng)
+            game_ids.append(service.create_game(players).game_id)
+            for round_num in range(1, 11):
+                service.start_round(game_ids[-1], round_num)
+    counts = [None] * threads
+    errors = []
+
+    def worker(i):
+        try:
+            counts[i] = play_shared(service, game_ids, i, games) if shared else (play_games(service, i, games), 0)
+        except Exception as e:  # re-raised below; a thread's exception is otherwise only printed
+            errors.append(e)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+    if errors:
+        raise errors[0]
+    ops = sum(c[0] for c in counts)
+    conflicts = sum(c[1] for c in counts)
+    return ops / elapsed, conflicts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--games", type=int, default=20, help="games played per thread")
+    parser.add_argument("--shared", action="store_true", help="all threads write the same few games")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    args = parser.parse_args(argv)
+
+    print(f"{'backend':10s}" + "".join(f"{t:>10d} thr" for t in args.threads) + "   (service ops/s)")
+    for name in args.backends:
+        row = []
+        for threads in args.threads:
+            with backend(name) as available:
+                if not available:
+                    break
+                rate, conflicts = run(name, threads, args.games, args.shared)
+                row.append(f"{rate:10.0f}" + ("*" if conflicts else " ") + "   ")
+        print(f"{name:10s}" + ("".join(row) if row else "  skipped (moto not installed)"))
+    if args.shared:
+        print("* some writes lost the race with a VersionConflictError (409 to the client)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+"""
+Benchmark suite for scoring, the game service, model/codec serialization,
+the bid advisor's simulation and GameRepository (in memory and on moto's DynamoDB), over synthetic games
+of 2-8 players. Each case is timed with timeit (best of several repeats) and
+reported in microseconds per operation.
+
+Run from the repository root:
+    python benchmarks/suite.py                   # compare against benchmarks/baseline.json
+    python benchmarks/suite.py --save            # record a new baseline
+    python benchmarks/suite.py -k repo --threshold 0.5
+
+Exits with status 1 if any case is more than --threshold (default 25%)
+slower than the baseline. Baselines are machine specific: record one on
+the machine (or CI runner) that does the comparing.
+"""
+import sys
+import os
+import argparse
+import contextlib
+import json
+import platform
+import random
+import time
+import timeit
+from datetime import datetime, timedelta
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+
+from app.core.config import settings
+from app.db.codec import CODECS, get_codec
+from app.db.dynamodb import reset_dynamodb
+from app.models.game import Game, GameBatch
+from app.repositories.event_repository import EventLogGameRepository
+from app.repositories.game_repository import GameRepository
+from app.services import bid_advisor, deck
+from app.services.game_service import GameService
+from app.services.scoring import calculate_round_score, calculate_round_scores, calculate_game_scores
+from synthetic import make_games, random_players, round_inputs
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_THRESHOLD = 0.25
+POOL_SIZE = 20  # distinct synthetic games each case cycles through
+LISTED_GAMES = 20000  # archive size for service.list_games
+
+CASES = {}
+
+
+def case(name, needs_dynamodb=False):
+    """Register `setup() -> op`; the suite times calls of op()."""
+    def register(setup):
+        CASES[name] = (setup, needs_dynamodb)
+        return setup
+    return register
+
+
+def cycle(items):
+    items = list(items)
+    state = {"i": -1}
+
+    def next_item():
+        state["i"] = (state["i"] + 1) % len(items)
+        return items[state["i"]]
+    return next_item
+
+
+# Scoring
+
+@case("scoring.round_score")
+def _round_score():
+    rows = cycle(
+        (r.bids[p], res.tricks_won, r.round_num, res.bonus_points, res.penalty_points)
+        for game in make_games(POOL_SIZE) for r in game.rounds for p, res in r.results.items()
+    )
+    return lambda: calculate_round_score(*rows())
+
+
+@case("scoring.round_scores_batch")
+def _round_scores_batch():
+    # One call per round, as GameService._score_round does it
+    rounds = cycle(
+        ([r.bids[p] for p in r.results], [res.tricks_won for res in r.results.values()], r.round_num,
+         [res.bonus_points for res in r.results.values()], [res.penalty_points for res in r.results.values()])
+        for game in make_games(POOL_SIZE) for r in game.rounds
+    )
+    return lambda: calculate_round_scores(*rounds())
+
+
+@case("scoring.game_scores")
+def _game_scores():
+    games = make_games(POOL_SIZE)
+    return lambda: calculate_game_scores(games)
+
+
+# Game service (in memory)
+
+def _memory_service():
+    with _settings(USE_DYNAMODB=False):
+        return GameService()
+
+
+def _play_games(service):
+    rng = random.Random(7)
+    games = cycle((players, round_inputs(rng, players)) for players in (random_players(rng) for _ in range(POOL_SIZE)))
+
+    def play():
+        players, rounds = games()
+        game_id = service.create_game(players).game_id
+        for round_num, bids, results in rounds:
+            service.start_round(game_id, round_num)
+            service.submit_bids(game_id, round_num, bids)
+            service.submit_results(game_id, round_num, results)
+    return play
+
+
+@case("service.play_game")
+def _play_game():
+    return _play_games(_memory_service())
+
+
+@case("service.play_game_event_log")
+def _play_game_event_log():
+    with _settings(USE_DYNAMODB=False):
+        return _play_games(GameService(repo=EventLogGameRepository()))
+
+
+@case("service.play_game_batched")
+def _play_game_batched():
+    service = _memory_service()
+    rng = random.Random(7)
+    games = cycle((players, round_inputs(rng, players)) for players in (random_players(rng) for _ in range(POOL_SIZE)))
+
+    def play():
+        players, rounds = games()
+        game_id = service.create_game(players).game_id
+        for round_num, bids, results in rounds:
+            service.apply_batch(game_id, GameBatch(operations=[
+                {"op": "start", "round_num": round_num},
+                {"op": "bids", "round_num": round_num, "bids": bids},
+                {"op": "results", "round_num": round_num, "results": results},
+            ]))
+    return play
+
+
+@case("service.get_standings")
+def _get_standings():
+    service = _memory_service()
+    service.repo.put_games(make_games(POOL_SIZE))
+    game_ids = cycle(service.repo.games)
+    return lambda: service.get_standings(game_ids())
+
+
+@case("service.list_games")
+def _list_games():
+    # A page of one player's games out of a large archive; should not grow with it
+    service = _memory_service()
+    rng = random.Random(11)
+    games = [
+        Game(game_id="g%06d" % i, date=(datetime(2024, 1, 1) + timedelta(minutes=i)).isoformat(),
+             status="ACTIVE", players=random_players(rng))
+        for i in range(LISTED_GAMES)
+    ]
+    service.repo.put_games(games)
+    players = cycle(game.players[0] for game in games[:POOL_SIZE])
+    return lambda: service.list_games(player=players(), limit=20)
+
+
+# Bid advisor
+
+@case("advisor.simulate_deal")
+def _simulate_deal():
+    # One simulated deal of a 10-card round at 4 players, every bid scored
+    rng = random.Random(3)
+    hand = rng.sample(range(deck.DECK_SIZE), 10)
+    unseen = [c for c in range(deck.DECK_SIZE) if c not in hand]
+    return lambda: bid_advisor.simulate_deal(hand, unseen, 10, 4, rng)
+
+
+# Models and codecs
+
+@case("model.game_json")
+def _game_json():
+    games = cycle(make_games(POOL_SIZE))
+    return lambda: games().json()
+
+
+@case("model.game_parse")
+def _game_parse():
+    docs = cycle(game.json() for game in make_games(POOL_SIZE))
+    return lambda: Game.parse_raw(docs())
+
+
+def _codec_cases(name):
+    def encode():
+        codec = get_codec(name)
+        games = cycle(make_games(POOL_SIZE))
+        return lambda: codec.encode_game(games())
+
+    def decode():
+        from boto3.dynamodb.types import TypeSerializer, TypeDeserializer
+        serializer, deserializer = TypeSerializer(), TypeDeserializer()
+        codec = get_codec(name)
+        # Decode what DynamoDB would hand back: Decimals and Binary values
+        items = cycle(
+            {k: deserializer.deserialize(serializer.serialize(v)) for k, v in codec.encode_game(game).items()}
+            for game in make_games(POOL_SIZE)
+        )
+        return lambda: codec.decode_game(items())
+
+    case(f"codec.{name}.encode")(encode)
+    case(f"codec.{name}.decode")(decode)
+
+
+for _name in sorted(CODECS):
+    _codec_cases(_name)
+
+
+# Repository
+
+def _repo_cases(backend):
+    dynamodb = backend == "dynamodb"
+
+    def repo():
+        with _settings(USE_DYNAMODB=dynamodb):
+            return GameRepository()
+
+    def stored_games(repo):
+        games = make_games(POOL_SIZE)
+        for game in games:
+            game.version = 0
+        # Through the repository's own write path, listings and all
+        repo.put_games(games)
+        return games
+
+    @case(f"repo.{backend}.create_game", needs_dynamodb=dynamodb)
+    def create_game():
+        r = repo()
+        players = cycle(random_players(random.Random(i)) for i in range(POOL_SIZE))
+        return lambda: r.create_game(players())
+
+    @case(f"repo.{backend}.get_game", needs_dynamodb=dynamodb)
+    def get_game():
+        r = repo()
+        game_ids = cycle(g.game_id for g in stored_games(r))
+        return lambda: r.get_game(game_ids())
+
+    @case(f"repo.{backend}.get_standings", needs_dynamodb=dynamodb)
+    def get_standings():
+        r = repo()
+        game_ids = cycle(g.game_id for g in stored_games(r))
+        return lambda: r.get_standings(game_ids())
+
+    @case(f"repo.{backend}.update_game", needs_dynamodb=dynamodb)
+    def update_game():
+        r = repo()
+        games = cycle(stored_games(r))
+        return lambda: r.update_game(games())
+
+    @case(f"repo.{backend}.update_round_results", needs_dynamodb=dynamodb)
+    def update_round_results():
+        r = repo()
+        games = cycle(stored_games(r))
+
+        def update():
+            game = games()
+            r.update_game_fields(game, ["totals", "ranks", "status"], {len(game.rounds) - 1: ["results", "totals"]})
+        return update
+
+
+for _backend in ("memory", "dynamodb"):
+    _repo_cases(_backend)
+
+
+# Runner
+
+@contextlib.contextmanager
+def _settings(**overrides):
+    saved = {k: getattr(settings, k) for k in overrides}
+    for k, v in overrides.items():
+        setattr(settings, k, v)
+    try:
+        yield
+    finally:
+        for k, v in saved.items():
+            setattr(settings, k, v)
+
+
+@contextlib.contextmanager
+def _moto_dynamodb():
+    """moto's in-process DynamoDB with the games table, or None without moto."""
+    try:
+        import boto3
+        from moto import mock_aws
+    except ImportError:
+        yield None
+        return
+    reset_dynamodb()
+    with mock_aws():
+        boto3.resource("dynamodb", region_name=settings.AWS_REGION).create_table(
+            TableName=settings.DYNAMODB_TABLE,
+            KeySchema=[{"AttributeName": "game_id", "KeyType": "HASH"}],
+            AttributeDefinitions=[{"AttributeName": "game_id", "AttributeType": "S"}],
+            BillingMode="PAY_PER_REQUEST",
+        )
+        yield True
+    reset_dynamodb()
+
+
+def time_case(op, quick: bool = False, repeat: int = 5) -> float:
+    """Seconds per call of op(): best of `repeat` runs of at least 0.2s each."""
+    if quick:
+        start = time.perf_counter()
+        op()
+        return time.perf_counter() - start
+    timer = timeit.Timer(op)
+    loops, _ = timer.autorange()
+    return min(timer.repeat(repeat, loops)) / loops
+
+
+def run(pattern: str = "", quick: bool = False, log=print) -> dict:
+    """{case name: microseconds per op} for every case whose name contains `pattern`."""
+    results = {}
+    with _moto_dynamodb() as dynamodb:
+        for name, (setup, needs_dynamodb) in CASES.items():
+            if pattern not in name:
+                continue
+            if needs_dynamodb and not dynamodb:
+                log(f"  {name:40s} skipped (moto not installed)")
+                continue
+            results[name] = time_case(setup(), quick) * 1e6
+            log(f"  {name:40s} {results[name]:12.2f} us")
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list[str]:
+    """Names of the cases more than `threshold` slower than their baseline."""
+    return [
+        name for name, us in results.items()
+        if name in baseline and us > baseline[name] * (1 + threshold)
+    ]
+
+
+def load_baseline(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def save_results(path: str, results: dict):
+    doc = {
+        "meta": {
+            "created": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.platform(),
+        },
+        "unit": "us_per_op",
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(doc, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-k", dest="pattern", default="", help="only run cases whose name contains this")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline file to compare against or --save to")
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--output", help="also write the results to this file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown vs. baseline, as a fraction")
+    parser.add_argument("--quick", action="store_true", help="single call per case (smoke test, no timing value)")
+    args = parser.parse_args(argv)
+
+    results = run(args.pattern, args.quick)
+    if args.output:
+        save_results(args.output, results)
+    if args.save:
+        save_results(args.baseline, results)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save to record one")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    print(f"\nvs. baseline (threshold +{args.threshold:.0%}):")
+    for name, us in results.items():
+        if name in baseline:
+            print(f"  {name:40s} {us / baseline[name] - 1:+8.1%}")
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
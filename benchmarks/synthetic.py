@@ -0,0 +1,64 @@
+"""
+Synthetic Skull King games for the benchmarks: 2-8 players, 10 rounds,
+random bids, tricks, bonuses and the occasional penalty, scored with the
+real scoring rules. Everything is seeded, so runs are comparable.
+"""
+import sys
+import os
+import random
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from app.models.game import Game, Round, RoundResult, GameStatus
+from app.services.scoring import calculate_round_score, rank_players
+
+NAMES = ["Anne", "Barbossa", "Calico", "Davy", "Edward", "Flint", "Grace", "Henry"]
+
+
+def random_players(rng: random.Random, num_players: int = None) -> list[str]:
+    num_players = num_players or rng.randint(2, 8)
+    if num_players <= len(NAMES):
+        return rng.sample(NAMES, num_players)
+    return ["Player %d" % i for i in range(num_players)]
+
+
+def round_inputs(rng: random.Random, players: list[str]):
+    """(round_num, bids, results) for rounds 1-10, results in the shape /results takes."""
+    rounds = []
+    for round_num in range(1, 11):
+        bids = {p: rng.randint(0, round_num) for p in players}
+        results = {}
+        for p in players:
+            # Players make their bid more often than not
+            tricks = bids[p] if rng.random() < 0.6 else rng.randint(0, round_num)
+            results[p] = {
+                "tricks_won": tricks,
+                "bonus": rng.choice((0, 0, 0, 10, 20, 30, 40)) if tricks == bids[p] else 0,
+                "penalty": rng.choice((0, 0, 0, 0, 5)),
+            }
+        rounds.append((round_num, bids, results))
+    return rounds
+
+
+def make_game(num_players: int = None, seed: int = 1) -> Game:
+    """A completed game, built directly rather than through the service."""
+    rng = random.Random(seed)
+    players = random_players(rng, num_players)
+    totals = {p: 0 for p in players}
+    rounds = []
+    for round_num, bids, results in round_inputs(rng, players):
+        round_results = {}
+        for p, res in results.items():
+            score = calculate_round_score(bids[p], res["tricks_won"], round_num, res["bonus"], res["penalty"])
+            totals[p] += score
+            round_results[p] = RoundResult(tricks_won=res["tricks_won"], bid=bids[p], bonus_points=res["bonus"],
+                                           penalty_points=res["penalty"], round_score=score,
+                                           potential_bonus=res["bonus"])
+        rounds.append(Round(round_num=round_num, cards_dealt=round_num, bids=bids,
+                            results=round_results, totals=dict(totals)))
+    return Game(game_id="synthetic-%d" % seed, players=players, date="2026-01-01T00:00:00",
+                status=GameStatus.COMPLETED, rounds=rounds, totals=totals,
+                ranks=rank_players(totals), version=31)
+
+
+def make_games(count: int, seed: int = 1) -> list[Game]:
+    return [make_game(seed=seed + i) for i in range(count)]
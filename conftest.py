@@ -0,0 +1,113 @@
+import sys
+import os
+import pytest
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+
+from app.core.config import settings
+from app.db.dynamodb import reset_dynamodb
+from app.repositories.user_repository import LEADERBOARD_FIELDS
+from app.repositories.game_repository import GAME_LISTING_INDEX
+
+
+def create_games_table(dynamodb, table_name):
+    """Games table with the listing GSI from template.yaml."""
+    return dynamodb.create_table(
+        TableName=table_name,
+        KeySchema=[{"AttributeName": "game_id", "KeyType": "HASH"}],
+        AttributeDefinitions=[
+            {"AttributeName": "game_id", "AttributeType": "S"},
+            {"AttributeName": "listing", "AttributeType": "S"},
+            {"AttributeName": "sort_key", "AttributeType": "S"},
+        ],
+        GlobalSecondaryIndexes=[{
+            "IndexName": GAME_LISTING_INDEX,
+            "KeySchema": [
+                {"AttributeName": "listing", "KeyType": "HASH"},
+                {"AttributeName": "sort_key", "KeyType": "RANGE"},
+            ],
+            "Projection": {"ProjectionType": "ALL"},
+        }],
+        BillingMode="PAY_PER_REQUEST",
+    )
+
+
+def create_users_table(dynamodb, table_name):
+    """Users table with the leaderboard GSIs from template.yaml."""
+    fields = sorted(set(LEADERBOARD_FIELDS.values()))
+    return dynamodb.create_table(
+        TableName=table_name,
+        KeySchema=[{"AttributeName": "username", "KeyType": "HASH"}],
+        AttributeDefinitions=[
+            {"AttributeName": "username", "AttributeType": "S"},
+            {"AttributeName": "leaderboard", "AttributeType": "S"},
+        ] + [{"AttributeName": field, "AttributeType": "N"} for field in fields],
+        GlobalSecondaryIndexes=[
+            {
+                "IndexName": f"leaderboard_{field}",
+                "KeySchema": [
+                    {"AttributeName": "leaderboard", "KeyType": "HASH"},
+                    {"AttributeName": field, "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            }
+            for field in fields
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+
+
+def create_events_table(dynamodb, table_name):
+    """Game event log table from template.yaml."""
+    return dynamodb.create_table(
+        TableName=table_name,
+        KeySchema=[
+            {"AttributeName": "game_id", "KeyType": "HASH"},
+            {"AttributeName": "seq", "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "game_id", "AttributeType": "S"},
+            {"AttributeName": "seq", "AttributeType": "N"},
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+
+
+def create_analytics_table(dynamodb, table_name):
+    """Per-player analytics table from template.yaml."""
+    return dynamodb.create_table(
+        TableName=table_name,
+        KeySchema=[{"AttributeName": "username", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "username", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+
+
+def create_idempotency_table(dynamodb, table_name):
+    """Idempotency-Key table from template.yaml."""
+    return dynamodb.create_table(
+        TableName=table_name,
+        KeySchema=[{"AttributeName": "key", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "key", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+
+
+@pytest.fixture
+def dynamodb_table(monkeypatch):
+    """Games, users, events, analytics and idempotency tables in moto's in-process DynamoDB; yields the games table."""
+    moto = pytest.importorskip("moto")
+    import boto3
+
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setattr(settings, "USE_DYNAMODB", True)
+    reset_dynamodb()
+    with moto.mock_aws():
+        dynamodb = boto3.resource("dynamodb", region_name=settings.AWS_REGION)
+        table = create_games_table(dynamodb, settings.DYNAMODB_TABLE)
+        create_users_table(dynamodb, settings.DYNAMODB_USERS_TABLE)
+        create_events_table(dynamodb, settings.DYNAMODB_EVENTS_TABLE)
+        create_analytics_table(dynamodb, settings.DYNAMODB_ANALYTICS_TABLE)
+        create_idempotency_table(dynamodb, settings.DYNAMODB_IDEMPOTENCY_TABLE)
+        yield table
+    reset_dynamodb()
@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useEffect, useState } from 'react';
 import './App.css';
 import { GameSetup } from './components/GameSetup';
 import { RoundInput } from './components/RoundInput';
@@ -12,6 +12,8 @@ interface GameState {
   players: string[];
   rounds: any[];
   status: string;
+  version?: number;
+  totals?: Record<string, number>;
 }
 
 class ErrorBoundary extends React.Component<{ children: React.ReactNode }, { hasError: boolean, error: any }> {
@@ -54,6 +56,17 @@ function GameContainer() {
   const [currentBids, setCurrentBids] = useState<Record<string, number>>({});
   const [view, setView] = useState<'GAME' | 'LEADERBOARD'>('GAME');
 
+  // Keep the scorecard current when the game is also scored from another device
+  const gameId = gameState?.game_id;
+  useEffect(() => {
+    if (!gameId) return;
+    return api.watchGame(
+      gameId,
+      game => setGameState(game),
+      diff => setGameState(game => game && api.applyGameUpdate(game, diff))
+    );
+  }, [gameId]);
+
   const handleStartGame = async (players: string[]) => {
     setLoading(true);
     try {
@@ -89,7 +102,12 @@ function GameContainer() {
     if (!gameState) return;
     setLoading(true);
     try {
-      const updatedGame = await api.submitResults(gameState.game_id, currentRound, results);
+      // Score this round and open the next one in a single round trip
+      const operations: api.GameOperation[] = [{ op: 'results', round_num: currentRound, results }];
+      if (currentRound < 10) {
+        operations.push({ op: 'start', round_num: currentRound + 1 });
+      }
+      const updatedGame = await api.applyBatch(gameState.game_id, operations);
       setGameState(updatedGame);
 
       if (currentRound < 10) {
@@ -97,7 +115,6 @@ function GameContainer() {
         setCurrentRound(nextRound);
         setPhase('BID');
         setCurrentBids({});
-        await api.startRound(gameState.game_id, nextRound);
       } else {
         alert("Game Over! Check the final scores!");
         setPhase('GAME_OVER'); // Custom phase for end
@@ -137,9 +154,10 @@ function GameContainer() {
         });
       }
 
+      // Prefer the running totals maintained by the backend
       return Object.entries(scores).map(([name, data]) => ({
         name,
-        score: data.score,
+        score: gameState.totals?.[name] ?? data.score,
         history: data.history
       }));
     } catch (e) {
@@ -25,7 +25,7 @@ export async function submitBids(gameId: string, roundNum: number, bids: Record<
     return response.json();
 }
 
-export async function submitResults(gameId: string, roundNum: number, results: Record<string, any>) {
+function formatResults(results: Record<string, any>) {
     // results is now { player: { tricks_won: int, bonus: int, penalty: int } }
     // We can pass it directly if the backend expects this format.
     // The backend expects { "PlayerName": { "tricks_won": 1, "bonus_points": 0, ... } }
@@ -50,11 +50,30 @@ export async function submitResults(gameId: string, roundNum: number, results: R
             };
         }
     }
+    return formattedResults;
+}
 
+export async function submitResults(gameId: string, roundNum: number, results: Record<string, any>) {
     const response = await fetch(`${API_BASE}/games/${gameId}/rounds/${roundNum}/results`, {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify(formattedResults),
+        body: JSON.stringify(formatResults(results)),
+    });
+    return response.json();
+}
+
+export type GameOperation =
+    | { op: 'start', round_num: number }
+    | { op: 'bids', round_num: number, bids: Record<string, number> }
+    | { op: 'results', round_num: number, results: Record<string, any> };
+
+// Several start/bids/results steps in one request (one read and one write on the server)
+export async function applyBatch(gameId: string, operations: GameOperation[]) {
+    const body = operations.map(op => op.op === 'results' ? { ...op, results: formatResults(op.results) } : op);
+    const response = await fetch(`${API_BASE}/games/${gameId}/batch`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ operations: body }),
     });
     return response.json();
 }
@@ -63,3 +82,36 @@ export async function getGame(gameId: string) {
     const response = await fetch(`${API_BASE}/games/${gameId}`);
     return response.json();
 }
+
+// Live updates over server-sent events: onGame gets the whole game when the
+// stream (re)starts, onUpdate each write after that. Returns a function that
+// stops watching.
+export function watchGame(gameId: string, onGame: (game: any) => void, onUpdate: (diff: any) => void) {
+    const source = new EventSource(`${API_BASE}/games/${gameId}/updates`);
+    source.addEventListener('game', event => onGame(JSON.parse((event as MessageEvent).data)));
+    source.addEventListener('update', event => onUpdate(JSON.parse((event as MessageEvent).data)));
+    return () => source.close();
+}
+
+// Merge a pushed update (the changed rounds plus totals) into a game
+export function applyGameUpdate(game: any, diff: any) {
+    if (game.version !== undefined && diff.version <= game.version) return game;
+    const rounds = [...(game.rounds || [])];
+    for (const round of diff.rounds) {
+        const idx = rounds.findIndex(r => r.round_num === round.round_num);
+        if (idx === -1) rounds.push(round); else rounds[idx] = round;
+    }
+    return { ...game, version: diff.version, status: diff.status, totals: diff.totals, ranks: diff.ranks, rounds };
+}
+
+export async function getStandings(gameId: string) {
+    const response = await fetch(`${API_BASE}/games/${gameId}/standings`);
+    return response.json();
+}
+
+export async function getLeaderboard(metric = 'wins', limit = 20, cursor?: string) {
+    const params = new URLSearchParams({ metric, limit: String(limit) });
+    if (cursor) params.set('cursor', cursor);
+    const response = await fetch(`${API_BASE}/users/leaderboard?${params}`);
+    return response.json();
+}
@@ -1,30 +1,21 @@
 import { useEffect, useState } from 'react';
-// import * as api from '../api'; // Not used in mock version
+import * as api from '../api';
 
 interface UserStats {
     username: string;
     total_wins: number;
     high_score: number;
     games_played: number;
+    average_score: number;
 }
 
 export function Leaderboard() {
     const [stats, setStats] = useState<UserStats[]>([]);
 
     useEffect(() => {
-        // In a real app, we'd fetch this. For now, we'll mock or fetch if endpoint exists.
-        // The current backend has a user_repository but no public endpoint to list all users easily 
-        // without implementing it. Let's assume we can fetch or just show a placeholder if empty.
-        // Actually, let's implement a fetch if possible, or just mock for the UI demo.
-        // We'll try to fetch from a new endpoint we should probably add, or just use local state for now.
-        // Given the constraints, I'll mock it for the UI to ensure it looks good, 
-        // and we can hook it up to real data if the user asks for persistence.
-
-        setStats([
-            { username: 'Blackbeard', total_wins: 5, high_score: 420, games_played: 12 },
-            { username: 'Anne Bonny', total_wins: 3, high_score: 380, games_played: 10 },
-            { username: 'Calico Jack', total_wins: 2, high_score: 250, games_played: 8 },
-        ]);
+        api.getLeaderboard('wins', 10)
+            .then(page => setStats(page.entries || []))
+            .catch(() => setStats([]));
     }, []);
 
     return (
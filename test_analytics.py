@@ -0,0 +1,120 @@
+import sys
+import os
+import random
+sys.path.append(os.path.join(os.getcwd(), "backend"))
+sys.path.append(os.path.join(os.getcwd(), "benchmarks"))
+
+from synthetic import random_players, round_inputs
+from app import backfill
+from app.models.game import GameBatch
+from app.repositories.analytics_repository import AnalyticsRepository
+from app.services.analytics_service import AnalyticsService
+from app.services.archive_service import ArchiveService
+from app.services.game_service import GameService
+
+
+def _play(service, rng, batched=False):
+    players = random_players(rng, rng.randint(2, 5))
+    game_id = service.create_game(players).game_id
+    for round_num, bids, results in round_inputs(rng, players):
+        if batched:
+            service.apply_batch(game_id, GameBatch(operations=[
+                {"op": "start", "round_num": round_num},
+                {"op": "bids", "round_num": round_num, "bids": bids},
+                {"op": "results", "round_num": round_num, "results": results},
+            ]))
+            continue
+        service.start_round(game_id, round_num)
+        service.submit_bids(game_id, round_num, bids)
+        if round_num == 3:
+            # Scored wrong first, then corrected: only the correction should count
+            service.submit_results(game_id, round_num, {p: {"tricks_won": 0} for p in players})
+        service.submit_results(game_id, round_num, results)
+    return game_id
+
+
+def test_scored_rounds():
+    analytics = AnalyticsService()
+    service = GameService(analytics=analytics)
+    game = service.create_game(["Alice", "Bob"])
+    for round_num, bids, results in (
+        (1, {"Alice": 1, "Bob": 0}, {"Alice": {"tricks_won": 1, "bonus": 30}, "Bob": {"tricks_won": 0}}),
+        (2, {"Alice": 0, "Bob": 2}, {"Alice": {"tricks_won": 1}, "Bob": {"tricks_won": 1}}),
+    ):
+        service.start_round(game.game_id, round_num)
+        service.submit_bids(game.game_id, round_num, bids)
+        service.submit_results(game.game_id, round_num, results)
+
+    alice = analytics.get_analytics("Alice")
+    assert (alice.rounds_played, alice.bid_accuracy) == (2, 0.5)
+    assert (alice.zero_bids, alice.zero_bid_success_rate) == (1, 0)
+    assert alice.average_score_by_round == {1: 50, 2: -20}
+    # 20 for the bid plus 30 bonus
+    assert (alice.bonus_points, alice.bonus_share) == (30, 0.6)
+    assert alice.head_to_head == {}
+    assert analytics.get_analytics("Bob").zero_bid_success_rate == 1
+
+    for round_num in range(3, 11):
+        service.start_round(game.game_id, round_num)
+        service.submit_bids(game.game_id, round_num, {"Alice": 0, "Bob": 0})
+        service.submit_results(game.game_id, round_num, {"Alice": {"tricks_won": 0}, "Bob": {"tricks_won": 1}})
+    record = analytics.get_analytics("Bob").head_to_head["Alice"]
+    assert (record.games, record.wins, record.losses, record.ties) == (1, 0, 1, 0)
+    assert analytics.get_analytics("Alice").head_to_head["Bob"].wins == 1
+
+
+def test_backfill_matches_incremental(tmp_path):
+    rng = random.Random(5)
+    live = AnalyticsService()
+    service = GameService(analytics=live)
+    for i in range(12):
+        _play(service, rng, batched=i % 3 == 0)
+    # An unfinished game counts its rounds but no head-to-head
+    unfinished = service.create_game(["Anne", "Davy"])
+    service.start_round(unfinished.game_id, 1)
+    service.submit_results(unfinished.game_id, 1, {"Anne": {"tricks_won": 1}, "Davy": {"tricks_won": 0}})
+
+    rebuilt = AnalyticsService()
+    summary = rebuilt.backfill(service.repo.scan_games(compact=True), chunk_size=5)
+    assert summary["games"] == 13
+    assert rebuilt.repo.store.counters == live.repo.store.counters
+    for username in live.repo.store.counters:
+        assert rebuilt.get_analytics(username) == live.get_analytics(username)
+
+    parallel = AnalyticsService()
+    parallel.backfill(service.repo.scan_games(), workers=2, chunk_size=5)
+    assert parallel.repo.store.counters == live.repo.store.counters
+
+    # and from an archive, through the command line
+    archive = tmp_path / "games.ndjson"
+    archive.write_text("".join(ArchiveService(service.repo).export_games()))
+    backfill.main(["--input", str(archive)])
+
+
+def test_counters_dynamodb(dynamodb_table):
+    repo = AnalyticsRepository()
+    repo.add_counters({"Alice": {"rounds": 2, "vs#Bob#1#wins": 1}, "Bob": {"rounds": 1}})
+    repo.add_counters({"Alice": {"rounds": -1, "bids_made": 1}})
+    assert repo.get_counters("Alice") == {"rounds": 1, "bids_made": 1, "vs#Bob#1#wins": 1}
+    assert AnalyticsService(repo).get_analytics("Alice").head_to_head == {}
+
+    repo.put_counters({"Bob": {"rounds": 7}})
+    assert repo.get_counters("Bob") == {"rounds": 7}
+    assert repo.get_counters("Nobody") == {}
+
+
+def test_analytics_endpoint():
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    client = TestClient(app)
+    game_id = client.post("/api/games/", json={"players": ["Analyst", "Bob"]}).json()["game_id"]
+    client.post(f"/api/games/{game_id}/rounds/1/start")
+    client.post(f"/api/games/{game_id}/rounds/1/bids", json={"Analyst": 1, "Bob": 0})
+    client.post(f"/api/games/{game_id}/rounds/1/results",
+                json={"Analyst": {"tricks_won": 1}, "Bob": {"tricks_won": 1}})
+    response = client.get("/api/users/Analyst/analytics")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["rounds_played"] == 1 and body["bid_accuracy"] == 1
+    assert body["average_score_by_round"] == {"1": 20.0}
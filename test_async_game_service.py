@@ -0,0 +1,111 @@
+import sys
+import os
+import asyncio
+import pytest
+sys.path.append(os.path.join(os.getcwd(), "backend"))
+
+pytest.importorskip("aioboto3")
+moto_server = pytest.importorskip("moto.server")
+import boto3
+
+from app.core.config import settings
+from app.db.dynamodb import reset_dynamodb, close_async_dynamodb
+from app.repositories.async_game_repository import AsyncGameRepository
+from app.repositories.game_repository import GameRepository, VersionConflictError
+from app.services.async_game_service import AsyncGameService
+from app.services.async_archive_service import AsyncArchiveService
+from app.services.async_analytics_service import AsyncAnalyticsService
+from conftest import create_users_table, create_games_table, create_analytics_table
+
+
+@pytest.fixture(scope="module")
+def moto_endpoint():
+    server = moto_server.ThreadedMotoServer(port=0)
+    server.start()
+    host, port = server.get_host_and_port()
+    yield f"http://{host}:{port}"
+    server.stop()
+
+
+@pytest.fixture
+def dynamodb_table(moto_endpoint, monkeypatch):
+    # aiobotocore can't be intercepted in-process, so talk to a moto server
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setattr(settings, "USE_DYNAMODB", True)
+    monkeypatch.setattr(settings, "DYNAMODB_ENDPOINT_URL", moto_endpoint)
+    monkeypatch.setattr(settings, "DYNAMODB_TABLE", "async_%d" % id(monkeypatch))
+    monkeypatch.setattr(settings, "DYNAMODB_USERS_TABLE", "async_users_%d" % id(monkeypatch))
+    monkeypatch.setattr(settings, "DYNAMODB_ANALYTICS_TABLE", "async_analytics_%d" % id(monkeypatch))
+    reset_dynamodb()
+    dynamodb = boto3.resource("dynamodb", region_name=settings.AWS_REGION, endpoint_url=moto_endpoint)
+    table = create_games_table(dynamodb, settings.DYNAMODB_TABLE)
+    users_table = create_users_table(dynamodb, settings.DYNAMODB_USERS_TABLE)
+    analytics_table = create_analytics_table(dynamodb, settings.DYNAMODB_ANALYTICS_TABLE)
+    yield table
+    table.delete()
+    users_table.delete()
+    analytics_table.delete()
+    reset_dynamodb()
+
+
+def test_async_game_flow_matches_sync_storage(dynamodb_table):
+    async def play():
+        service = AsyncGameService(analytics=AsyncAnalyticsService())
+        game = await service.create_game(["Alice", "Bob"])
+        for round_num in range(1, 11):
+            await service.start_round(game.game_id, round_num)
+            await service.submit_bids(game.game_id, round_num, {"Alice": 1, "Bob": 0})
+            game = await service.submit_results(game.game_id, round_num, {"Alice": {"tricks_won": 1}, "Bob": {"tricks_won": 0}})
+        standings = await service.get_standings(game.game_id)
+        stats = await service.user_service.get_user_stats("Bob")
+        listed = await service.list_games(player="Bob")
+        analytics = await service.analytics.get_analytics("Bob")
+        await close_async_dynamodb()
+        return game, standings, stats, listed, analytics
+
+    game, standings, stats, listed, analytics = asyncio.run(play())
+    assert standings.totals == {"Alice": 200, "Bob": 550}
+    assert [g.game_id for g in listed.games] == [game.game_id]
+    assert (analytics.rounds_played, analytics.zero_bid_success_rate) == (10, 1)
+    assert analytics.head_to_head["Alice"].wins == 1
+    assert (stats.games_played, stats.total_wins) == (1, 1)
+
+    # The sync repository reads exactly what the async one wrote
+    stored = GameRepository().get_game(game.game_id)
+    assert stored == game
+    assert stored.version == 30
+
+
+def test_async_conflict(dynamodb_table):
+    async def race():
+        repo_a, repo_b = AsyncGameRepository(), AsyncGameRepository()
+        game = await repo_a.create_game(["Alice"])
+        device_a = await repo_a.get_game(game.game_id)
+        device_b = await repo_b.get_game(game.game_id)
+        await repo_a.update_game_fields(device_a, ["status"])
+        try:
+            with pytest.raises(VersionConflictError):
+                await repo_b.update_game_fields(device_b, ["status"])
+        finally:
+            await close_async_dynamodb()
+
+    asyncio.run(race())
+
+
+def test_async_archive_round_trip(dynamodb_table):
+    sync_repo = GameRepository()
+    games = {g.game_id: g for g in (sync_repo.create_game(["Alice", "P%d" % i]) for i in range(5))}
+
+    async def round_trip():
+        service = AsyncArchiveService()
+        try:
+            lines = [line async for line in service.export_games(page_size=2)]
+            for game_id in games:
+                dynamodb_table.delete_item(Key={"game_id": game_id})
+            return await service.import_games(lines, batch_size=2)
+        finally:
+            await close_async_dynamodb()
+
+    assert asyncio.run(round_trip()) == 5
+    assert {g.game_id: g for g in sync_repo.scan_games()} == games
@@ -0,0 +1,36 @@
+import sys
+import os
+sys.path.append(os.path.join(os.getcwd(), "backend"))
+sys.path.append(os.path.join(os.getcwd(), "benchmarks"))
+
+import suite
+from synthetic import make_game, make_games
+from app.services.scoring import calculate_game_scores
+
+
+def test_synthetic_games_are_scored_consistently():
+    games = make_games(10)
+    assert {2, 8} & {len(g.players) for g in make_games(40)}
+    assert all(2 <= len(g.players) <= 8 for g in games)
+    for game, rescored in zip(games, calculate_game_scores(games)):
+        for r in game.rounds:
+            assert {p: res.round_score for p, res in r.results.items()} == rescored[r.round_num]
+        assert game.rounds[-1].totals == game.totals
+    assert make_game(seed=5) == make_game(seed=5)
+
+
+def test_every_case_runs(tmp_path):
+    results = suite.run(quick=True, log=lambda line: None)
+    assert set(results) == set(suite.CASES) or all(
+        name.startswith("repo.dynamodb") for name in set(suite.CASES) - set(results)
+    )
+
+    path = str(tmp_path / "baseline.json")
+    suite.save_results(path, results)
+    assert suite.load_baseline(path) == results
+
+
+def test_compare_flags_regressions_beyond_threshold():
+    baseline = {"a": 100.0, "b": 100.0, "c": 100.0}
+    assert suite.compare({"a": 124.0, "b": 126.0, "d": 999.0}, baseline, 0.25) == ["b"]
+    assert suite.compare({"a": 150.0}, baseline, 0.5) == []
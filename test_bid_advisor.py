@@ -0,0 +1,82 @@
+import sys
+import os
+import pytest
+sys.path.append(os.path.join(os.getcwd(), "backend"))
+
+from app.services import deck
+from app.services.bid_advisor import BidAdvisor, simulate
+
+
+def cards(*names):
+    return deck.parse_hand(list(names))
+
+
+def test_trick_rules():
+    # Trump beats the led suit, off-suit cards never win
+    assert deck.trick_winner(cards("green-3", "black-2", "green-14", "yellow-14")) == 1
+    # First pirate wins; the Skull King beats pirates; a mermaid captures the Skull King
+    assert deck.trick_winner(cards("pirate", "pirate", "black-14")) == 0
+    assert deck.trick_winner(cards("pirate", "skull-king")) == 1
+    trick = cards("pirate", "skull-king", "mermaid")
+    assert deck.trick_winner(trick) == 2
+    assert deck.capture_bonus(trick, 2) == 40
+    # All escapes: the leader takes it
+    assert deck.trick_winner(cards("escape", "escape", "escape")) == 0
+    # Escapes lead, the first numbered card sets the suit
+    assert deck.trick_winner(cards("escape", "green-4", "yellow-9", "green-6")) == 3
+
+
+def test_parse_and_canonical_hand():
+    assert cards("pirate", "Pirate", "green-14") == [56, 57, 13]
+    with pytest.raises(ValueError):
+        cards("skull-king", "skull-king")
+    with pytest.raises(ValueError):
+        cards("orange-3")
+    # Colored suits are interchangeable, trump is not
+    assert deck.canonical_hand(cards("green-5", "yellow-9", "yellow-2")) == \
+        deck.canonical_hand(cards("purple-9", "purple-2", "green-5"))
+    assert deck.canonical_hand(cards("green-5")) != deck.canonical_hand(cards("black-5"))
+
+
+def test_advice_follows_the_hand():
+    advisor = BidAdvisor(simulations=200, time_budget=5)
+    strong = advisor.advise(["skull-king", "pirate", "pirate", "black-14", "black-13"], 5, 4)
+    assert strong.best_bid >= 3
+    assert len(strong.estimates) == 6 and strong.simulations == 200
+
+    hopeless = advisor.advise(["escape"] * 5, 5, 4)
+    assert hopeless.best_bid == 0
+    assert hopeless.estimates[0].make_probability == 1
+
+
+def test_simulation_is_deterministic_per_seed():
+    hand = cards("green-7", "black-3", "mermaid")
+    assert simulate(hand, 3, 5, 50, seed=42) == simulate(hand, 3, 5, 50, seed=42)
+    # Always at least one deal, however tight the deadline
+    assert simulate(hand, 3, 5, 50, seed=42, deadline=0)[0] == 1
+
+
+def test_cache_shared_by_equivalent_hands():
+    advisor = BidAdvisor(simulations=20, time_budget=5)
+    first = advisor.advise(["green-5", "yellow-9", "pirate"], 3, 3)
+    relabelled = advisor.advise(["purple-5", "green-9", "pirate"], 3, 3)
+    assert not first.cached and relabelled.cached
+    assert relabelled.estimates == first.estimates
+    assert advisor.cache.hits == 1
+
+
+def test_advisor_endpoint():
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    client = TestClient(app)
+    response = client.post("/api/advisor/bid", json={"hand": ["escape", "green-2"], "round_num": 2, "num_players": 3})
+    assert response.status_code == 200
+    assert [e["bid"] for e in response.json()["estimates"]] == [0, 1, 2]
+
+    # Wrong hand size, too many players for the deck, unknown card
+    for body in ({"hand": ["escape"], "round_num": 2, "num_players": 3},
+                 {"hand": [deck.CARD_NAMES[c] for c in range(10)], "round_num": 10, "num_players": 8},
+                 {"hand": ["joker"], "round_num": 1, "num_players": 3}):
+        assert client.post("/api/advisor/bid", json=body).status_code == 400
+    assert client.post("/api/advisor/bid", json={"hand": [], "round_num": 0, "num_players": 3}).status_code == 422
@@ -0,0 +1,46 @@
+import sys
+import os
+sys.path.append(os.path.join(os.getcwd(), "backend"))
+
+from app.core.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction():
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # a is now most recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry_and_counters():
+    clock = FakeClock()
+    cache = TTLCache(max_size=10, ttl=5, clock=clock)
+    cache.put("a", 1)
+    clock.now = 4.9
+    assert cache.get("a") == 1
+    clock.now = 5.0
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 0)
+
+
+def test_validate_rejects_stale_entry():
+    cache = TTLCache(max_size=10, ttl=60)
+    cache.put("a", 1)
+    assert cache.get("a", validate=lambda v: v == 2) is None
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert (stats["stale"], stats["misses"]) == (1, 2)
@@ -0,0 +1,97 @@
+import sys
+import os
+import random
+import pytest
+sys.path.append(os.path.join(os.getcwd(), "backend"))
+
+from boto3.dynamodb.types import TypeSerializer, TypeDeserializer
+
+from app.db.codec import CODECS, get_codec, pack_round, unpack_round
+from app.models.game import Game, Round, RoundResult, GameStatus
+
+
+def random_game(rng: random.Random) -> Game:
+    players = ["Player %d" % i for i in range(rng.randint(2, 8))]
+    if rng.random() < 0.2:
+        players.append("Ünïcødé ☠")
+    rounds = []
+    totals = {p: 0 for p in players}
+    for round_num in range(1, rng.randint(0, 10) + 1):
+        bids = {p: rng.randint(0, round_num) for p in players}
+        results = {}
+        if rng.random() < 0.8:
+            for p in players:
+                score = rng.randint(-100, 200)
+                totals[p] += score
+                results[p] = RoundResult(
+                    tricks_won=rng.randint(0, round_num), bid=bids[p],
+                    bonus_points=rng.choice((0, 10, 20, 30)), penalty_points=rng.choice((0, 5)),
+                    round_score=score, potential_bonus=rng.randint(0, 50),
+                )
+        # A name outside the player list (e.g. a typo) must survive too
+        if rng.random() < 0.1:
+            bids["Guest"] = 1
+        rounds.append(Round(
+            round_num=round_num, cards_dealt=round_num, bids=bids, results=results,
+            totals=dict(totals) if results else {},
+        ))
+    return Game(
+        game_id="game-%d" % rng.randint(0, 10**9), players=players, date="2026-01-01T00:00:00",
+        status=rng.choice(list(GameStatus)), rounds=rounds, totals=totals,
+        ranks={p: 1 for p in players}, version=rng.randint(0, 50),
+    )
+
+
+def through_dynamodb(item: dict) -> dict:
+    # Same conversion boto3 applies on write and read (ints come back as Decimal)
+    serializer, deserializer = TypeSerializer(), TypeDeserializer()
+    wire = {k: serializer.serialize(v) for k, v in item.items()}
+    return {k: deserializer.deserialize(v) for k, v in wire.items()}
+
+
+@pytest.mark.parametrize("codec_name", sorted(CODECS))
+def test_codec_round_trip(codec_name):
+    codec = get_codec(codec_name)
+    rng = random.Random(codec_name)
+    for _ in range(200):
+        game = random_game(rng)
+        decoded = codec.decode_game(through_dynamodb(codec.encode_game(game)))
+        assert decoded == game
+        assert decoded.json() == game.json()
+
+
+@pytest.mark.parametrize("writer", sorted(CODECS))
+@pytest.mark.parametrize("reader", sorted(CODECS))
+def test_codecs_read_each_other(writer, reader):
+    rng = random.Random(writer + reader)
+    for _ in range(20):
+        game = random_game(rng)
+        item = through_dynamodb(get_codec(writer).encode_game(game))
+        assert get_codec(reader).decode_game(item) == game
+
+
+def test_packed_round_is_smaller():
+    rng = random.Random(3)
+    game = random_game(rng)
+    while not game.rounds:
+        game = random_game(rng)
+    r = game.rounds[-1]
+    packed = pack_round(r, game.players)
+    assert unpack_round(packed, game.players) == r
+    assert len(packed) < len(r.json())
+
+
+def test_unknown_codec():
+    with pytest.raises(ValueError):
+        get_codec("pickle")
+
+
+@pytest.mark.parametrize("codec_name", sorted(CODECS))
+def test_duplicate_rounds_rejected(codec_name):
+    codec = get_codec(codec_name)
+    game = random_game(random.Random(5))
+    game.rounds = [Round(round_num=1, cards_dealt=1)]
+    item = codec.encode_game(game)
+    item["rounds"] = item["rounds"] * 2
+    with pytest.raises(ValueError):
+        codec.decode_game(through_dynamodb(item))
@@ -0,0 +1,45 @@
+import sys
+import os
+sys.path.append(os.path.join(os.getcwd(), "backend"))
+sys.path.append(os.path.join(os.getcwd(), "benchmarks"))
+
+from synthetic import make_games
+from app.models.compact import CompactGame, CompactGameStore
+from app.models.game import Game, Round, RoundResult, GameStatus
+from app.services.game_service import GameService
+from app.services.rescore_service import _game_rows
+
+
+def test_round_trip():
+    for game in make_games(20):
+        compact = CompactGame.from_game(game)
+        assert compact.to_game() == game
+        assert _game_rows(compact) == _game_rows(game)
+        assert compact.standings().totals == game.totals
+
+    # Partly entered rounds, and names that aren't in the player list
+    game = Game(game_id="g", players=["Alice", "Bob"], date="2024-01-01", status=GameStatus.ACTIVE, version=3, rounds=[
+        Round(round_num=1, cards_dealt=1, bids={"Bob": 0, "Alice": 1},
+              results={"Alice": RoundResult(tricks_won=1, bid=1, round_score=20, loot_bonus=-5)},
+              totals={"Alice": 20}),
+        Round(round_num=2, cards_dealt=2, bids={"Guest": 2}),
+    ], totals={"Alice": 20, "Bob": 0})
+    compact = CompactGame.from_game(game)
+    assert compact.names == ("Alice", "Bob", "Guest")
+    restored = compact.to_game()
+    assert restored == game and restored.players == ["Alice", "Bob"]
+    assert restored.get_round(2).bids == {"Guest": 2}
+
+
+def test_store_copies_in_and_out():
+    service = GameService()
+    assert isinstance(service.repo.games, CompactGameStore)
+    game = service.create_game(["Alice", "Bob"])
+    service.start_round(game.game_id, 1)
+
+    stored = service.get_game(game.game_id)
+    stored.rounds[0].bids["Alice"] = 5
+    stored.totals["Alice"] = 100
+    assert service.get_game(game.game_id).rounds[0].bids == {}
+    assert service.get_standings(game.game_id).totals == {"Alice": 0, "Bob": 0}
+    assert service.get_game_version(game.game_id) == 1
@@ -0,0 +1,89 @@
+import sys
+import os
+import pytest
+sys.path.append(os.path.join(os.getcwd(), "backend"))
+
+from app.core.config import settings
+from app.models.game import GameBatch
+from app.repositories.event_repository import EventLogGameRepository
+from app.repositories.game_repository import VersionConflictError
+from app.services.archive_service import ArchiveService
+from app.services.game_service import GameService
+
+
+def _play(service, rounds=4):
+    """Play `rounds` rounds, fixing a bid typo in round 2; returns the game after every write."""
+    game = service.create_game(["Alice", "Bob"])
+    states = {0: game.copy(deep=True)}
+
+    def record(game):
+        states[game.version] = game.copy(deep=True)
+
+    for round_num in range(1, rounds + 1):
+        record(service.start_round(game.game_id, round_num))
+        record(service.submit_bids(game.game_id, round_num, {"Alice": 1, "Bob": 0}))
+        if round_num == 2:
+            record(service.submit_bids(game.game_id, round_num, {"Alice": 0, "Bob": 0}))
+        record(service.submit_results(game.game_id, round_num,
+                                      {"Alice": {"tricks_won": 1, "bonus": 10}, "Bob": {"tricks_won": 0}}))
+    return game.game_id, states
+
+
+def test_event_log_in_memory(monkeypatch):
+    monkeypatch.setattr(settings, "GAME_SNAPSHOT_INTERVAL", 5)
+    repo = EventLogGameRepository()
+    service = GameService(repo=repo)
+    game_id, states = _play(service)
+
+    # Writes were appends; the document is only rewritten every 5 events
+    assert [e["seq"] for e in repo.events[game_id]] == list(range(14))
+    assert repo.games[game_id].version == 10
+    assert service.get_game(game_id) == states[13]
+    assert service.get_standings(game_id).totals == {"Alice": 70, "Bob": 100}
+
+    # Any earlier point can be rebuilt, from the log alone
+    for version, state in states.items():
+        assert repo.replay(game_id, until_seq=version) == state
+    history = repo.history(game_id)
+    assert [e.type for e in history[:4]] == ["created", "round_started", "bids_submitted", "results_submitted"]
+    assert [e.seq for e in history if e.correction] == [6]
+
+    # Two writers on the same version: the second append is rejected
+    first, second = service.get_game(game_id), service.get_game(game_id)
+    service._add_round(first, 5)
+    repo.append_round(first, first.rounds[-1])
+    service._add_round(second, 5)
+    with pytest.raises(VersionConflictError):
+        repo.append_round(second, second.rounds[-1])
+
+
+def test_event_log_dynamodb(dynamodb_table, monkeypatch):
+    monkeypatch.setattr(settings, "GAME_SNAPSHOT_INTERVAL", 4)
+    repo = EventLogGameRepository()
+    service = GameService(repo=repo)
+    game_id, states = _play(service, rounds=3)
+
+    events = repo.events_table.query(
+        KeyConditionExpression="game_id = :g", ExpressionAttributeValues={":g": game_id}
+    )["Items"]
+    assert len(events) == 11
+    assert int(dynamodb_table.get_item(Key={"game_id": game_id})["Item"]["version"]) == 8
+    assert service.get_game(game_id) == states[10] == repo.replay(game_id)
+    assert repo.replay(game_id, until_seq=6) == states[6]
+    # The version comes from the log's tail, ahead of the snapshot
+    assert repo.get_version(game_id) == 10
+
+    # A batch is one event, and conflicts surface as VersionConflictError
+    game = service.apply_batch(game_id, GameBatch(operations=[
+        {"op": "start", "round_num": 4}, {"op": "bids", "round_num": 4, "bids": {"Alice": 0, "Bob": 0}},
+    ]))
+    assert game.version == 11 and repo.history(game_id)[-1].type == "batch"
+    stale = states[10].copy(deep=True)
+    with pytest.raises(VersionConflictError):
+        repo.update_game(stale)
+
+    # Archive export catches snapshots up; import restores game and log
+    lines = list(ArchiveService(repo).export_games())
+    assert ArchiveService(repo).import_games(lines) == 1
+    assert service.get_game(game_id) == game
+    assert repo.history(game_id)[-1].type == "imported"
@@ -0,0 +1,82 @@
+import sys
+import os
+import pytest
+sys.path.append(os.path.join(os.getcwd(), "backend"))
+
+from app.models.game import Game, GameStatus
+from app.repositories.game_repository import GameRepository
+
+
+def _games():
+    # Two games a day in March; Alice plays every other one
+    return [
+        Game(game_id="g%02d" % i, date="2024-03-%02dT%02d:00:00" % (1 + i // 2, 9 + i % 2),
+             status=GameStatus.ACTIVE, players=["Alice", "Bob"] if i % 2 else ["Bob", "Carol"])
+        for i in range(20)
+    ]
+
+
+def _pages(repo, limit, **kwargs):
+    pages, cursor = [], None
+    while True:
+        page, cursor = repo.list_games(limit=limit, cursor=cursor, **kwargs)
+        pages.append([g.game_id for g in page])
+        if not cursor:
+            return pages
+
+
+def _check_listings(repo):
+    repo.put_games(_games())
+
+    pages = _pages(repo, 6)
+    assert [len(p) for p in pages if p] == [6, 6, 6, 2]
+    assert sum(pages, []) == ["g%02d" % i for i in reversed(range(20))]
+
+    alice = sum(_pages(repo, 4, player="Alice"), [])
+    assert alice == ["g%02d" % i for i in reversed(range(1, 20, 2))]
+    assert sum(_pages(repo, 4, player="Dave"), []) == []
+
+    # Strictly before the given date or time
+    page, _ = repo.list_games(player="Bob", before="2024-03-05", limit=3)
+    assert [g.game_id for g in page] == ["g07", "g06", "g05"]
+    assert page[0].players == ["Alice", "Bob"] and page[0].date == "2024-03-04T10:00:00"
+    page, _ = repo.list_games(before="2024-03-01T10", limit=10)
+    assert [g.game_id for g in page] == ["g00"]
+
+    # Re-importing a game replaces its entries instead of adding more
+    moved = _games()[1].copy(update={"date": "2024-04-01T09:00:00"})
+    repo.put_games([moved])
+    alice = sum(_pages(repo, 20, player="Alice"), [])
+    assert alice[:2] == ["g01", "g19"] and alice.count("g01") == 1
+
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        repo.list_games(cursor="%%%")
+
+
+def test_listings_in_memory():
+    _check_listings(GameRepository())
+
+
+def test_listings_dynamodb(dynamodb_table):
+    repo = GameRepository()
+    _check_listings(repo)
+    # Index items share the table but are never read back as games
+    assert len(list(repo.scan_games(page_size=7))) == 20
+    assert repo.get_game("index#all#g01") is None
+
+
+def test_list_endpoint():
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    client = TestClient(app)
+    # The app's store is shared with other tests, so list a player only this test uses
+    created = [client.post("/api/games/", json={"players": ["Lister", "P%d" % i]}).json() for i in range(3)]
+    response = client.get("/api/games/", params={"player": "Lister", "limit": 2})
+    assert response.status_code == 200
+    body = response.json()
+    assert [g["game_id"] for g in body["games"]] == [created[2]["game_id"], created[1]["game_id"]]
+    rest = client.get("/api/games/", params={"player": "Lister", "cursor": body["next_cursor"]}).json()
+    assert [g["game_id"] for g in rest["games"]] == [created[0]["game_id"]]
+    assert rest["next_cursor"] is None
+    assert client.get("/api/games/", params={"cursor": "%%%"}).status_code == 400
@@ -0,0 +1,144 @@
+import sys
+import os
+import pytest
+sys.path.append(os.path.join(os.getcwd(), "backend"))
+
+pytest.importorskip("moto")
+
+from app.core.config import settings
+from app.repositories.game_repository import GameRepository, VersionConflictError
+from app.services.game_service import GameService
+from app.models.game import GameBatch
+
+
+@pytest.mark.parametrize("codec", ["json", "dict", "packed"])
+def test_partial_updates_round_trip(dynamodb_table, monkeypatch, codec):
+    monkeypatch.setattr(settings, "GAME_CODEC", codec)
+    service = GameService()
+    game = service.create_game(["Alice", "Bob"])
+    for round_num in range(1, 11):
+        service.start_round(game.game_id, round_num)
+        service.submit_bids(game.game_id, round_num, {"Alice": 1, "Bob": 0})
+        service.submit_results(game.game_id, round_num, {"Alice": {"tricks_won": 1, "bonus": 10}, "Bob": {"tricks_won": 0}})
+
+    # Correct round 3 after the fact
+    service.submit_results(game.game_id, 3, {"Alice": {"tricks_won": 0}, "Bob": {"tricks_won": 0}})
+
+    stored = GameRepository().get_game(game.game_id)
+    assert [r.round_num for r in stored.rounds] == list(range(1, 11))
+    assert stored.rounds[2].results["Alice"].round_score == -10
+    assert stored.totals == {"Alice": 9 * 30 - 10, "Bob": sum(range(1, 11)) * 10}
+    assert stored.rounds[9].totals == stored.totals
+    assert stored.status == "COMPLETED"
+    # One write per start/bids/results, plus the correction
+    assert stored.version == 10 * 3 + 1
+
+
+def test_concurrent_writers_conflict(dynamodb_table):
+    repo_a = GameRepository()
+    repo_b = GameRepository()
+    game = repo_a.create_game(["Alice", "Bob"])
+    GameService().start_round(game.game_id, 1)
+
+    device_a = repo_a.get_game(game.game_id)
+    device_b = repo_b.get_game(game.game_id)
+
+    device_a.rounds[0].bids = {"Alice": 1, "Bob": 0}
+    repo_a.update_game_fields(device_a, round_fields={0: ["bids"]})
+
+    device_b.rounds[0].bids = {"Alice": 0, "Bob": 1}
+    with pytest.raises(VersionConflictError):
+        repo_b.update_game_fields(device_b, round_fields={0: ["bids"]})
+    assert device_b.version == 1
+
+    with pytest.raises(VersionConflictError):
+        repo_b.update_game(device_b)
+
+    assert repo_a.get_game(game.game_id).rounds[0].bids == {"Alice": 1, "Bob": 0}
+
+
+def test_legacy_item_without_version(dynamodb_table):
+    repo = GameRepository()
+    game = repo.create_game(["Alice"])
+    dynamodb_table.update_item(Key={"game_id": game.game_id}, UpdateExpression="REMOVE version")
+
+    legacy = repo.get_game(game.game_id)
+    assert legacy.version == 0
+    repo.update_game_fields(legacy, ["status"])
+    assert repo.get_game(game.game_id).version == 1
+
+
+def test_cache_serves_hits_and_detects_other_writers(dynamodb_table, monkeypatch):
+    monkeypatch.setattr(settings, "GAME_CACHE_SIZE", 10)
+    container_a = GameRepository()
+    container_b = GameRepository()
+    game = container_a.create_game(["Alice", "Bob"])
+
+    full_reads = []
+    container_a.table.meta.client.meta.events.register(
+        "provide-client-params.dynamodb.GetItem",
+        lambda params, **kwargs: full_reads.append(params) if "ProjectionExpression" not in params else None
+    )
+
+    first = container_a.get_game(game.game_id)
+    first.rounds = []  # mutating a returned game must not leak into the cache
+    first.players.append("Mallory")
+    second = container_a.get_game(game.game_id)
+    assert second.players == ["Alice", "Bob"]
+    assert full_reads == []
+    assert container_a.cache_stats()["hits"] == 2
+
+    # Another container writes; container A must notice via the version check
+    other = container_b.get_game(game.game_id)
+    other.status = "COMPLETED"
+    container_b.update_game_fields(other, ["status"])
+
+    fresh = container_a.get_game(game.game_id)
+    assert fresh.status == "COMPLETED"
+    assert fresh.version == 1
+    assert len(full_reads) >= 1
+    assert container_a.cache_stats()["stale"] == 1
+
+    # A conflicting write drops the entry instead of caching the rejected state
+    second.status = "ACTIVE"
+    with pytest.raises(VersionConflictError):
+        container_a.update_game_fields(second, ["status"])
+    assert container_a.get_game(game.game_id).status == "COMPLETED"
+
+
+@pytest.mark.parametrize("codec", ["json", "dict", "packed"])
+def test_batch_one_read_one_write(dynamodb_table, monkeypatch, codec):
+    monkeypatch.setattr(settings, "GAME_CODEC", codec)
+    service = GameService()
+    game = service.create_game(["Alice", "Bob"])
+    calls = []
+    service.repo.table.meta.client.meta.events.register(
+        "before-call.dynamodb.*", lambda model, **kwargs: calls.append(model.name)
+    )
+
+    def ops(round_num, alice_tricks):
+        return [
+            {"op": "start", "round_num": round_num},
+            {"op": "bids", "round_num": round_num, "bids": {"Alice": 1, "Bob": 0}},
+            {"op": "results", "round_num": round_num,
+             "results": {"Alice": {"tricks_won": alice_tricks}, "Bob": {"tricks_won": 0}}},
+        ]
+
+    batches = [
+        ops(1, 1) + ops(2, 1),  # new rounds only: appended with one update
+        [ops(1, 0)[2], {"op": "bids", "round_num": 2, "bids": {"Alice": 1, "Bob": 1}}],  # edits only
+        ops(1, 1)[2:] + ops(3, 1),  # edit and append together: one full put
+    ]
+    for batch in batches:
+        calls.clear()
+        service.apply_batch(game.game_id, GameBatch(operations=batch))
+        assert len([c for c in calls if c in ("PutItem", "UpdateItem")]) == 1
+        assert calls[0] == "GetItem"
+
+    stored = GameRepository().get_game(game.game_id)
+    assert [r.round_num for r in stored.rounds] == [1, 2, 3]
+    assert stored.rounds[1].bids == {"Alice": 1, "Bob": 1}
+    # Round 2 was scored with the original bids; round 1 was corrected back to a made bid
+    assert stored.totals == {"Alice": 20 + 20 + 20, "Bob": 10 + 20 + 30}
+    assert stored.rounds[2].totals == stored.totals
+    assert stored.version == 3
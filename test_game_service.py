@@ -0,0 +1,156 @@
+import sys
+import os
+import random
+import pytest
+sys.path.append(os.path.join(os.getcwd(), "backend"))
+
+from app.models.game import GameBatch, GameDiff
+from app.repositories.game_repository import VersionConflictError
+from app.services.game_service import GameService
+
+
+def _play_round(service, game_id, round_num, bids, tricks, bonuses=None):
+    bonuses = bonuses or {}
+    service.start_round(game_id, round_num)
+    service.submit_bids(game_id, round_num, bids)
+    results = {p: {"tricks_won": t, "bonus": bonuses.get(p, 0)} for p, t in tricks.items()}
+    return service.submit_results(game_id, round_num, results)
+
+
+def test_running_totals_and_ranks():
+    service = GameService()
+    game = service.create_game(["Alice", "Bob", "Cara"])
+    assert game.totals == {"Alice": 0, "Bob": 0, "Cara": 0}
+
+    game = _play_round(service, game.game_id, 1, {"Alice": 0, "Bob": 1, "Cara": 1}, {"Alice": 0, "Bob": 1, "Cara": 0})
+    assert game.totals == {"Alice": 10, "Bob": 20, "Cara": -10}
+    assert game.ranks == {"Bob": 1, "Alice": 2, "Cara": 3}
+    assert game.rounds[0].totals == game.totals
+
+    game = _play_round(service, game.game_id, 2, {"Alice": 2, "Bob": 0, "Cara": 1}, {"Alice": 2, "Bob": 0, "Cara": 0})
+    assert game.totals == {"Alice": 50, "Bob": 40, "Cara": -20}
+    assert game.rounds[1].totals == game.totals
+
+    # Correcting round 1 shifts round 1, round 2 and the game totals
+    game = service.submit_results(game.game_id, 1, {"Alice": {"tricks_won": 0}, "Bob": {"tricks_won": 1, "bonus": 20}, "Cara": {"tricks_won": 0}})
+    assert game.rounds[0].totals == {"Alice": 10, "Bob": 40, "Cara": -10}
+    assert game.totals == {"Alice": 50, "Bob": 60, "Cara": -20}
+    assert game.rounds[1].totals == game.totals
+
+    standings = service.get_standings(game.game_id)
+    assert standings.totals == game.totals
+    assert standings.ranks == {"Bob": 1, "Alice": 2, "Cara": 3}
+
+
+def test_incremental_totals_match_full_rebuild():
+    rng = random.Random(7)
+    service = GameService()
+    players = ["P%d" % i for i in range(6)]
+    game = service.create_game(players)
+    for round_num in range(1, 11):
+        bids = {p: rng.randint(0, round_num) for p in players}
+        tricks = {p: rng.randint(0, round_num) for p in players}
+        bonuses = {p: rng.choice((0, 0, 10, 20, 30)) for p in players}
+        game = _play_round(service, game.game_id, round_num, bids, tricks, bonuses)
+
+    expected = {p: sum(r.results[p].round_score for r in game.rounds) for p in players}
+    assert game.totals == expected
+    ranked = sorted(expected.values(), reverse=True)
+    assert game.ranks == {p: ranked.index(s) + 1 for p, s in expected.items()}
+
+
+def test_legacy_game_without_totals():
+    service = GameService()
+    game = service.create_game(["Alice", "Bob"])
+    game = _play_round(service, game.game_id, 1, {"Alice": 1, "Bob": 0}, {"Alice": 1, "Bob": 0})
+    # Simulate a game stored before running totals were tracked
+    game.totals = {}
+    game.ranks = {}
+    for r in game.rounds:
+        r.totals = {}
+
+    standings = service.get_standings(game.game_id)
+    assert standings.totals == {"Alice": 20, "Bob": 10}
+    assert standings.ranks == {"Alice": 1, "Bob": 2}
+    assert service.get_standings("missing") is None
+
+
+def test_round_index():
+    import pytest
+    from pydantic import ValidationError
+    from app.models.game import Game, Round
+
+    service = GameService()
+    game = service.create_game(["Alice", "Bob"])
+    for round_num in (1, 2, 3):
+        game = service.start_round(game.game_id, round_num)
+    game = service.start_round(game.game_id, 2)  # already started, no duplicate
+    assert [r.round_num for r in game.rounds] == [1, 2, 3]
+    assert game.get_round(3) is game.rounds[2]
+    assert game.round_position(7) == -1
+
+    with pytest.raises(ValueError):
+        game.add_round(Round(round_num=1, cards_dealt=1))
+
+    # The index follows the rounds through serialization and copies
+    reloaded = Game.parse_raw(game.json())
+    assert reloaded.round_position(3) == 2
+    assert game.copy(deep=True).get_round(2) == game.rounds[1]
+
+    # A malformed document can't carry two rounds with the same number
+    data = game.dict()
+    data["rounds"].append(data["rounds"][0])
+    with pytest.raises(ValidationError):
+        Game(**data)
+
+
+def _round_ops(round_num, bids, tricks):
+    return [
+        {"op": "start", "round_num": round_num},
+        {"op": "bids", "round_num": round_num, "bids": bids},
+        {"op": "results", "round_num": round_num,
+         "results": {p: {"tricks_won": t} for p, t in tricks.items()}},
+    ]
+
+
+def test_batch_matches_single_calls():
+    rng = random.Random(3)
+    players = ["Alice", "Bob", "Cara"]
+    single, batched = GameService(), GameService()
+    game_a = single.create_game(players)
+    game_b = batched.create_game(players)
+    operations = []
+    for round_num in range(1, 6):
+        bids = {p: rng.randint(0, round_num) for p in players}
+        tricks = {p: rng.randint(0, round_num) for p in players}
+        _play_round(single, game_a.game_id, round_num, bids, tricks)
+        operations += _round_ops(round_num, bids, tricks)
+
+    # Catch-up entry of five rounds in one call
+    game = batched.apply_batch(game_b.game_id, GameBatch(operations=operations))
+    expected = single.get_game(game_a.game_id)
+    assert game.rounds == expected.rounds
+    assert (game.totals, game.ranks) == (expected.totals, expected.ranks)
+    assert game.version == 1
+
+
+def test_batch_is_all_or_nothing_and_diff():
+    service = GameService()
+    game = service.create_game(["Alice", "Bob"])
+    service.apply_batch(game.game_id, GameBatch(operations=_round_ops(1, {"Alice": 1, "Bob": 0}, {"Alice": 1, "Bob": 0})))
+
+    bad = _round_ops(2, {"Alice": 0, "Bob": 0}, {"Alice": 0, "Bob": 0})
+    bad[1]["round_num"] = 5  # bids for a round that was never started
+    with pytest.raises(ValueError):
+        service.apply_batch(game.game_id, GameBatch(operations=bad))
+    assert len(service.get_game(game.game_id).rounds) == 1
+
+    with pytest.raises(VersionConflictError):
+        service.apply_batch(game.game_id, GameBatch(operations=bad[:1], expected_version=0))
+
+    diff = service.apply_batch(game.game_id, GameBatch(
+        operations=_round_ops(2, {"Alice": 0, "Bob": 0}, {"Alice": 0, "Bob": 1}), expected_version=1, diff=True
+    ))
+    assert isinstance(diff, GameDiff)
+    assert [r.round_num for r in diff.rounds] == [2]
+    assert diff.totals == {"Alice": 40, "Bob": -10} and diff.version == 2
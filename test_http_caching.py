@@ -0,0 +1,80 @@
+import sys
+import os
+import pytest
+sys.path.append(os.path.join(os.getcwd(), "backend"))
+
+from app.api import deps
+from app.core.http import etag_matches, version_etag
+from app.repositories.game_repository import GameRepository
+
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+    from app.main import app
+    return TestClient(app)
+
+
+def test_etag_matching():
+    assert etag_matches('"v3"', '"v3"')
+    assert etag_matches('W/"v3"', '"v3"')
+    assert etag_matches('"v1", W/"v3"', 'W/"v3"')
+    assert etag_matches('*', '"v3"')
+    assert not etag_matches('"v31"', '"v3"')
+    assert not etag_matches('"v2", "v4"', '"v3"')
+
+
+def test_conditional_get(client, monkeypatch):
+    game_id = client.post("/api/games/", json={"players": ["Alice", "Bob"]}).json()["game_id"]
+    response = client.get(f"/api/games/{game_id}")
+    etag = response.headers["etag"]
+    assert etag == version_etag(response.json()["version"])
+    assert response.headers["cache-control"] == "no-cache"
+
+    # Unchanged: 304 from the version alone, without loading the game
+    service = deps.get_game_service()
+    monkeypatch.setattr(service, "get_game", lambda game_id: pytest.fail("game loaded for a 304"))
+    response = client.get(f"/api/games/{game_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304 and response.content == b""
+    assert response.headers["etag"] == etag
+    monkeypatch.undo()
+
+    # A write moves the version, so the old tag gets the new document
+    client.post(f"/api/games/{game_id}/rounds/1/start")
+    response = client.get(f"/api/games/{game_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag and len(response.json()["rounds"]) == 1
+
+    assert client.get("/api/games/missing", headers={"If-None-Match": etag}).status_code == 404
+
+
+def test_gzip_weakens_etag(client):
+    players = [f"Player {i}" for i in range(8)]
+    game_id = client.post("/api/games/", json={"players": players}).json()["game_id"]
+    for round_num in range(1, 6):
+        client.post(f"/api/games/{game_id}/rounds/{round_num}/start")
+        client.post(f"/api/games/{game_id}/rounds/{round_num}/bids", json={p: 1 for p in players})
+
+    response = client.get(f"/api/games/{game_id}", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    etag = response.headers["etag"]
+    assert etag.startswith("W/")
+    assert len(response.json()["rounds"]) == 5
+
+    # Clients echo the weak tag back; it still revalidates
+    response = client.get(f"/api/games/{game_id}", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert response.status_code == 304
+
+    # Clients without gzip keep the strong tag
+    response = client.get(f"/api/games/{game_id}", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == etag[2:]
+
+
+def test_dynamodb_get_version(dynamodb_table):
+    repo = GameRepository()
+    game = repo.create_game(["Alice", "Bob"])
+    assert repo.get_version(game.game_id) == game.version
+    repo.update_game(game)
+    assert repo.get_version(game.game_id) == game.version
+    assert repo.get_version("missing") is None
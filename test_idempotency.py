@@ -0,0 +1,120 @@
+import sys
+import os
+import pytest
+sys.path.append(os.path.join(os.getcwd(), "backend"))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.endpoints import games
+from app.api.deps import get_game_service
+from app.core.idempotency import (
+    IdempotencyMiddleware, MemoryIdempotencyStore, DynamoDBIdempotencyStore, REPLAYED_HEADER, get_idempotency_store
+)
+from app.repositories.user_repository import UserRepository
+from app.services.analytics_service import AnalyticsService
+from app.services.game_service import GameService
+from app.services.user_service import UserService
+
+
+def _client(service, store):
+    app = FastAPI()
+    app.include_router(games.router, prefix="/api/games")
+    app.dependency_overrides[get_game_service] = lambda: service
+    app.add_middleware(IdempotencyMiddleware, store=store)
+    return TestClient(app)
+
+
+def _play_to_round_10(service, game_id):
+    for round_num in range(1, 11):
+        service.start_round(game_id, round_num)
+        service.submit_bids(game_id, round_num, {"Alice": 1, "Bob": 0})
+        if round_num < 10:
+            service.submit_results(game_id, round_num, {"Alice": {"tricks_won": 1}, "Bob": {"tricks_won": 0}})
+
+
+def test_replayed_key():
+    service = GameService(user_service=UserService(UserRepository()))
+    client = _client(service, MemoryIdempotencyStore())
+    created = client.post("/api/games/", json={"players": ["Alice", "Bob"]}, headers={"Idempotency-Key": "create-1"})
+    replayed = client.post("/api/games/", json={"players": ["Alice", "Bob"]}, headers={"Idempotency-Key": "create-1"})
+    assert replayed.status_code == created.status_code == 200
+    assert replayed.json() == created.json()
+    assert replayed.headers[REPLAYED_HEADER] == "true" and REPLAYED_HEADER not in created.headers
+    assert len(service.repo.games) == 1
+
+    game_id = created.json()["game_id"]
+    client.post(f"/api/games/{game_id}/rounds/1/start")
+    path = f"/api/games/{game_id}/rounds/1/bids"
+    first = client.post(path, json={"Alice": 1, "Bob": 0}, headers={"Idempotency-Key": "bids-1"})
+    assert client.post(path, json={"Alice": 1, "Bob": 0}, headers={"Idempotency-Key": "bids-1"}).json() == first.json()
+    assert service.get_game(game_id).version == first.json()["version"]
+
+    # The same key for another request is a client bug, not a retry
+    other = client.post(path, json={"Alice": 0, "Bob": 0}, headers={"Idempotency-Key": "bids-1"})
+    assert other.status_code == 422
+    assert client.post(path, json={"Alice": 1}, headers={"Idempotency-Key": ""}).status_code == 400
+
+    # Failed requests aren't stored, so their retry runs again
+    missing = client.post("/api/games/nope/rounds/1/start", headers={"Idempotency-Key": "start-1"})
+    assert missing.status_code == 400 and client.post(
+        "/api/games/nope/rounds/1/start", headers={"Idempotency-Key": "start-1"}).headers[REPLAYED_HEADER] == "true"
+
+
+def test_memory_store():
+    now = [0.0]
+    store = MemoryIdempotencyStore(max_size=2, clock=lambda: now[0])
+    assert store.claim("a", "f") is None
+    # Still running: the retry has to wait
+    assert store.claim("a", "f") == {"fingerprint": "f", "status": None}
+    store.release("a")
+    assert store.claim("a", "f") is None
+    store.save("a", {"fingerprint": "f", "status": 200, "headers": [], "body": b"{}"})
+    assert store.claim("a", "f")["status"] == 200
+    now[0] += 10 ** 6
+    assert store.claim("a", "f") is None
+
+    store.claim("b", "f")
+    store.claim("c", "f")
+    assert list(store._records) == ["b", "c"]
+    with pytest.raises(ValueError):
+        get_idempotency_store("redis")
+
+
+def test_retried_completion_counts_once():
+    users = UserService(UserRepository())
+    analytics = AnalyticsService()
+    service = GameService(user_service=users, analytics=analytics)
+    game_id = service.create_game(["Alice", "Bob"]).game_id
+    _play_to_round_10(service, game_id)
+
+    results = {"Alice": {"tricks_won": 1}, "Bob": {"tricks_won": 0}}
+    version = service.submit_results(game_id, 10, results).version
+    # A retry (no key, or one the store forgot) neither writes nor counts again
+    assert service.submit_results(game_id, 10, results).version == version
+    assert service.submit_bids(game_id, 10, {"Alice": 1, "Bob": 0}).version == version
+    assert users.get_user_stats("Alice").games_played == 1
+    assert analytics.get_analytics("Alice").head_to_head["Bob"].games == 1
+
+
+def test_completion_dynamodb(dynamodb_table):
+    users = UserService(UserRepository())
+    analytics = AnalyticsService()
+    service = GameService(user_service=users, analytics=analytics)
+    game_id = service.create_game(["Alice", "Bob"]).game_id
+    _play_to_round_10(service, game_id)
+    service.submit_results(game_id, 10, {"Alice": {"tricks_won": 1}, "Bob": {"tricks_won": 0}})
+    # As if the retry's response was lost after the stats were written
+    service._handle_game_completion(service.get_game(game_id))
+    assert users.get_user_stats("Alice").games_played == 1
+    assert users.get_user_stats("Bob").games_played == 1
+    assert analytics.get_analytics("Bob").head_to_head["Alice"].wins == 1
+
+    store = DynamoDBIdempotencyStore()
+    assert store.claim("k", "f") is None
+    assert store.claim("k", "f") == {"fingerprint": "f", "status": None, "headers": [], "body": b""}
+    store.save("k", {"fingerprint": "f", "status": 201, "headers": [["content-type", "application/json"]],
+                     "body": b"{}"})
+    assert store.claim("k", "g") == {"fingerprint": "f", "status": 201,
+                                     "headers": [["content-type", "application/json"]], "body": b"{}"}
+    store.release("k")
+    assert store.claim("k", "g") is None
@@ -0,0 +1,179 @@
+import sys
+import os
+import asyncio
+import json
+import threading
+import pytest
+sys.path.append(os.path.join(os.getcwd(), "backend"))
+
+from app.models.game import GameBatch, GameDiff
+from app.services.game_service import GameService
+from app.services.live_updates import UpdateHub, LocalBroker, HEARTBEAT, RESYNC, load_broker, stream_game
+
+
+class RecordingBroker(LocalBroker):
+    def __init__(self):
+        self.sent = []
+
+    def publish(self, game_id, version, message):
+        self.sent.append((game_id, version))
+        super().publish(game_id, version, message)
+
+
+def _diff(version, game_id="g1"):
+    return GameDiff(game_id=game_id, version=version, status="ACTIVE")
+
+
+def _event(frame: bytes):
+    fields = dict(line.split(": ", 1) for line in frame.decode().strip().split("\n"))
+    return fields["event"], int(fields["id"]), json.loads(fields["data"])
+
+
+def test_fan_out_from_another_thread():
+    hub = UpdateHub(buffer_size=8, heartbeat=60)
+
+    async def watch(subscription, received, count):
+        async for frame in subscription.frames():
+            received.append(frame)
+            if len(received) == count:
+                subscription.close()
+                return
+
+    async def run():
+        subscriptions = [hub.subscribe("g1") for _ in range(2000)]
+        hub.subscribe("g2").close()
+        assert hub.stats()["games"] == 1 and hub.stats()["watchers"] == 2000
+        received = [[] for _ in subscriptions]
+        watchers = [asyncio.create_task(watch(s, r, 3)) for s, r in zip(subscriptions, received)]
+        await asyncio.sleep(0)
+
+        # Writes arrive from threadpool threads; the last one repeats a version
+        writer = threading.Thread(target=lambda: [hub.publish(_diff(v)) for v in (1, 2, 3, 3)] + [hub.publish(_diff(9, "g2"))])
+        writer.start()
+        writer.join()
+        await asyncio.wait_for(asyncio.gather(*watchers), 5)
+        return received
+
+    received = asyncio.run(run())
+    assert [_event(f)[1] for f in received[0]] == [1, 2, 3]
+    # Framed once and shared, not copied per watcher
+    assert all(r[i] is received[0][i] for r in received for i in range(3))
+    assert hub.stats() == {"games": 0, "watchers": 0, "published": 5, "failed": 0}
+
+
+def test_heartbeat_and_resync():
+    hub = UpdateHub(buffer_size=2, heartbeat=0.01)
+
+    async def run():
+        subscription = hub.subscribe("g1")
+        frames = subscription.frames()
+        assert await frames.__anext__() == HEARTBEAT
+        # Four updates into a buffer of two: the watcher has to start over
+        for version in range(1, 5):
+            hub.publish(_diff(version))
+        assert await frames.__anext__() is RESYNC
+        hub.publish(_diff(5))
+        assert _event(await frames.__anext__())[1] == 5
+        await frames.aclose()
+        subscription.close()
+
+    asyncio.run(run())
+
+
+def test_service_publishes_deltas():
+    broker = RecordingBroker()
+    hub = UpdateHub(broker=broker, heartbeat=60)
+    service = GameService(updates=hub)
+    game_id = service.create_game(["Alice", "Bob"]).game_id
+    service.start_round(game_id, 1)
+
+    def as_async(method):
+        return lambda *args: asyncio.get_running_loop().run_in_executor(None, method, *args)
+
+    async def run(last_event_id=None, writes=()):
+        checked = asyncio.Event()
+
+        async def get_version(game_id):
+            version = await as_async(service.get_game_version)(game_id)
+            checked.set()
+            return version
+
+        stream = stream_game(hub, game_id, as_async(service.get_game), get_version, last_event_id)
+        events = []
+        if last_event_id is None:
+            events.append(_event(await stream.__anext__()))
+        for write in writes:
+            pending = asyncio.ensure_future(stream.__anext__())
+            if last_event_id is not None:
+                await checked.wait()
+            await asyncio.get_running_loop().run_in_executor(None, write)
+            events.append(_event(await pending))
+        await stream.aclose()
+        return events
+
+    events = asyncio.run(run(writes=[
+        lambda: service.submit_bids(game_id, 1, {"Alice": 0, "Bob": 1}),
+        lambda: service.apply_batch(game_id, GameBatch(operations=[
+            {"op": "results", "round_num": 1, "results": {"Alice": {"tricks_won": 0}, "Bob": {"tricks_won": 1}}},
+            {"op": "start", "round_num": 2},
+        ])),
+    ]))
+    assert [(e[0], e[1]) for e in events] == [("game", 1), ("update", 2), ("update", 3)]
+    assert list(events[1][2]["rounds"][0]["bids"]) == ["Alice", "Bob"]
+    # The batch sends the scored round and the new one, with the totals
+    assert [r["round_num"] for r in events[2][2]["rounds"]] == [1, 2]
+    assert events[2][2]["totals"] == {"Alice": 10, "Bob": 20}
+
+    # A client reconnecting at the current version only gets what comes next
+    events = asyncio.run(run("3", writes=[lambda: service.submit_bids(game_id, 2, {"Alice": 1, "Bob": 1})]))
+    assert [(e[0], e[1]) for e in events] == [("update", 4)]
+    assert [r["round_num"] for r in events[0][2]["rounds"]] == [2]
+    assert broker.sent[-1] == (game_id, 4)
+
+
+def test_updates_endpoint():
+    from fastapi.testclient import TestClient
+    from app.api import deps
+    from app.main import app
+
+    client = TestClient(app)
+    game_id = client.post("/api/games/", json={"players": ["Alice", "Bob"]}).json()["game_id"]
+    assert client.get("/api/games/missing/updates").status_code == 404
+
+    async def run():
+        sent = asyncio.Queue()
+        disconnected = asyncio.Event()
+
+        async def receive():
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+            "path": f"/api/games/{game_id}/updates", "raw_path": b"", "root_path": "", "query_string": b"",
+            "headers": [(b"host", b"test"), (b"accept", b"text/event-stream"), (b"accept-encoding", b"gzip")],
+            "client": ("test", 1), "server": ("test", 80),
+        }
+        app_task = asyncio.create_task(app(scope, receive, sent.put))
+        start = await asyncio.wait_for(sent.get(), 5)
+        headers = dict(start["headers"])
+        first = (await asyncio.wait_for(sent.get(), 5))["body"]
+        await asyncio.get_running_loop().run_in_executor(None, deps.get_game_service().start_round, game_id, 1)
+        second = (await asyncio.wait_for(sent.get(), 5))["body"]
+        disconnected.set()
+        await asyncio.wait_for(app_task, 5)
+        assert deps.get_update_hub().stats()["watchers"] == 0
+        return start["status"], headers, first, second
+
+    status, headers, first, second = asyncio.run(run())
+    assert status == 200
+    assert headers[b"content-type"].startswith(b"text/event-stream") and b"content-encoding" not in headers
+    assert _event(first)[:2] == ("game", 0)
+    assert _event(second)[:2] == ("update", 1)
+
+
+def test_load_broker():
+    assert isinstance(load_broker("local"), LocalBroker)
+    assert isinstance(load_broker("test_live_updates:RecordingBroker"), RecordingBroker)
+    with pytest.raises(ValueError):
+        load_broker("redis")
@@ -0,0 +1,155 @@
+import sys
+import os
+import threading
+import pytest
+sys.path.append(os.path.join(os.getcwd(), "backend"))
+
+from app.core.config import settings
+from app.db.local import get_game_store
+from app.db.sqlite import reset_sqlite
+from app.models.user import LeaderboardMetric
+from app.repositories.async_game_repository import AsyncGameRepository
+from app.repositories.event_repository import EventLogGameRepository
+from app.repositories.game_repository import GameRepository, VersionConflictError
+from app.repositories.user_repository import UserRepository
+from app.services.analytics_service import AnalyticsService
+from app.services.game_service import GameService
+from app.services.scoring import calculate_round_score
+from app.services.user_service import UserService
+
+PLAYERS = ["Alice", "Bob", "Cara"]
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def local_store(request, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "USE_DYNAMODB", False)
+    monkeypatch.setattr(settings, "LOCAL_STORE", request.param)
+    monkeypatch.setattr(settings, "SQLITE_PATH", str(tmp_path / "games.db"))
+    yield request.param
+    reset_sqlite()
+
+
+def _run_threads(target, count):
+    errors = []
+
+    def run(i):
+        try:
+            target(i)
+        except Exception as e:  # surfaced below; a thread's exception is otherwise lost
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+
+
+def test_concurrent_rounds_on_one_game(local_store):
+    service = GameService(user_service=UserService(UserRepository()))
+    game_id = service.create_game(PLAYERS).game_id
+    for round_num in range(1, 11):
+        service.start_round(game_id, round_num)
+    rescores = 6
+
+    # One thread per round, each re-scoring its round over and over; every
+    # write is a read-modify-write of the same game
+    def play(i):
+        round_num = i + 1
+        service.submit_bids(game_id, round_num, {p: 1 for p in PLAYERS})
+        for n in range(rescores):
+            service.submit_results(game_id, round_num, {p: {"tricks_won": (n + j) % 2} for j, p in enumerate(PLAYERS)})
+
+    _run_threads(play, 10)
+    game = service.get_game(game_id)
+    # No write was lost: 10 starts, 10 bids and every re-score
+    assert game.version == 10 + 10 + 10 * rescores
+    last = rescores - 1
+    expected = {
+        p: sum(calculate_round_score(1, (last + j) % 2, r) for r in range(1, 11)) for j, p in enumerate(PLAYERS)
+    }
+    assert game.totals == expected
+    assert all(r.results and r.totals for r in game.rounds)
+    # Round 10 was scored six times but the game counted once
+    assert service.user_service.get_user_stats("Alice").games_played == 1
+
+
+def test_concurrent_games_and_stats(local_store):
+    service = GameService(user_service=UserService(UserRepository()))
+
+    def play(i):
+        for _ in range(3):
+            game_id = service.create_game(PLAYERS + ["T%d" % i]).game_id
+            for round_num in range(1, 11):
+                service.start_round(game_id, round_num)
+                service.submit_bids(game_id, round_num, {"Alice": 0})
+                service.submit_results(game_id, round_num, {p: {"tricks_won": 0} for p in PLAYERS})
+
+    _run_threads(play, 8)
+    users = service.user_service
+    assert users.get_user_stats("Alice").games_played == 24
+    assert len(service.list_games(player="Bob", limit=100).games) == 24
+    top = users.get_leaderboard(LeaderboardMetric.GAMES_PLAYED, limit=3)
+    assert [u.games_played for u in top.entries] == [24, 24, 24]
+
+
+def test_stale_write_conflicts(local_store):
+    repo = GameRepository()
+    game = repo.create_game(PLAYERS)
+    stale = repo.get_game(game.game_id)
+    repo.update_game(repo.get_game(game.game_id))
+    with pytest.raises(VersionConflictError):
+        repo.update_game(stale)
+    assert stale.version == 0 and repo.get_version(game.game_id) == 1
+
+
+def test_sqlite_survives_restart(local_store):
+    if local_store != "sqlite":
+        pytest.skip("only SQLite keeps anything")
+    service = GameService(user_service=UserService(UserRepository()), analytics=AnalyticsService())
+    game_id = service.create_game(PLAYERS).game_id
+    for round_num in range(1, 11):
+        service.start_round(game_id, round_num)
+        service.submit_results(game_id, round_num, {p: {"tricks_won": 0} for p in PLAYERS})
+    for name in ("Dora", "Eli", "Finn"):
+        service.user_service.record_game_results([(name, 50, True)])
+        service.user_service.record_game_results([(name, 50, True)])
+    game = service.get_game(game_id)
+    analytics = service.analytics.get_analytics("Alice")
+    assert analytics.rounds_played == 10 and analytics.head_to_head
+
+    reset_sqlite()
+    with pytest.raises(RuntimeError):
+        service.get_game(game_id)  # the old pool is closed, not waited on
+    restarted = GameService(user_service=UserService(UserRepository()), analytics=AnalyticsService())
+    assert restarted.get_game(game_id) == game
+    assert restarted.analytics.get_analytics("Alice") == analytics
+    assert [g.game_id for g in restarted.list_games(player="Cara").games] == [game_id]
+    names, cursor = [], None
+    for _ in range(3):
+        page = restarted.user_service.get_leaderboard(LeaderboardMetric.WINS, limit=2, cursor=cursor)
+        names += [u.username for u in page.entries]
+        cursor = page.next_cursor
+    # Two wins each, then the three tied winners of the game
+    assert names == ["Dora", "Eli", "Finn", "Alice", "Bob", "Cara"]
+    assert cursor is None
+    # The completion marker was kept too
+    restarted._handle_game_completion(restarted.get_game(game_id))
+    assert restarted.user_service.get_user_stats("Alice").games_played == 1
+    assert restarted.analytics.get_analytics("Alice") == analytics
+    with pytest.raises(ValueError):
+        restarted.user_service.get_leaderboard(LeaderboardMetric.WINS, limit=2, cursor="WyJ4IiwgMV0=")
+
+
+def test_unknown_store(monkeypatch, tmp_path):
+    with pytest.raises(ValueError):
+        get_game_store("redis")
+    monkeypatch.setattr(settings, "LOCAL_STORE", "sqlite")
+    monkeypatch.setattr(settings, "USE_DYNAMODB", False)
+    monkeypatch.setattr(settings, "SQLITE_PATH", str(tmp_path / "games.db"))
+    # The event log and the async repositories only run on the memory store
+    for repository in (EventLogGameRepository, AsyncGameRepository):
+        with pytest.raises(ValueError):
+            repository()
+    assert not os.listdir(tmp_path)
@@ -0,0 +1,62 @@
+import sys
+import os
+sys.path.append(os.path.join(os.getcwd(), "backend"))
+
+from fastapi.routing import APIRoute
+from app.api import deps
+from app.core import metrics
+from app.core.config import settings
+from app.repositories.game_repository import GameRepository
+from app.services.game_service import GameService
+
+
+def test_histogram_and_counter_render():
+    latency = metrics.Histogram("demo_seconds", "Demo", ("route",), buckets=(0.1, 1.0))
+    latency.observe(0.05, "/a")
+    latency.observe(0.5, "/a")
+    latency.observe(5, "/a")
+    calls = metrics.Counter("demo_total", "Demo", ("outcome",))
+    calls.inc("ok")
+    calls.inc("ok", amount=2)
+
+    assert latency.render()[2:] == [
+        'demo_seconds_bucket{route="/a",le="0.1"} 1',
+        'demo_seconds_bucket{route="/a",le="1.0"} 2',
+        'demo_seconds_bucket{route="/a",le="+Inf"} 3',
+        'demo_seconds_sum{route="/a"} 5.55',
+        'demo_seconds_count{route="/a"} 3',
+    ]
+    assert calls.render()[2:] == ['demo_total{outcome="ok"} 3']
+
+
+def test_server_timing_and_metrics_endpoint():
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    client = TestClient(app)
+    game_id = client.post("/api/games/", json={"players": ["Alice", "Bob"]}).json()["game_id"]
+    response = client.post(f"/api/games/{game_id}/rounds/1/start")
+    timing = dict(part.split(";dur=") for part in response.headers["server-timing"].split(", "))
+    assert set(timing) == {"handler", "service", "repository", "serialization", "total"}
+    assert sum(float(v) for k, v in timing.items() if k != "total") <= float(timing["total"])
+
+    body = client.get("/metrics").text
+    assert 'http_request_duration_seconds_count{method="POST",route="/api/games/{game_id}/rounds/{round_num}/start",status="200"}' in body
+    assert 'repository_calls_total{repository="game",method="append_round",outcome="ok"}' in body
+
+
+def test_dynamodb_consumed_capacity(dynamodb_table):
+    before = metrics.DYNAMODB_CAPACITY.value(settings.DYNAMODB_TABLE, "BatchWriteItem")
+    repo = GameRepository()
+    # The game and its listing index items go out in one BatchWriteItem
+    game = repo.create_game(["Alice"])
+    repo.get_game(game.game_id)
+    assert metrics.DYNAMODB_CAPACITY.value(settings.DYNAMODB_TABLE, "BatchWriteItem") > before
+    assert metrics.DYNAMODB_REQUESTS.value("GetItem") >= 1
+
+
+def test_off_switch(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_ENABLED", False)
+    assert metrics.route_class() is APIRoute
+    service = deps._instrumented(GameService(), deps.GAME_SERVICE_CALLS, deps.GAME_REPOSITORY_CALLS, "game")
+    assert "get_game" not in vars(service) and "get_game" not in vars(service.repo)
@@ -0,0 +1,87 @@
+import sys
+import os
+import json
+sys.path.append(os.path.join(os.getcwd(), "backend"))
+sys.path.append(os.path.join(os.getcwd(), "benchmarks"))
+
+from synthetic import make_games
+from app import rescore
+from app.models.rules import RuleSet
+from app.repositories.game_repository import GameRepository
+from app.services.archive_service import ArchiveService
+from app.services.rescore_service import RescoreService
+from app.services.scoring import RULE_SETS, calculate_round_scores, _variant_scores
+
+
+def _columns():
+    bids, tricks, rounds, bonuses, penalties, loot = [], [], [], [], [], []
+    for round_num in range(1, 11):
+        for bid in range(round_num + 1):
+            for won in range(round_num + 1):
+                for bonus, loot_part in ((0, 0), (30, 0), (40, 20)):
+                    for penalty in (0, 5):
+                        for column, value in zip((bids, tricks, rounds, bonuses, penalties, loot),
+                                                 (bid, won, round_num, bonus, penalty, loot_part)):
+                            column.append(value)
+    return bids, tricks, rounds, bonuses, penalties, loot
+
+
+def test_variants():
+    columns = _columns()
+    # The generic variant scorer agrees with the standard fast path
+    assert _variant_scores(*columns, RuleSet(name="check")) == calculate_round_scores(*columns[:5])
+
+    def score(name, *row):
+        return calculate_round_scores(*([v] for v in row), rules=RULE_SETS[name])[0]
+
+    # bid, tricks, round, bonus, penalty, loot
+    assert score("standard", 2, 1, 5, 30, 0, 0) == -10
+    assert score("bonus_on_failure", 2, 1, 5, 30, 0, 0) == 20
+    assert score("loot_always_counts", 2, 1, 5, 40, 0, 20) == 10
+    assert score("loot_always_counts", 2, 2, 5, 40, 0, 20) == 80
+    assert score("zero_bid_penalties", 2, 2, 5, 0, 5, 0) == 40
+    assert score("zero_bid_penalties", 0, 0, 5, 0, 5, 0) == 45
+    # Rascal: 10 per card for exact (zero bids too), half for one off, else nothing
+    assert score("rascal", 3, 3, 5, 20, 0, 0) == 70
+    assert score("rascal", 0, 0, 5, 0, 0, 0) == 50
+    assert score("rascal", 3, 4, 5, 20, 0, 0) == 25
+    assert score("rascal", 3, 5, 5, 20, 0, 0) == 0
+
+
+def test_rescore_stored_games():
+    repo = GameRepository()
+    repo.put_games(make_games(25))
+    repo.create_game(["Alice", "Bob"])  # no results yet
+    variants = [RULE_SETS["rascal"], RULE_SETS["bonus_on_failure"]]
+
+    deltas = []
+    summary = RescoreService(repo).rescore(variants, on_game=deltas.append, chunk_size=4)
+    assert summary["games"] == 25 and summary["skipped"] == 1 and len(deltas) == 25
+    for delta in deltas:
+        game = repo.games[delta["game_id"]]
+        # The baseline reproduces the stored totals
+        assert delta["baseline"]["totals"] == game.totals
+        rascal = delta["variants"]["rascal"]
+        assert all(rascal["totals"][p] - game.totals[p] == d for p, d in rascal["delta"].items())
+    assert summary["variants"]["rascal"]["winner_changes"] == sum(
+        d["variants"]["rascal"]["winner_changed"] for d in deltas
+    )
+    assert sum(summary["baseline_distribution"].values()) == sum(len(g.players) for g in make_games(25))
+    # Bonuses can only add points when they count on failure too
+    assert summary["variants"]["bonus_on_failure"]["mean_delta"] >= 0
+
+    # Same answer from worker processes
+    parallel = []
+    assert RescoreService(repo).rescore(variants, on_game=parallel.append, workers=2, chunk_size=4) == summary
+    assert parallel == deltas
+
+
+def test_rescore_cli(tmp_path):
+    archive = tmp_path / "games.ndjson"
+    archive.write_text("".join(ArchiveService()._line(g) for g in make_games(6)))
+    deltas, summary = tmp_path / "deltas.ndjson", tmp_path / "summary.json"
+    rescore.main(["--input", str(archive), "--variant", "rascal", "-o", str(deltas), "--summary", str(summary)])
+
+    lines = [json.loads(line) for line in deltas.read_text().splitlines()]
+    assert len(lines) == 6 and set(lines[0]["variants"]) == {"rascal"}
+    assert json.loads(summary.read_text())["games"] == 6
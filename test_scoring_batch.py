@@ -0,0 +1,105 @@
+import sys
+import os
+import random
+import pytest
+sys.path.append(os.path.join(os.getcwd(), "backend"))
+
+from app.services.scoring import calculate_round_score, calculate_round_scores, calculate_game_scores
+
+
+def _scalar_scores(bids, tricks, rounds, bonuses, penalties):
+    return [
+        calculate_round_score(b, t, r, bo, p)
+        for b, t, r, bo, p in zip(bids, tricks, rounds, bonuses, penalties)
+    ]
+
+
+def test_batch_matches_scalar_exhaustive():
+    # Every bid/tricks combination a real game can produce, with a spread of bonuses/penalties
+    bids, tricks, rounds, bonuses, penalties = [], [], [], [], []
+    for round_num in range(1, 11):
+        for bid in range(0, round_num + 1):
+            for won in range(0, round_num + 1):
+                for bonus in (0, 10, 20, 30, 40, 50, -5):
+                    for penalty in (0, 5, 10):
+                        bids.append(bid)
+                        tricks.append(won)
+                        rounds.append(round_num)
+                        bonuses.append(bonus)
+                        penalties.append(penalty)
+
+    expected = _scalar_scores(bids, tricks, rounds, bonuses, penalties)
+    assert calculate_round_scores(bids, tricks, rounds, bonuses, penalties) == expected
+
+
+def test_batch_matches_scalar_random():
+    rng = random.Random(1234)
+    n = 5000
+    rounds = [rng.randint(1, 20) for _ in range(n)]
+    bids = [rng.randint(0, r) for r in rounds]
+    tricks = [rng.randint(0, r) for r in rounds]
+    bonuses = [rng.choice((0, 10, 20, 30, 40, 50, 60, -5, -10)) for _ in range(n)]
+    penalties = [rng.choice((0, 5, 10, 20)) for _ in range(n)]
+
+    expected = _scalar_scores(bids, tricks, rounds, bonuses, penalties)
+    assert calculate_round_scores(bids, tricks, rounds, bonuses, penalties) == expected
+
+
+def test_batch_single_round_defaults():
+    # A whole round: scalar round_num and no bonus/penalty columns
+    bids = [0, 0, 1, 2, 3]
+    tricks = [0, 1, 1, 4, 2]
+    expected = [calculate_round_score(b, t, 5) for b, t in zip(bids, tricks)]
+    assert calculate_round_scores(bids, tricks, 5) == expected
+    assert calculate_round_scores([], [], 5) == []
+
+
+def test_batch_rejects_uneven_columns():
+    with pytest.raises(ValueError):
+        calculate_round_scores([1, 2], [1], 5)
+    with pytest.raises(ValueError):
+        calculate_round_scores([1, 2], [1, 2], [3, 3], [10])
+
+
+class _Result:
+    def __init__(self, bid, tricks_won, bonus_points=0, penalty_points=0):
+        self.bid = bid
+        self.tricks_won = tricks_won
+        self.bonus_points = bonus_points
+        self.penalty_points = penalty_points
+
+
+class _Round:
+    def __init__(self, round_num, results):
+        self.round_num = round_num
+        self.results = results
+
+
+class _Game:
+    def __init__(self, rounds):
+        self.rounds = rounds
+
+
+def test_game_scores_many_games():
+    games = [
+        _Game([
+            _Round(1, {"Alice": _Result(0, 0), "Bob": _Result(1, 1, 20)}),
+            _Round(2, {"Alice": _Result(2, 1), "Bob": _Result(0, 0, 0, 5)}),
+        ]),
+        _Game([]),
+        _Game([_Round(3, {"Cara": _Result(3, 3, 30, 10)})]),
+    ]
+    scores = calculate_game_scores(games)
+    assert scores == [
+        {1: {"Alice": 10, "Bob": 40}, 2: {"Alice": -10, "Bob": 15}},
+        {},
+        {3: {"Cara": 80}},
+    ]
+
+
+if __name__ == "__main__":
+    test_batch_matches_scalar_exhaustive()
+    test_batch_matches_scalar_random()
+    test_batch_single_round_defaults()
+    test_game_scores_many_games()
+    print("All batch scoring tests passed!")
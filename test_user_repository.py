@@ -0,0 +1,125 @@
+import sys
+import os
+import pytest
+sys.path.append(os.path.join(os.getcwd(), "backend"))
+
+pytest.importorskip("moto")
+
+from app.repositories.user_repository import UserRepository
+from app.models.user import LeaderboardMetric
+
+
+def test_record_game_results_single_transaction(dynamodb_table):
+    repo = UserRepository()
+    calls = []
+    repo.table.meta.client.meta.events.register(
+        "before-call.dynamodb.*", lambda model, **kwargs: calls.append(model.name)
+    )
+
+    repo.record_game_results([("Alice", 120, True), ("Bob", 80, False), ("Cara", -20, False)])
+    assert calls == ["BatchGetItem", "TransactWriteItems"]
+
+    repo.record_game_results([("Alice", 90, False), ("Bob", 150, True)])
+    alice, bob, cara = (repo.get_user_stats(u) for u in ("Alice", "Bob", "Cara"))
+    assert (alice.games_played, alice.total_wins, alice.high_score) == (2, 1, 120)
+    assert (bob.games_played, bob.total_wins, bob.high_score) == (2, 1, 150)
+    assert (cara.games_played, cara.total_wins, cara.high_score) == (1, 0, 0)
+    assert repo.get_user_stats("Nobody").games_played == 0
+
+
+def test_concurrent_high_score_raise_retries(dynamodb_table, monkeypatch):
+    repo = UserRepository()
+    repo.record_game_results([("Alice", 100, True), ("Bob", 50, False)])
+
+    # Another container raises Alice's high score between our read and write
+    real_read = repo._read_stats
+    reads = []
+
+    def racing_read(usernames):
+        current = real_read(usernames)
+        if not reads:
+            UserRepository().record_game_results([("Alice", 200, True)])
+        reads.append(current)
+        return current
+
+    monkeypatch.setattr(repo, "_read_stats", racing_read)
+    repo.record_game_results([("Alice", 150, True), ("Bob", 60, False)])
+
+    assert len(reads) == 2  # first transaction cancelled, retried once
+    alice = repo.get_user_stats("Alice")
+    bob = repo.get_user_stats("Bob")
+    assert (alice.games_played, alice.total_wins, alice.high_score) == (3, 3, 200)
+    assert (bob.games_played, bob.high_score) == (2, 60)
+
+
+def test_in_memory_matches():
+    repo = UserRepository()
+    repo.record_game_results([("Alice", 120, True), ("Alice", 130, False)])
+    stats = repo.get_user_stats("Alice")
+    assert (stats.games_played, stats.total_wins, stats.high_score) == (2, 1, 130)
+
+
+def _play_league(repo):
+    repo.record_game_results([("Alice", 120, True), ("Bob", 80, False), ("Cara", 40, False)])
+    repo.record_game_results([("Alice", 30, False), ("Bob", 150, True)])
+    repo.record_game_results([("Dan", 90, True)])
+
+
+def _walk(repo, metric, limit):
+    pages, cursor = [], None
+    while True:
+        entries, cursor = repo.get_leaderboard(metric, limit, cursor)
+        pages.append([(s.username, s.average_score) for s in entries])
+        if cursor is None:
+            return pages
+
+
+def test_leaderboard_in_memory():
+    repo = UserRepository()
+    _play_league(repo)
+
+    assert _walk(repo, LeaderboardMetric.AVERAGE_SCORE, 2) == [
+        [("Bob", 115.0), ("Dan", 90.0)],
+        [("Alice", 75.0), ("Cara", 40.0)],
+    ]
+    entries, cursor = repo.get_leaderboard(LeaderboardMetric.HIGH_SCORE, 1)
+    assert [s.username for s in entries] == ["Bob"]
+    entries, _ = repo.get_leaderboard(LeaderboardMetric.GAMES_PLAYED, 10)
+    assert [s.games_played for s in entries] == [2, 2, 1, 1]
+
+    # Updates move players instead of duplicating them
+    repo.record_game_results([("Cara", 300, True)])
+    entries, _ = repo.get_leaderboard(LeaderboardMetric.HIGH_SCORE, 10)
+    assert [s.username for s in entries] == ["Cara", "Bob", "Alice", "Dan"]
+
+    with pytest.raises(ValueError):
+        repo.get_leaderboard(LeaderboardMetric.WINS, 10, "not-a-cursor")
+
+
+def test_leaderboard_in_memory_fractional_averages():
+    # Averages that aren't exact in JSON still advance page by page
+    repo = UserRepository()
+    for scores, username in (((24, 25, 25), "Ada"), ((25,), "Ben"), ((25, 25, 26), "Cy")):
+        for score in scores:
+            repo.record_game_results([(username, score, False)])
+
+    pages, cursor = [], None
+    for _ in range(4):
+        entries, cursor = repo.get_leaderboard(LeaderboardMetric.AVERAGE_SCORE, 1, cursor)
+        pages.append([s.username for s in entries])
+        if cursor is None:
+            break
+    assert pages == [["Cy"], ["Ben"], ["Ada"]]
+
+
+def test_leaderboard_dynamodb(dynamodb_table):
+    repo = UserRepository()
+    _play_league(repo)
+
+    pages = _walk(repo, LeaderboardMetric.AVERAGE_SCORE, 2)
+    assert [entry for page in pages for entry in page] == [
+        ("Bob", 115.0), ("Dan", 90.0), ("Alice", 75.0), ("Cara", 40.0)
+    ]
+    entries, _ = repo.get_leaderboard(LeaderboardMetric.WINS, 2)
+    assert {s.username for s in entries} <= {"Alice", "Bob", "Dan"}
+    assert all(s.total_wins == 1 for s in entries)